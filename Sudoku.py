@@ -9,37 +9,127 @@ import math
 import time
 import random
 import Sudoku_Errors
+import Sudoku_Budget
+import Sudoku_DLX
+import Sudoku_Journal
+import Sudoku_Logic
+
+# Search strategies for solve_sudoku, is_solvable and is_one_sol. ROW_MAJOR fills 
+# squares in row order, trying values in increasing order. MRV fills the square
+# with the fewest remaining candidates first, trying least constraining values first.
+# DLX solves the puzzle as an exact cover problem with Dancing Links.
+ROW_MAJOR = "row_major"
+MRV = "mrv"
+DLX = "dlx"
+STRATEGIES = (ROW_MAJOR, MRV, DLX)
+
+# Generation modes for Create_Sudoku.create. DIG removes values one at a time from
+# a random solved puzzle while it keeps one solution. RANDOM_WALK randomly inserts
+# and deletes values until the puzzle has exactly one solution.
+DIG = "dig"
+RANDOM_WALK = "random_walk"
+MODES = (DIG, RANDOM_WALK)
+
+# Clue layouts for Create_Sudoku.create. ROTATIONAL puzzles look the same turned
+# half way round, and MIRROR ones reflected left to right, as the squares that
+# map onto each other are filled and emptied together.
+ROTATIONAL = "rotational"
+MIRROR = "mirror"
+SYMMETRIES = (ROTATIONAL, MIRROR)
+
+# The result of a solver or create call given a Sudoku_Budget.Budget that ran out
+# or was cancelled. It is false, so compare results to it with "is".
+BUDGET_EXCEEDED = Sudoku_Budget.EXCEEDED
+
+
+def popcount(mask):
+    """Returns the number of set bits in the integer bitmask mask"""
+    return bin(mask).count("1")
+
+
+# Cache of the render template and square labels of each side length
+_RENDER_TEMPLATES = {}
+
+
+def _render_template(sl):
+    """Returns a tuple (template, labels) for rendering boards with side length
+    sl, where template is a format string of the whole render with one field
+    per square, and labels[value] is the padded text of a square holding value"""
+    if sl not in _RENDER_TEMPLATES:
+        #Each square is as wide as the largest value, with '_' for empty squares
+        width = len(str(sl))
+        border = '-'*((width+1)*sl) + '-'
+        template = border + '\n' + ('|' + '{}|'*sl + '\n')*sl + border
+        labels = ['_'*width] + [str(value).rjust(width) for value in range(1, sl+1)]
+        _RENDER_TEMPLATES[sl] = (template, labels)
+    return _RENDER_TEMPLATES[sl]
 
 
 def render(board):
     """Returns a string of the board as a visual representation of the 
-    sudoku puzzle. Can only handle Sudoku boards with 9x9 dimensions.
+    sudoku puzzle, filling in a template cached for its side length.
     
-    board : A nxn list of lists representing a sudoku board
+    board : A Board, such as the puzzle attribute of a Sudoku object, which
+        is rendered without copying, or a nxn list of lists of squares as
+        returned by get_puzzle
     Return: A string representing the rendered board"""
-    #The top of the board render, which gives enough space for each square based on max square value
-    spot_length = len(str(len(board)))
-    rv = '-'*((spot_length+1)*len(board))+'-\n'      
+    if isinstance(board, Board):
+        template, labels = _render_template(board.sl)
+        return template.format(*map(labels.__getitem__, board.cells))
+    template, labels = _render_template(len(board))
+    return template.format(*[labels[int(value)] for row in board for value in row])
 
-    #Create a print statement for each line
-    for i in range(len(board)):                     
-        line = '|' 
 
-        #For each number in line, add to print line 
-        for j in range(len(board[i])):                 
-            spot = str(board[i][j])      
-            #If spot is a zero, replace for visuals with '_' 
-            if spot == '0':       
-                spot = '_'*spot_length
-            #Add number to print line with a separator '|'
-            line += ' '*(spot_length-len(spot)) + spot + '|'  
 
-        #Print the rendered line
-        rv += line + '\n'              
+class Board():
+    """
+    RI: len(cells) must be sl*sl, with each value between 0 and sl
+
+    AF(sl, cells): A square grid with side length sl, whose square at row and col
+    holds the value cells[row*sl + col], with 0 for an empty square.
+
+    Safety From Rep Exposure: cells is only shared with the read-only views
+    returned by view, and rows are returned as views of cells rather than copies.
+    """
+    __slots__ = ("sl", "cells")
+
+    def __init__(self, sl, cells=None):
+        """Takes in an integer side length and an optional buffer of sl*sl byte
+        values, such as a bytearray, and makes a board over it, or over a new
+        empty bytearray if cells is None"""
+        self.sl = sl
+        self.cells = bytearray(sl*sl) if cells is None else cells
+
+
+    def __len__(self):
+        """Returns the number of rows of the board"""
+        return self.sl
+
+
+    def __getitem__(self, row):
+        """Returns a memoryview of the squares in row, sharing memory with the board,
+        so board[row][col] reads, and for a writable board sets, a single square"""
+        if row < 0:
+            row += self.sl
+        if not 0 <= row < self.sl:
+            raise IndexError("board row index out of range")
+        return memoryview(self.cells)[row*self.sl:(row+1)*self.sl]
+
+
+    def __iter__(self):
+        """Iterates over the rows of the board as memoryviews"""
+        for row in range(self.sl):
+            yield self[row]
+
 
-    #Print the bottom of the board
-    rv += '-'*((spot_length+1)*len(board))+'-'                     
-    return rv
+    def view(self):
+        """Returns a read-only Board sharing memory with this one, without copying"""
+        return Board(self.sl, memoryview(self.cells).toreadonly())
+
+
+    def copy(self):
+        """Returns a writable Board with a copy of the values of this one"""
+        return Board(self.sl, bytearray(self.cells))
 
 
 
@@ -49,57 +139,208 @@ class Sudoku():
     the square root of the puz, and bs must be the square root of sl
 
     AF(puzzle, sl, bs): A Sudoku puzzle with side length sl and block size bs, with 
-    each consecutive row being puzzle[i], for 0 <= i < sl.
+    each consecutive row being puzzle[i], for 0 <= i < sl, where puzzle is a Board.
+
+    _rows[i], _cols[i] and _boxes[i] must be bitmasks with bit v set exactly when
+    value v is in row i, column i and box i respectively, with boxes numbered left
+    to right, top to bottom.
 
     Safety From Rep Exposure: No references to mutable inputs are kept, and no 
-    references to fields are returned.
+    references to fields are returned, other than read-only views of puzzle.
     """
+    __slots__ = ("sl", "bs", "puzzle", "_rows", "_cols", "_boxes", "_allowed", "nodes", "technique_counts",
+                 "_known", "_count", "_changed", "stats", "_budget", "_journal")
 
     def __init__(self, puzzle):
         """Takes in a string representation of the sudoku puzzle and allows for 
         sudoku operations on it"""
-        # Split the given string input and find the side length and block size of the puzzle
+        # Split the given string input, then check and load the values
         puz = [int(i) for i in puzzle.split(' ') if i]
+        self._load(puz, puzzle)
+
+
+    @classmethod
+    def from_values(cls, values, validate=True):
+        """Makes a Sudoku object straight from a flat sequence of integer square
+        values in row order, such as a list, bytes or a bytearray, or from a 
+        Board, without building and parsing a string. Values are copied.
+
+        values = A sequence of sl*sl integers, or a Board
+        validate = A boolean of whether to check for values repeated in a row, 
+            column or box. Pass False only for values known to be a valid puzzle, 
+            such as those of another Sudoku object.
+
+        return: A Sudoku object"""
+        puzzle = cls.__new__(cls)
+        puzzle._load(getattr(values, "cells", values), values, validate)
+        return puzzle
+
+
+    def copy(self):
+        """Returns a new Sudoku object with a copy of this puzzle, copying the
+        board and bitmasks rather than checking the values again. The copy
+        starts with an empty edit journal."""
+        other = Sudoku.__new__(Sudoku)
+        other.sl = self.sl
+        other.bs = self.bs
+        other.puzzle = self.puzzle.copy()
+        other._rows = list(self._rows)
+        other._cols = list(self._cols)
+        other._boxes = list(self._boxes)
+        other.nodes = 0
+        other.technique_counts = None
+        other._allowed = None
+        other._known = list(self._known) if self._known is not None else None
+        other._count = self._count
+        other._changed = set(self._changed) if self._changed is not None else None
+        other.stats = None
+        other._budget = None
+        other._journal = None
+        return other
+
+
+    def _load(self, puz, expression, validate=True):
+        """Sets this object to the puzzle with the flat sequence of values puz,
+        checking every value and building the bitmasks in a single pass.
+
+        puz = A sequence of integer square values in row order
+        expression = The input reported in an InvalidPuzzleException
+        validate = A boolean of whether to check for repeated values"""
+        # Find the side length and block size of the puzzle
         self.sl = int(math.sqrt(len(puz)))                          
         self.bs = int(math.sqrt(self.sl))
+        sl, bs = self.sl, self.bs
 
         # If side length squared not the same length as total puzzle, or if side lengths
         # not a square length, raise error
-        if not (self.sl**2 == len(puz)) or not (self.bs**2 == self.sl):
-            raise Sudoku_Errors.InvalidPuzzleException(puzzle, "Puzzle side lengths not a perfect square")
+        if not (sl**2 == len(puz)) or not (bs**2 == sl):
+            raise Sudoku_Errors.InvalidPuzzleException(expression, "Puzzle side lengths not a perfect square")
 
-        # For each value in the puzzle, if not in correct range, raise error
+        # Mark each value as used in its row, column and box, and raise an error if
+        # it is out of range or was already used in one of them
+        rows, cols, boxes = [0]*sl, [0]*sl, [0]*sl
         for ind in range(len(puz)):
-            row = ind // self.sl
-            col = ind % self.sl
-            if not (0 <= puz[ind] <= self.sl):
-                raise Sudoku_Errors.InvalidPuzzleException(puzzle,
-            "Puzzle value at ({}, {}) is out of range in puzzle \n{}".format(row, col, puzzle))
+            val = puz[ind]
+            if val == 0:
+                continue
+
+            row = ind // sl
+            col = ind % sl
+            if not (0 < val <= sl):
+                raise Sudoku_Errors.InvalidPuzzleException(expression,
+            "Puzzle value at ({}, {}) is out of range in puzzle \n{}".format(row, col, expression))
+
+            box = bs*(row//bs) + col//bs
+            bit = 1 << val
+            if validate and (rows[row] | cols[col] | boxes[box]) & bit:
+                raise Sudoku_Errors.InvalidPuzzleException(expression,
+                "Puzzle value at ({}, {}) is incorrect in puzzle \n{}".format(row, col, expression))
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+
+        self.puzzle = Board(sl, bytearray(puz))
+        self._rows = rows
+        self._cols = cols
+        self._boxes = boxes
+
+        # Number of search nodes visited by the last solver call, and a dictionary 
+        # of the number of times each constraint propagation technique made progress
+        # in it, left as None until a solver is called to keep boards small
+        self.nodes = 0
+        self.technique_counts = None
+
+        # Candidate bitmasks left by constraint propagation, indexed by row*sl + col, 
+        # which further restrict candidate_mask during a search, or None
+        self._allowed = None
+
+        # The incremental cache, see set_incremental. _known is a list of up to two
+        # solutions of the puzzle as bytes, or None when incremental mode is off. 
+        # _count is the number of solutions if known, with 2 meaning at least two,
+        # or None. _changed is None, or a set of flat square indices such that any
+        # solution other than _known[0] differs from it in one of those squares.
+        self._known = None
+        self._count = None
+        self._changed = None
+
+        # A Sudoku_Stats.Search_Stats that searches and edits are counted in, or 
+        # None to not gather statistics
+        self.stats = None
+
+        # The Sudoku_Budget.Budget the running search charges its nodes to, or None
+        self._budget = None
+
+        # The Sudoku_Journal.Journal of edits made with insert and solve_sudoku,
+        # left as None until the first edit to keep boards small
+        self._journal = None
 
-        # Split string by spaces into single list
-        self.puzzle = [[j for j in puz[(i*self.sl):(i*self.sl)+self.sl]] for i in range(self.sl)]
 
-        # For each value in the puzzle, check that it is a valid value for that square
-        for row in range(self.sl):
-            for col in range(self.sl):
-                # This temporary replacing of each value with 0 is a trick so that
-                # the valid_square method can be used on every square
-                val = self.puzzle[row][col]
-                self.puzzle[row][col] = 0
+    def get_puzzle(self):
+        """Returns a copy of the sudoku puzzle for this instance as a list of lists of strings"""
+        return [[str(value) for value in row] for row in self.puzzle]
 
-                if not self.valid_square(row, col, val):
-                    # If not a valid puzzle, reset self.puzzle and raise error
-                    self.puzzle = None
-                    raise Sudoku_Errors.InvalidPuzzleException(puzzle,
-                    "Puzzle value at ({}, {}) is incorrect in puzzle \n{}".format(row, col, puzzle))
 
-                # If value is valid, replace that square with prior value that was input
-                self.puzzle[row][col] = val
+    def view(self):
+        """Returns a read-only Board of the sudoku puzzle for this instance, which
+        shares memory with the puzzle instead of copying it, so it reflects any
+        later changes. Indexing it as view[row][col] gives integer values."""
+        return self.puzzle.view()
 
 
-    def get_puzzle(self):
-        """Returns a copy of the sudoku puzzle for this instance as a list of lists of strings"""
-        return [[str(self.puzzle[i][j]) for j in range(len(self.puzzle[0]))] for i in range(len(self.puzzle))]
+    def _box(self, row, col):
+        """Returns the index of the box containing the square at row and col,
+        with boxes numbered left to right, top to bottom"""
+        return self.bs*(row//self.bs) + col//self.bs
+
+
+    def _place(self, row, col, value):
+        """Sets the square at row and col to the nonzero value, and marks the
+        value as used in that square's row, column and box bitmasks"""
+        bit = 1 << value
+        self.puzzle.cells[row*self.sl + col] = value
+        self._rows[row] |= bit
+        self._cols[col] |= bit
+        self._boxes[self._box(row, col)] |= bit
+
+
+    def _remove(self, row, col):
+        """Empties the square at row and col, and clears its value from that
+        square's row, column and box bitmasks"""
+        ind = row*self.sl + col
+        bit = ~(1 << self.puzzle.cells[ind])
+        self.puzzle.cells[ind] = 0
+        self._rows[row] &= bit
+        self._cols[col] &= bit
+        self._boxes[self._box(row, col)] &= bit
+
+
+    def candidate_mask(self, row, col):
+        """Returns an integer bitmask of the values that can be placed in the
+        square at row and col, where bit v is set if value v is valid. A filled
+        square has no candidates.
+
+        row: An integer
+        col: Another integer
+
+        return: An integer bitmask of candidate values for the square"""
+        if self.puzzle.cells[row*self.sl + col] != 0:
+            return 0
+        used = self._rows[row] | self._cols[col] | self._boxes[self._box(row, col)]
+        if self._allowed is not None:
+            return ~used & self._allowed[row*self.sl + col]
+        return ~used & (((1 << (self.sl+1)) - 1) ^ 1)
+
+
+    def candidates(self, row, col):
+        """Returns a list of the values, in increasing order, that can be placed 
+        in the square at row and col"""
+        mask = self.candidate_mask(row, col)
+        return [value for value in range(1, self.sl+1) if (mask >> value) & 1]
+
+
+    def num_candidates(self, row, col):
+        """Returns the number of values that can be placed in the square at row and col"""
+        return popcount(self.candidate_mask(row, col))
 
 
     def valid_square(self, row, col, value):
@@ -113,128 +354,108 @@ class Sudoku():
 
         return: Boolean of whether the value is valid for the square of the
         puzzle indexed by row and col"""
+        if self.stats is not None:
+            self.stats.valid_square_calls += 1
+
         # Check that the row and col are valid puzzle indices
         if not ((0 <= row < self.sl) and (0 <= col < self.sl)):
             return False
 
         # Check that the square input is empty
-        if self.puzzle[row][col] != 0:
+        if self.puzzle.cells[row*self.sl + col] != 0:
             return False
             
         # Check that the value input is a valid puzzle value
         if not (1 <= value <= self.sl):
-            if self.puzzle[row][col] == 0 and value == 0:
+            if value == 0:
                 return True
             return False
         
-        # Check each row, column and block for same number
-        for i in range(self.sl):                      
-            if self.puzzle[row][i] == value:     # Check each square in row for same value
-                return False
-            if self.puzzle[i][col] == value:     # Check each square in col for same value
-                return False
-            
-            # Check each square in box for same value, a little more complex index-wise
-            r = self.bs*(row//self.bs) + (i//self.bs) 
-            c = self.bs*(col//self.bs) + (i%self.bs) 
-            if self.puzzle[r][c] == value:
-                return False
-    
-        return True
+        # Check the row, column and box bitmasks for the same number
+        used = self._rows[row] | self._cols[col] | self._boxes[self._box(row, col)]
+        return not (used >> value) & 1
     
 
     def is_solved(self):
         """Determines if the puzzle is solved.
         return: A boolean of whether the puzzle object is solved"""
-        # Iterate through each square of the puzzle
+        full = ((1 << (self.sl+1)) - 1) ^ 1
+        rows = [0]*self.sl
+        cols = [0]*self.sl
+        boxes = [0]*self.sl
+
+        # Gather the values seen in each row, column and box from the squares
+        # themselves, so the check does not rely on the cached bitmasks
         for row in range(self.sl):
             for col in range(self.sl):
-                val = self.puzzle[row][col]
+                val = self.puzzle.cells[row*self.sl + col]
 
                 # If any square value is blank (0), not solved, return False
                 if val == 0:
                     return False
 
-                # Trick to keep DRY code: replace each value temporarily with a
-                # 0, and use valid_square method with original value to determine
-                # if every square is valid
-                self.puzzle[row][col] = 0
-                valid = self.valid_square(row, col, val)
-                self.puzzle[row][col] = val
-                    
-                # If not a valid value for square, return False
-                if not valid:
-                    return False
-        return True
-
-
-    def is_solvable(self, row=0, col=0):
-        """Determines if the puzzle can be solved.
-        return: A boolean of whether the puzzle object can solved"""
-        if row == self.sl-1 and col == self.sl:      
-            return True
+                bit = 1 << val
+                rows[row] |= bit
+                cols[col] |= bit
+                boxes[self._box(row, col)] |= bit
 
-        # If column is the side length, mvoe indices to next row
-        if col == self.sl:
-            return self.is_solvable(row+1, 0)
+        # With every square filled, each row, column and box holds every value
+        # exactly once only if each of them has seen all sl values
+        for i in range(self.sl):
+            if rows[i] != full or cols[i] != full or boxes[i] != full:
+                return False
+        return True
 
-        # If square has a value already, move to next column
-        if self.puzzle[row][col] != 0:                                 
-            return self.is_solvable(row, col + 1)
 
-        # If empty square, try each value in that square
-        for value in range(1, self.sl+1):                
-            # If a valid value, recurse with that value and attempt to solve    
-            if self.valid_square(row, col, value):                      
-                self.puzzle[row][col] = value
-                solved = self.is_solvable(row, col + 1)       
-                self.puzzle[row][col] = 0
+    def is_solvable(self, row=0, col=0, strategy=ROW_MAJOR, propagate=True, budget=None):
+        """Determines if the puzzle can be solved, without mutating the puzzle.
+        The number of search nodes visited is stored in self.nodes, and the
+        progress made by each propagation technique in self.technique_counts.
 
-                # If value solves puzzle, return solved
-                if solved:
-                    return solved
+        strategy = ROW_MAJOR to fill squares in row order starting at row and 
+            col, MRV to always fill the square with the fewest candidates, or
+            DLX to search the exact cover matrix of the puzzle with Dancing Links
+        propagate = A boolean of whether to first fill and rule out squares with
+            Sudoku_Logic constraint propagation, only when starting at (0, 0)
+        budget = A Sudoku_Budget.Budget, or None for no limit. If it runs out,
+            the puzzle is left unchanged and BUDGET_EXCEEDED is returned.
 
-        return False    
+        return: A boolean of whether the puzzle object can solved"""
+        if budget is not None:
+            return self._within(budget, self.is_solvable, row, col, strategy, propagate)
+        if self._known is not None and row == 0 and col == 0:
+            return self._cached_count(1, strategy, propagate) == 1
+        return self._search(strategy, 1, False, row, col, propagate) == 1
 
 
-    def solve_sudoku(self, row=0, col=0):
-        """Upon this call, will recurse through the sudoku puzzle and attempt
+    def solve_sudoku(self, row=0, col=0, strategy=ROW_MAJOR, propagate=True, budget=None):
+        """Upon this call, will search through the sudoku puzzle and attempt
         to solve, returning a boolean of whether it was solved, None otherwise.
         This method modifies the puzzle object itself, keeping it the same if 
         unsolvable, and filling each square with a valid value if solvable.
+        The number of search nodes visited is stored in self.nodes, and the
+        progress made by each propagation technique in self.technique_counts.
     
         row = An integer
         col = Another integer
+        strategy = ROW_MAJOR to fill squares in row order starting at row and 
+            col, MRV to always fill the square with the fewest candidates, or
+            DLX to search the exact cover matrix of the puzzle with Dancing Links
+        propagate = A boolean of whether to first fill and rule out squares with
+            Sudoku_Logic constraint propagation, only when starting at (0, 0)
+        budget = A Sudoku_Budget.Budget, or None for no limit. If it runs out,
+            the puzzle is left unchanged and BUDGET_EXCEEDED is returned.
 
         return: A boolean of whether the puzzle was solved or not"""
-        # If end of puzzle is hit, the puzzle is solved, return True
-        if row == self.sl-1 and col == self.sl:      
+        if budget is not None:
+            return self._within(budget, self.solve_sudoku, row, col, strategy, propagate)
+        if self._known is not None and row == 0 and col == 0:
+            if self._cached_count(1, strategy, propagate) == 0:
+                return False
+            self.fill(self._known[0])
             return True
-        
-        # If column is the side length, mvoe indices to next row
-        if col == self.sl:
-            return self.solve_sudoku(row+1, 0)
-
-        # If square has a value already, move to next column
-        if self.puzzle[row][col] != 0:                                 
-            return self.solve_sudoku(row, col + 1)
+        return self._search(strategy, 1, True, row, col, propagate) == 1
 
-        # If empty square, try each value in that square
-        for value in range(1, self.sl+1):                
-            # If a valid value, recurse with that value and attempt to solve      
-            if self.valid_square(row, col, value):                      
-                self.puzzle[row][col] = value
-                solved = self.solve_sudoku(row, col + 1)               
-
-                # If value solves puzzle, return solved
-                if solved:                                    
-                    return solved
-
-                # If not solved, replace value with 0 for next iteration
-                self.puzzle[row][col] = 0
-
-        return False                               
-        
 
     def insert(self, row, col, value):
         """Attempt to insert an integer value into the Sudoku puzzle 
@@ -247,54 +468,614 @@ class Sudoku():
         value = Another integer
         
         return: A boolean of whether the insert was successful"""
-        if self.valid_square(row, col, value) or value == 0:
-            self.puzzle[row][col] = value
+        if self.valid_square(row, col, value):
+            if value != 0:
+                self._place(row, col, value)
+                self._record(((row*self.sl + col, 0, value),))
+                if self._known is not None:
+                    self._update_known(row*self.sl + col, value)
+                if self.stats is not None:
+                    self.stats.inserts += 1
+            return True
+
+        # Removing a value only needs the square to be on the board
+        if value == 0 and (0 <= row < self.sl) and (0 <= col < self.sl):
+            ind = row*self.sl + col
+            if self.puzzle.cells[ind] != 0:
+                self._record(((ind, self.puzzle.cells[ind], 0),))
+                if self._known is not None:
+                    self._update_known(ind, 0)
+            if self.stats is not None:
+                self.stats.removals += 1
+            self._remove(row, col)
             return True
         return False
 
 
-    def is_one_sol(self, row=0, col=0, sols=None):
-        """Attempts to solve the solve the Sudoku object puzzle, 
-        without mutating the Sudoku object, and returns a boolean
-        of whether there is exactly one solution to the puzzle
-        
-        return: A boolean of whether the Sudoku puzzle has exactly
-        one solution"""
-        # For testing reasons, initialize with None
-        if sols == None:
-            sols = []
+    def set_incremental(self, enabled=True):
+        """Turns incremental mode on or off. In incremental mode the solutions 
+        found by is_solvable, is_one_sol and solve_sudoku are kept, and each
+        insert updates what they tell about the puzzle. A check after an edit
+        consistent with a kept solution is then answered without searching,
+        and after a removal, is_one_sol only searches the removed squares for
+        a second solution. Only checks starting at (0, 0) use the cache, and 
+        self.nodes is 0 when no search was needed.
+
+        enabled = A boolean"""
+        self._known = [] if enabled else None
+        self._count = None
+        self._changed = None
+
+
+    def _update_known(self, ind, value):
+        """Updates the incremental cache for the square at flat index ind being
+        set to value, or having its value removed if value is 0"""
+        if value == 0:
+            # Every solution stays a solution, and any new one must differ from
+            # the kept solution in the removed square
+            if self._count in (0, 1):
+                self._count = None
+            if self._changed is not None:
+                self._changed.add(ind)
+            return
 
-        # Uses an aliased list to maintain variance of number of solutions 
-        # found across all recursive calls, and returns when more than 1 is found
-        if len(sols) > 1:
+        # Only solutions with value in the square stay solutions, and no new
+        # ones appear, so a unique solution either stays unique or is ruled out
+        kept = [solution for solution in self._known if solution[ind] == value]
+        if self._count == 1:
+            self._count = len(kept)
+        elif self._count == 2 and len(kept) < 2:
+            self._count = None
+        if not kept:
+            self._changed = None
+        self._known = kept
+
+
+    def undo(self):
+        """Undoes the last edit, either one insert or the squares filled by one
+        solve_sudoku, in time proportional to the squares it changed rather
+        than the size of the board.
+
+        return: A boolean of whether there was an edit to undo"""
+        changes = self._journal.undo() if self._journal is not None else None
+        if changes is None:
             return False
+        self._apply(changes, True)
+        return True
 
-        # If end of puzzle is hit, the puzzle is solved, return True
-        if row == self.sl-1 and col == self.sl:      
-            sols.append(True)
-            return
-        
-        # If column is the side length, mvoe indices to next row
-        if col == self.sl:
-            return self.is_one_sol(row+1, 0, sols)
-
-        # If square has a value already, move to next column
-        if self.puzzle[row][col] != 0:                                 
-            return self.is_one_sol(row, col+1, sols)
-
-        # If empty square, try each value in that square
-        for value in range(1, self.sl+1):                
-            # If a valid value, recurse with that value and attempt to solve      
-            if self.valid_square(row, col, value):                      
-                self.puzzle[row][col] = value
-                self.is_one_sol(row, col+1, sols) 
-                self.puzzle[row][col] = 0
-
-                if len(sols) > 1:
-                    return False
 
-        # If exhausted all possibilities, return if only one solution found thus far
-        return len(sols) == 1
+    def redo(self):
+        """Redoes the last edit undone, unless an edit has been made since.
+
+        return: A boolean of whether there was an edit to redo"""
+        changes = self._journal.redo() if self._journal is not None else None
+        if changes is None:
+            return False
+        self._apply(changes, False)
+        return True
+
+
+    def checkpoint(self, name=None):
+        """Marks the current state of the puzzle to roll back to later, without
+        copying the board. A checkpoint is forgotten once an edit is made after
+        undoing past it.
+
+        name = A hashable name for the checkpoint, or None to only return its position
+
+        return: An integer position of the state in the journal, which rollback
+        also accepts"""
+        if self._journal is None:
+            self._journal = Sudoku_Journal.Journal()
+        position = len(self._journal.history)
+        if name is not None:
+            self._journal.checkpoints[name] = position
+        return position
+
+
+    def rollback(self, checkpoint):
+        """Undoes edits, or redoes undone ones, until the puzzle is back in the
+        state it was in at a checkpoint. Edits rolled back can be redone.
+
+        checkpoint = A name given to checkpoint, or a position it returned. An
+            unknown name raises KeyError, and an out of range position IndexError."""
+        if self._journal is None:
+            self._journal = Sudoku_Journal.Journal()
+        position = self._journal.position(checkpoint)
+        while len(self._journal.history) > position:
+            self.undo()
+        while len(self._journal.history) < position:
+            self.redo()
+
+
+    def changes(self, since=0):
+        """Returns the change log of the edits applied since a checkpoint, as a
+        list of (row, col, old, new) tuples, oldest first, where old and new are
+        the values of the square at row and col before and after the change.
+
+        since = A name given to checkpoint, or a position it returned, where
+            the default 0 gives every change in the journal"""
+        if self._journal is None:
+            return []
+        return [(ind // self.sl, ind % self.sl, old, new)
+                for ind, old, new in self._journal.changes(self._journal.position(since))]
+
+
+    def clear_history(self):
+        """Empties the edit journal, forgetting every edit and checkpoint"""
+        self._journal = None
+
+
+    def _record(self, changes):
+        """Adds an edit, a tuple of (ind, old, new) changes, to the journal"""
+        if self._journal is None:
+            self._journal = Sudoku_Journal.Journal()
+        self._journal.record(changes)
+
+
+    def _apply(self, changes, undo):
+        """Makes the changes of a journaled edit, or reverts them if undo is
+        True, keeping the incremental cache up to date"""
+        for ind, old, new in (reversed(changes) if undo else changes):
+            if undo:
+                old, new = new, old
+            row, col = ind // self.sl, ind % self.sl
+            if old != 0:
+                if self._known is not None:
+                    self._update_known(ind, 0)
+                self._remove(row, col)
+            if new != 0:
+                self._place(row, col, new)
+                if self._known is not None:
+                    self._update_known(ind, new)
+
+
+    def is_one_sol(self, row=0, col=0, sols=None, strategy=ROW_MAJOR, propagate=True, budget=None):
+        """Attempts to solve the solve the Sudoku object puzzle, 
+        without mutating the Sudoku object, and returns a boolean
+        of whether there is exactly one solution to the puzzle.
+        The number of search nodes visited is stored in self.nodes, and the
+        progress made by each propagation technique in self.technique_counts.
+
+        strategy = ROW_MAJOR to fill squares in row order starting at row and 
+            col, MRV to always fill the square with the fewest candidates, or
+            DLX to search the exact cover matrix of the puzzle with Dancing Links
+        propagate = A boolean of whether to first fill and rule out squares with
+            Sudoku_Logic constraint propagation, only when starting at (0, 0)
+        budget = A Sudoku_Budget.Budget, or None for no limit. If it runs out,
+            the puzzle is left unchanged and BUDGET_EXCEEDED is returned.
+
+        return: A boolean of whether the Sudoku puzzle has exactly
+        one solution"""
+        if budget is not None:
+            return self._within(budget, self.is_one_sol, row, col, sols, strategy, propagate)
+        if self.stats is not None:
+            self.stats.uniqueness_checks += 1
+        if self._known is not None and row == 0 and col == 0 and sols is None:
+            return self._cached_count(2, strategy, propagate) == 1
+        return self._search(strategy, 2, False, row, col, propagate, sols) == 1
+
+
+    def count_solutions(self, limit=None, strategy=ROW_MAJOR, propagate=True, budget=None):
+        """Counts the solutions of the puzzle, without mutating the puzzle, 
+        stopping once limit are found. Solutions are counted as they are found
+        rather than kept, so memory use does not grow with their number.
+        The number of search nodes visited is stored in self.nodes, and the
+        progress made by each propagation technique in self.technique_counts.
+
+        limit = An integer, or None to count every solution
+        strategy = ROW_MAJOR, MRV or DLX, as in solve_sudoku
+        propagate = A boolean of whether to first fill and rule out squares with
+            Sudoku_Logic constraint propagation
+        budget = A Sudoku_Budget.Budget, or None for no limit. If it runs out,
+            the puzzle is left unchanged and BUDGET_EXCEEDED is returned.
+
+        return: An integer of the number of solutions found, at most limit"""
+        if budget is not None:
+            return self._within(budget, self.count_solutions, limit, strategy, propagate)
+        return self._search(strategy, limit, False, propagate=propagate)
+
+
+    def _within(self, budget, method, *args):
+        """Calls method(*args) with its searches charged to budget, returning
+        BUDGET_EXCEEDED instead if the budget runs out. Searches restore the
+        puzzle when they are abandoned, so it is left as it was."""
+        previous = self._budget
+        self._budget = budget
+        try:
+            budget.check()
+            return method(*args)
+        except Sudoku_Errors.BudgetExceededException:
+            return BUDGET_EXCEEDED
+        finally:
+            self._budget = previous
+
+
+    def iter_solutions(self, limit=None, strategy=ROW_MAJOR, propagate=True):
+        """Returns a generator yielding each solution of the puzzle as a new
+        Board, found lazily as the generator is advanced, so a caller can stop
+        at any point. The puzzle must not be changed while the generator is in
+        use, and is left unchanged once it finishes or is closed.
+
+        limit = An integer, or None to yield every solution
+        strategy = ROW_MAJOR, MRV or DLX, as in solve_sudoku
+        propagate = A boolean of whether to first fill and rule out squares with
+            Sudoku_Logic constraint propagation
+
+        return: A generator of Boards"""
+        self._check_strategy(strategy)
+        return self._iter_solutions(limit, strategy, propagate)
+
+
+    def _iter_solutions(self, limit, strategy, propagate):
+        """The generator returned by iter_solutions"""
+        found = 0
+        states = self._solution_states(strategy, propagate=propagate)
+        try:
+            while limit is None or found < limit:
+                if not next(states, False):
+                    return
+                found += 1
+                yield self.puzzle.copy()
+        finally:
+            states.close()
+
+
+    def _check_strategy(self, strategy):
+        """Raises InvalidStrategyException if strategy is not one of STRATEGIES"""
+        if strategy not in STRATEGIES:
+            raise Sudoku_Errors.InvalidStrategyException(strategy, 
+                "Unknown search strategy, must be one of {}".format(STRATEGIES))
+
+
+    def _search(self, strategy, limit, keep, row=0, col=0, propagate=True, sols=None):
+        """Searches for up to limit solutions with the given strategy, as in
+        _solution_states. If keep is True, the first solution found is left in
+        the puzzle, otherwise the puzzle is left unchanged. If sols is a list, 
+        True is appended to it for each solution found.
+
+        limit = An integer, or None for no limit
+
+        return: An integer of the number of solutions found, at most limit"""
+        self._check_strategy(strategy)
+
+        # For testing reasons, solutions already in sols count towards the limit
+        found = len(sols) if sols is not None else 0
+        first = None
+        states = self._solution_states(strategy, row, col, propagate)
+        try:
+            while (limit is None or found < limit) and next(states, False):
+                if keep and first is None:
+                    first = self.puzzle.copy()
+                if sols is not None:
+                    sols.append(True)
+                found += 1
+        finally:
+            # Closing the search restores the puzzle to how it was before it
+            states.close()
+
+        if first is not None:
+            self._fill(first.cells)
+        return found if limit is None else min(found, limit)
+
+
+    def fill(self, solution):
+        """Fills each empty square with its value in solution, as solve_sudoku
+        does, logging every square filled as one edit that undo reverts at once.
+
+        solution = A flat sequence of square values in row order, such as the
+            cells of a solved copy, which must be a solution of the puzzle"""
+        self._fill(solution)
+        if self._known is not None:
+            self._known, self._count, self._changed = [bytes(self.puzzle.cells)], 1, set()
+
+
+    def _fill(self, solution):
+        """Fills each empty square with its value in solution, a flat sequence
+        of square values in row order, journaling the squares filled as one edit"""
+        changes = []
+        for ind in range(len(solution)):
+            if self.puzzle.cells[ind] == 0:
+                self._place(ind // self.sl, ind % self.sl, solution[ind])
+                changes.append((ind, 0, solution[ind]))
+        if changes:
+            self._record(tuple(changes))
+
+
+    def _cached_count(self, limit, strategy, propagate):
+        """Counts the solutions of the puzzle up to limit, 1 or 2, using and
+        updating the incremental cache, as described in set_incremental.
+
+        return: An integer of the number of solutions, at most limit"""
+        self._check_strategy(strategy)
+        self.nodes = 0
+        if self._count is not None:
+            return min(self._count, limit)
+        if len(self._known) >= limit:
+            return limit
+
+        # A solution known to be the only one before some squares were removed
+        # only needs those squares searched for a second solution
+        if self._known and self._changed is not None:
+            return self._check_changed(strategy, propagate)
+
+        self._known = [bytes(solution.cells) for solution in self._iter_solutions(limit, strategy, propagate)]
+        count = len(self._known)
+        if count < limit or limit == 2:
+            self._count = count
+            self._changed = set() if count == 1 else None
+        return count
+
+
+    def _check_changed(self, strategy, propagate):
+        """Searches for a solution other than self._known[0], which must differ
+        from it in one of the squares in self._changed. Each other value of
+        those squares is first propagated with singles, which rules out or
+        fills the puzzle with most of them, and only the rest are searched.
+        Each square then holds its known value while the squares after it are
+        tried, as any other solution left must differ in a later square.
+
+        return: 1 if there is no other solution, 2 otherwise"""
+        solution = self._known[0]
+        nodes = 0
+        placed = []
+        try:
+            for ind in sorted(self._changed):
+                row, col = ind // self.sl, ind % self.sl
+                if self.puzzle.cells[ind] != 0:
+                    continue
+
+                # MRV and Dancing Links branch on the tightest squares themselves, so
+                # each value is searched from where singles left it. Square order
+                # search needs full propagation to stay small, and searches every
+                # value left at once so the squares before this one are only
+                # searched once.
+                state = Sudoku_Logic.Candidate_State(self)
+                left = 0
+                other = None
+                for value in self.candidates(row, col):
+                    if value == solution[ind]:
+                        continue
+                    trial = state.copy()
+                    singles = (Sudoku_Logic.NAKED_SINGLE, Sudoku_Logic.HIDDEN_SINGLE)
+                    if not (trial.assign(ind, value) and trial.propagate(singles, self._budget)):
+                        continue
+                    if trial.is_solved():
+                        other = bytes(trial.values)
+                    elif strategy != ROW_MAJOR:
+                        other = self._search_from(trial, strategy, False)
+                        nodes += self.nodes
+                    else:
+                        left |= 1 << value
+                    if other:
+                        break
+                if left and not other:
+                    state.cands[ind] = left
+                    other = self._search_from(state, strategy, propagate)
+                    nodes += self.nodes
+
+                if other:
+                    self._known.append(other)
+                    self._count, self._changed, self.nodes = 2, None, nodes
+                    return 2
+                self._place(row, col, solution[ind])
+                placed.append((row, col))
+        finally:
+            for row, col in placed:
+                self._remove(row, col)
+
+        self._count, self._changed, self.nodes = 1, set(), nodes
+        return 1
+
+
+    def _search_from(self, state, strategy, propagate):
+        """Searches for a solution of the puzzle with the squares a
+        Sudoku_Logic.Candidate_State of it filled, and the rest restricted to
+        its candidates, leaving the puzzle unchanged.
+
+        return: The cells of the solution found as bytes, or None if there is none"""
+        for r, c, value in state.placements:
+            self._place(r, c, value)
+        self._allowed = state.cands
+        try:
+            found = [bytes(solution.cells) for solution in self._iter_solutions(1, strategy, propagate)]
+            return found[0] if found else None
+        finally:
+            self._allowed = None
+            for r, c, _ in state.placements:
+                self._remove(r, c)
+
+
+    def _solution_states(self, strategy, row=0, col=0, propagate=True):
+        """A generator that searches for solutions with the given strategy, after
+        constraint propagation if propagate is True and the search starts at
+        (0, 0), yielding True each time the puzzle holds a solution. The puzzle
+        is restored when the generator finishes or is closed. The number of 
+        search nodes visited is stored in self.nodes, and the progress made by
+        each propagation technique in self.technique_counts."""
+        self.nodes = 0
+        self.technique_counts = dict.fromkeys(Sudoku_Logic.TECHNIQUES, 0)
+        stats = self.stats
+        if stats is not None:
+            stats.searches += 1
+            start = time.perf_counter()
+        if self._budget is not None:
+            self._budget.check()
+
+        # Fill the squares that logic alone determines, and restrict the search
+        # to the candidates propagation did not rule out
+        placed = []
+        if propagate and row == 0 and col == 0:
+            state = Sudoku_Logic.Candidate_State(self)
+            consistent = state.propagate(budget=self._budget)
+            self.technique_counts = state.counts
+            if stats is not None:
+                stats.propagation_seconds += time.perf_counter() - start
+            if not consistent:
+                return
+            for r, c, value in state.placements:
+                self._place(r, c, value)
+                placed.append((r, c))
+            self._allowed = state.cands
+
+        try:
+            if strategy == DLX:
+                solutions = self._dlx_solutions()
+            else:
+                # Row-major only visits the squares from (row, col) on, as the squares
+                # before the starting square are left out of the search
+                squares = self._empty_squares()
+                if strategy == ROW_MAJOR:
+                    squares = [(r, c) for r, c in squares if r*self.sl + c >= row*self.sl + col]
+                solutions = self._solutions(squares, strategy == MRV)
+
+            # Time the search while it runs, but not while a solution is yielded
+            try:
+                if stats is not None:
+                    start = time.perf_counter()
+                for _ in solutions:
+                    if stats is not None:
+                        stats.branching_seconds += time.perf_counter() - start
+                    yield True
+                    if stats is not None:
+                        start = time.perf_counter()
+                if stats is not None:
+                    stats.branching_seconds += time.perf_counter() - start
+            finally:
+                solutions.close()
+        finally:
+            self._allowed = None
+            for r, c in placed:
+                self._remove(r, c)
+
+
+    def _dlx_solutions(self):
+        """A generator that searches the exact cover matrix of the puzzle with
+        Dancing Links, yielding True each time the puzzle holds a solution, as
+        _solutions does"""
+        matrix = Sudoku_DLX.sudoku_matrix(self, self._budget)
+        matrix.stats = self.stats
+        matrix.budget = self._budget
+        solutions = matrix.solutions()
+        try:
+            # Write each exact cover into the puzzle while it is yielded
+            for solution in solutions:
+                self.nodes = matrix.nodes
+                for r, c, value in solution:
+                    self._place(r, c, value)
+                try:
+                    yield True
+                finally:
+                    for r, c, _ in solution:
+                        self._remove(r, c)
+        finally:
+            solutions.close()
+            self.nodes = matrix.nodes
+
+
+    def _empty_squares(self):
+        """Returns a list of (row, col) tuples of every empty square in the puzzle"""
+        cells = self.puzzle.cells
+        return [(ind // self.sl, ind % self.sl) for ind in range(len(cells)) if cells[ind] == 0]
+
+
+    def _lcv_order(self, squares, depth, row, col, mask):
+        """Orders the candidate values in mask for the square at row and col by 
+        least constraining value: values that remove a candidate from the fewest
+        other empty squares in squares[depth:] sharing a row, column or box come first.
+
+        return: A list of integer values"""
+        box = self._box(row, col)
+        counts = [0]*(self.sl+1)
+
+        # Count how many peers still have each value as a candidate
+        for r, c in squares[depth:]:
+            if r == row or c == col or self._box(r, c) == box:
+                peer_mask = self.candidate_mask(r, c) & mask
+                while peer_mask:
+                    bit = peer_mask & -peer_mask
+                    counts[bit.bit_length()-1] += 1
+                    peer_mask ^= bit
+
+        values = [value for value in range(1, self.sl+1) if (mask >> value) & 1]
+        values.sort(key=lambda value: counts[value])
+        return values
+
+
+    def _solutions(self, squares, mrv):
+        """A generator that fills the empty squares in the list of (row, col) 
+        tuples squares, yielding each time all of them are filled, with the 
+        puzzle holding that solution. The search uses an explicit stack rather
+        than recursion, and the puzzle is restored when the generator finishes
+        or is closed.
+
+        squares = A list of the empty squares to fill, which is reordered in place
+        mrv = A boolean of whether to branch on the square with the fewest
+            candidates, trying least constraining values first, rather than
+            filling squares in the order given, trying values in increasing order"""
+        # Stack of [row, col, values left to try] for each square filled so far, 
+        # with squares[:len(stack)] being those squares
+        stack = []
+        stats = self.stats
+        budget = self._budget
+        try:
+            while True:
+                depth = len(stack)
+
+                # If every square is filled, this is a solution
+                if depth == len(squares):
+                    yield True
+
+                elif mrv:
+                    # Find the unfilled square with the fewest candidates, stopping 
+                    # early on a square with none (dead end) or exactly one (forced)
+                    best, best_mask, best_count = depth, 0, self.sl+1
+                    for ind in range(depth, len(squares)):
+                        mask = self.candidate_mask(*squares[ind])
+                        count = popcount(mask)
+                        if count < best_count:
+                            best, best_mask, best_count = ind, mask, count
+                            if count <= 1:
+                                break
+                    if stats is not None:
+                        stats.candidate_checks += ind - depth + 1
+
+                    # Move the chosen square to the front of the unfilled squares
+                    squares[depth], squares[best] = squares[best], squares[depth]
+                    row, col = squares[depth]
+                    values = self._lcv_order(squares, depth+1, row, col, best_mask) if best_count else []
+                    stack.append([row, col, values[::-1]])
+
+                else:
+                    row, col = squares[depth]
+                    stack.append([row, col, self.candidates(row, col)[::-1]])
+                    if stats is not None:
+                        stats.candidate_checks += 1
+
+                # Fill the deepest square with its next value, backtracking out of
+                # squares that have no values left to try
+                while stack:
+                    row, col, values = stack[-1]
+                    last = self.puzzle.cells[row*self.sl + col]
+                    if last != 0:
+                        self._remove(row, col)
+                    if values:
+                        self.nodes += 1
+                        value = values.pop()
+                        self._place(row, col, value)
+                        if stats is not None:
+                            stats.placed(len(stack) - 1, (row, col, value))
+                        if budget is not None:
+                            budget.charge()
+                        break
+                    stack.pop()
+                    if stats is not None:
+                        stats.backtracked(len(stack), (row, col, last))
+                else:
+                    return
+        finally:
+            for row, col, _ in stack:
+                if self.puzzle.cells[row*self.sl + col] != 0:
+                    self._remove(row, col)
 
 
 
@@ -310,38 +1091,40 @@ class Create_Sudoku():
         self.bs = int(math.sqrt(sl))
 
 
-    def random_insertion(self, puzzle, num_squares, avail, deleted):
+    def random_insertion(self, puzzle, num_squares, avail, deleted, orbits=None):
         """Given a Sudoku object puzzle, randomly inserts a valid value into
-        Sudoku puzzle, at an available index in avail.
+        Sudoku puzzle, at an available index in avail, and into every other
+        square of its orbit in orbits, a dictionary from orbits(), if given.
 
         return: An integer of the number of squares that were successfully 
         inserted"""
         rv = 0
         for _ in range(min(num_squares, len(avail))):
-            # Initialize possible values for random square, and choose row and column of square
-            vals = [i for i in range(self.sl+1) if i != 0]
+            # Put a random valid value into each square of a random orbit, or into
+            # none of them if one has no valid value left
             ind = random.choice(avail)
-            row = ind // self.sl
-            col = ind % self.sl
-
-            # Attempt to put random value into random square
-            while len(vals):
-                val = random.choice(vals)
-                if puzzle.valid_square(row, col, val):
-                    puzzle.insert(row, col, val)
-                    avail.remove(ind)
-                    deleted.append(ind)
-                    rv += 1
+            kept = puzzle.checkpoint()
+            for square in (orbits[ind] if orbits is not None else (ind,)):
+                row = square // self.sl
+                col = square % self.sl
+                vals = puzzle.candidates(row, col)
+                if not vals:
+                    puzzle.rollback(kept)
                     break
-                vals.remove(val)
+                puzzle.insert(row, col, random.choice(vals))
+            else:
+                avail.remove(ind)
+                deleted.append(ind)
+                rv += 1
         
         # Return the amount of successful insertions
         return rv
 
 
-    def random_deletion(self, puzzle, num_squares, avail, deleted):
+    def random_deletion(self, puzzle, num_squares, avail, deleted, orbits=None):
         """Given a Sudoku object puzzle, randomly deletes values from
-        Sudoku puzzle, at available indices in deleted
+        Sudoku puzzle, at available indices in deleted, along with the rest of
+        their orbits in orbits, a dictionary from orbits(), if given
 
         return: An integer of the number of squares that were successfully 
         deleted"""
@@ -354,60 +1137,326 @@ class Create_Sudoku():
             ind = random.choice(deleted)
             avail.append(ind)
             deleted.remove(ind)
-            row = ind // self.sl
-            col = ind % self.sl
-            puzzle.insert(row, col, 0)
+            for square in (orbits[ind] if orbits is not None else (ind,)):
+                puzzle.insert(square // self.sl, square % self.sl, 0)
             rv += 1
         
         # Return the amount of successful deletions
         return rv
 
 
-    def create(self, show=False):
-        """Returns a pseudorandom puzzle as a Sudoku object"""
-        # First create empty Sudoku object, and set of indices of empty squares
-        puzzle = Sudoku("0 "*(self.sl**2))
-        indices = [i for i in range(self.sl**2)]
+    def orbits(self, symmetry=None):
+        """Returns a dictionary mapping the flat index of each square to a tuple
+        of the indices of the squares of its orbit, which are filled and emptied
+        together to keep the layout symmetry of SYMMETRIES, in increasing order
+
+        symmetry = A layout of SYMMETRIES, or None for every square to be its
+            own orbit"""
+        sl = self.sl
+        orbits = {}
+        for ind in range(sl**2):
+            row, col = ind // sl, ind % sl
+            if symmetry == ROTATIONAL:
+                image = (sl-1 - row)*sl + sl-1 - col
+            elif symmetry == MIRROR:
+                image = row*sl + sl-1 - col
+            else:
+                image = ind
+            orbits[ind] = tuple(sorted(set((ind, image))))
+        return orbits
+
+
+    def solution_grid(self):
+        """Returns a pseudorandom solved puzzle as a Sudoku object, made by
+        relabelling the values of a patterned solution, shuffling the rows 
+        within each band, the bands, the columns within each stack and the 
+        stacks, and transposing it half of the time"""
+        sl, bs = self.sl, self.bs
+        values = random.sample(range(1, sl+1), sl)
+        rows = [band*bs + row for band in random.sample(range(bs), bs) for row in random.sample(range(bs), bs)]
+        cols = [stack*bs + col for stack in random.sample(range(bs), bs) for col in random.sample(range(bs), bs)]
+        if random.random() < 0.5:
+            rows, cols = cols, rows
+
+        # The pattern shifts each row of a band by one box, and each band by one square
+        grid = [values[(bs*(row % bs) + row//bs + col) % sl] for row in rows for col in cols]
+        return Sudoku.from_values(grid, validate=False)
+
+
+    def removable(self, puzzle, row, col, strategy=DLX):
+        """Given a Sudoku object puzzle with exactly one solution, determines if
+        the value at row and col can be removed with the puzzle still having 
+        exactly one solution. Only the other candidates of that square need to
+        be searched, as the rest of the puzzle already has one solution.
+
+        return: A boolean of whether the square can be emptied"""
+        value = puzzle.puzzle.cells[row*self.sl + col]
+        kept = puzzle.checkpoint()
+        puzzle.insert(row, col, 0)
+        if puzzle.stats is not None:
+            puzzle.stats.uniqueness_checks += 1
+
+        # If another value in the square also leads to a solution, the value must stay
+        for other in puzzle.candidates(row, col):
+            if other == value:
+                continue
+            puzzle.insert(row, col, other)
+            solvable = puzzle.is_solvable(strategy=strategy)
+            puzzle.undo()
+            if solvable:
+                puzzle.rollback(kept)
+                return False
+        return True
+
+
+    def dig(self, puzzle, clues=None, show=False, difficulty=None, grader=None, symmetry=None):
+        """Given a Sudoku object puzzle with exactly one solution, removes values
+        one orbit of symmetry at a time in random order, keeping only the
+        removals that leave exactly one solution, until clues values remain or
+        every value has been tried once.
+
+        Given a difficulty, the orbits are taken from the fullest rows, columns
+        and boxes first, ties in random order, and each removal is first
+        checked by propagating the Sudoku_Logic techniques of the levels up to
+        it. Propagation only removes values that are in no solution, so if it
+        fills every square the puzzle still has one solution and is graded by
+        the hardest technique used, with no search or grading needed.
+        Otherwise the removal is put back straight away for levels that need
+        no search, and searched and graded for the rest.
+
+        clues = An integer of the number of values to stop at, a tuple (fewest,
+            most) to stop at most values once the puzzle is at the difficulty
+            level and at fewest values in any case, or None to remove as many
+            as possible
+        difficulty = A level of Sudoku_Grade.LEVELS to steer toward, putting
+            back every removal that makes the puzzle harder than it, or None
+        grader = The Sudoku_Grade.Grader to grade with, which must be given
+            with difficulty
+        symmetry = A layout of SYMMETRIES to keep, or None to remove one value
+            at a time. Orbits that would take the puzzle below clues values
+            are skipped, so it may stop a few values above them.
+
+        return: An integer of the number of values removed"""
+        fewest, most = clues if isinstance(clues, tuple) else (clues, clues)
+        level = target = None
+        if difficulty is not None:
+            # Imported here, as Sudoku_Grade imports this module
+            import Sudoku_Grade
+            levels = Sudoku_Grade.LEVELS
+            target = levels.index(difficulty)
+            level = levels.index(grader.grade(puzzle).level)
+            searched = target > levels.index(Sudoku_Grade.HARD)
+            techniques = [technique for technique in Sudoku_Logic.TECHNIQUES
+                          if levels.index(Sudoku_Grade.TECHNIQUE_LEVELS[technique]) <= target]
+
+            # Stop as soon as a harder level is reached, as removing more only
+            # mostly makes the puzzle harder still, while an easy one is dug out
+            if most is None and level < target:
+                most = len(puzzle.puzzle.cells)
+
+        # The filled squares of each orbit
+        orbits = self.orbits(symmetry)
+        squares = [tuple(ind for ind in orbit if puzzle.puzzle.cells[ind] != 0)
+                   for ind, orbit in orbits.items() if orbit[0] == ind]
+        squares = [orbit for orbit in squares if orbit]
+        random.shuffle(squares)
+        removed = 0
+        remaining = sum(len(orbit) for orbit in squares)
+
+        # The rows, columns and boxes of each square, numbered 0 to 3*sl - 1, and
+        # the number of values left in each
+        units = [(ind // self.sl, self.sl + ind % self.sl,
+                  2*self.sl + self.bs*(ind // self.sl // self.bs) + ind % self.sl // self.bs)
+                 for ind in range(self.sl**2)]
+        filled = [0]*(3*self.sl)
+        for ind in range(self.sl**2):
+            if puzzle.puzzle.cells[ind] != 0:
+                for unit in units[ind]:
+                    filled[unit] += 1
+
+        while squares:
+            # Steering toward a difficulty, take the orbit from the fullest units
+            # first, which keeps the values left spread out so the techniques run
+            # out of easy deductions before the puzzle runs out of values
+            pick = -1
+            if difficulty is not None:
+                pick = max(range(len(squares)), key=lambda k: sum(
+                    filled[unit] for ind in squares[k] for unit in units[ind]) / len(squares[k]))
+            orbit = squares.pop(pick)
+            if most is not None and remaining <= most and level == target:
+                break
+            if fewest is not None and remaining - len(orbit) < fewest:
+                continue
+            if puzzle._budget is not None:
+                puzzle._budget.check()
+
+            before = puzzle.checkpoint()
+            solved = False
+            if difficulty is not None:
+                for ind in orbit:
+                    puzzle.insert(ind // self.sl, ind % self.sl, 0)
+                if puzzle.stats is not None:
+                    puzzle.stats.uniqueness_checks += 1
+                # Propagating searches nothing, so it is charged as one node for
+                # node budgets to still bound levels that are out of reach
+                if puzzle._budget is not None:
+                    puzzle._budget.charge()
+                state = Sudoku_Logic.Candidate_State(puzzle)
+                solved = state.propagate(techniques) and state.is_solved()
+                if solved:
+                    used = [technique for technique in techniques if state.counts[technique]]
+                    level = levels.index(Sudoku_Grade.TECHNIQUE_LEVELS[used[-1]]) if used else 0
+                else:
+                    puzzle.rollback(before)
+                    if not searched:
+                        continue
+
+            # A puzzle with one solution still has one with any of its values put
+            # back, so removing the orbit one square at a time checks all of it
+            if not solved:
+                if not all(self.removable(puzzle, ind // self.sl, ind % self.sl) for ind in orbit):
+                    puzzle.rollback(before)
+                    continue
+                if difficulty is not None:
+                    graded = levels.index(grader.grade(puzzle).level)
+                    if graded > target:
+                        puzzle.rollback(before)
+                        continue
+                    level = graded
+            removed += len(orbit)
+            remaining -= len(orbit)
+            for ind in orbit:
+                for unit in units[ind]:
+                    filled[unit] -= 1
+            if show:
+                print(render(puzzle.puzzle))
+        return removed
+
+
+    def create(self, show=False, mode=DIG, clues=None, stats=None, budget=None, difficulty=None, symmetry=None):
+        """Returns a pseudorandom puzzle with exactly one solution as a Sudoku object
+
+        show = A boolean of whether to print the puzzle as it is generated
+        mode = DIG to remove values from a random solved puzzle, taking one
+            uniqueness check per candidate of each square, or RANDOM_WALK to 
+            randomly insert and delete values until the puzzle has one solution
+        clues = An integer of the number of values for DIG to stop removing at,
+            a tuple (fewest, most) of the range of values the puzzle must
+            have, or None to remove as many as possible
+        stats = A Sudoku_Stats.Search_Stats that the inserts, removals, 
+            uniqueness checks and searches made while generating are added
+            to, or None
+        budget = A Sudoku_Budget.Budget every search made while generating is
+            charged to, or None for no limit. If it runs out, BUDGET_EXCEEDED
+            is returned instead of a puzzle.
+        difficulty = A level of Sudoku_Grade.LEVELS the puzzle must be graded
+            at, or None for any level. DIG steers its removals toward the level
+            and the range of clues, stopping as soon as both are reached, and
+            puzzles that miss either are made again, so give a budget for
+            targets that may be out of reach.
+        symmetry = A layout of SYMMETRIES for the values of the puzzle, or None
+            for any layout"""
+        if mode not in MODES:
+            raise Sudoku_Errors.InvalidStrategyException(mode, 
+                "Unknown generation mode, must be one of {}".format(MODES))
+        if symmetry is not None and symmetry not in SYMMETRIES:
+            raise Sudoku_Errors.InvalidStrategyException(symmetry,
+                "Unknown symmetry, must be one of {}".format(SYMMETRIES))
+
+        # Imported here, as Sudoku_Grade imports this module
+        import Sudoku_Grade
+        if difficulty is not None and difficulty not in Sudoku_Grade.LEVELS:
+            raise Sudoku_Errors.InvalidStrategyException(difficulty,
+                "Unknown difficulty level, must be one of {}".format(Sudoku_Grade.LEVELS))
+        grader = Sudoku_Grade.Grader() if difficulty is not None else None
+
+        while True:
+            if mode == DIG:
+                puzzle = self.solution_grid()
+            else:
+                puzzle = Sudoku.from_values(bytes(self.sl**2))
+
+            # Count what generating does and charge it to the budget, without leaving
+            # either attached to the puzzle, nor a journal that undoes back to the solution
+            puzzle.stats = stats
+            puzzle._budget = budget
+            try:
+                if budget is not None:
+                    budget.check()
+                if mode == DIG:
+                    self.dig(puzzle, clues, show, difficulty, grader, symmetry)
+                else:
+                    self.random_walk(puzzle, show, symmetry)
+            except Sudoku_Errors.BudgetExceededException:
+                return BUDGET_EXCEEDED
+            finally:
+                puzzle.stats = None
+                puzzle._budget = None
+                puzzle.clear_history()
+
+            # Make the puzzle again if it missed the range of clues or the level
+            count = len(puzzle.puzzle.cells) - puzzle.puzzle.cells.count(0)
+            if isinstance(clues, tuple) and not (clues[0] <= count <= clues[1]):
+                continue
+            if difficulty is not None and grader.grade(puzzle).level != difficulty:
+                continue
+            return puzzle
+
+
+    def random_walk(self, puzzle, show=False, symmetry=None):
+        """Given an empty Sudoku object puzzle, randomly inserts and deletes
+        values, a whole orbit of symmetry at a time, until the puzzle has
+        exactly one solution"""
+        # Set of indices of empty orbits, and of filled orbits, each given by its
+        # first square
+        orbits = self.orbits(symmetry)
+        indices = [ind for ind, orbit in orbits.items() if orbit[0] == ind]
         deleted = []
 
         # First add pseudorandom squares into puzzle, try 1/2 of total squares
-        num_squares_to_add = (self.sl**2) // 2
-        self.random_insertion(puzzle, num_squares_to_add, indices, deleted)
+        num_squares_to_add = len(indices) // 2
+        self.random_insertion(puzzle, num_squares_to_add, indices, deleted, orbits)
+
+        # Number of orbits to delete and insert to revamp the puzzle, about 2 and
+        # 10 rows of squares
+        num_dels = max(1, self.sl*2 * len(indices) // self.sl**2)
+        num_ins = max(1, self.sl*10 * len(indices) // self.sl**2)
 
         # Repeat steps of deleting/inserting until one solution puzzle created
         while True:
             if show:
-                print(render(puzzle.get_puzzle()))
-            # Now check if one solution exists, and return Sudoku object if it does
-            s = time.time()
-            if puzzle.is_one_sol():
-                return puzzle
-            t = time.time()
+                print(render(puzzle.puzzle))
+            if puzzle._budget is not None:
+                puzzle._budget.check()
+
+            # Now check if one solution exists, and return if it does, giving up on
+            # the check after half a second
+            one = puzzle.is_one_sol(budget=Sudoku_Budget.Budget(0.5, parent=puzzle._budget))
+            if one:
+                return
 
             # If solving takes too much time, "revamp" process by deleting and inserting 
             # multiple squares
-            if t-s > 0.5:
+            if one is BUDGET_EXCEEDED:
                 dels, ins = 1, 0
                 while dels > ins:
-                    dels = self.random_deletion(puzzle, self.sl*2, indices, deleted)
-                    ins = self.random_insertion(puzzle, self.sl*10, indices, deleted) 
+                    dels = self.random_deletion(puzzle, num_dels, indices, deleted, orbits)
+                    ins = self.random_insertion(puzzle, num_ins, indices, deleted, orbits)
 
             # If not one solution exists and it's solvable, more than one solution exists
             elif puzzle.is_solvable():
                 dels, ins = 1, 0
                 while dels > ins:
-                    dels = self.random_deletion(puzzle, self.sl*2, indices, deleted)
-                    ins = self.random_insertion(puzzle, self.sl*10, indices, deleted)
+                    dels = self.random_deletion(puzzle, num_dels, indices, deleted, orbits)
+                    ins = self.random_insertion(puzzle, num_ins, indices, deleted, orbits)
 
             # Else, there are no solutions, so must delete a square
             else:
-                self.random_deletion(puzzle, 1, indices, deleted)
-
-        return puzzle
+                self.random_deletion(puzzle, 1, indices, deleted, orbits)
 
 
 if __name__ == "__main__":
     # An example of creating a pseudorandom 9x9 Sudoku puzzle
     s = Create_Sudoku(9).create(True)
-    puz = render(s.get_puzzle())
+    puz = render(s.puzzle)
     print(puz)
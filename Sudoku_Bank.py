@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A binary file format for banks of generated Sudoku puzzles with their
+solutions, written once and read by memory-mapping the file, so that any
+puzzle can be fetched without reading the rest of the bank.
+
+A bank starts with a header of the magic bytes, the format version, the
+largest side length it holds and the size of each record. Every record has
+the same size: the puzzle's side length, clue count and difficulty score,
+then the puzzle and its solution with each square packed into as few bits
+as the largest side length needs.
+"""
+import collections
+import mmap
+import random
+import struct
+import Sudoku
+import Sudoku_Errors
+import Sudoku_Grade
+
+MAGIC = b"SUDOKUBK"
+VERSION = 1
+
+# Header: magic, version, largest side length, record size
+_HEADER = struct.Struct("<8sHHI")
+
+# Start of each record: side length, clue count, difficulty score
+_RECORD = struct.Struct("<HHf")
+
+# One puzzle read from a bank, with puzzle and solution as Sudoku objects
+Bank_Record = collections.namedtuple("Bank_Record", ["index", "sl", "clues", "difficulty", "puzzle", "solution"])
+
+
+def _bits(max_sl):
+    """Returns the number of bits each square is packed into for a bank with
+    largest side length max_sl"""
+    return max_sl.bit_length()
+
+
+def _packed_size(max_sl):
+    """Returns the number of bytes a packed board takes in a bank with largest
+    side length max_sl"""
+    return (max_sl*max_sl*_bits(max_sl) + 7) // 8
+
+
+def _pack(cells, max_sl):
+    """Packs a flat sequence of square values into bytes, the first square in
+    the lowest bits"""
+    bits = _bits(max_sl)
+    packed = 0
+    for value in reversed(cells):
+        packed = (packed << bits) | value
+    return packed.to_bytes(_packed_size(max_sl), "little")
+
+
+def _unpack(data, count, max_sl):
+    """Unpacks the first count square values of a board packed by _pack
+    return: A bytearray of the square values"""
+    bits = _bits(max_sl)
+    mask = (1 << bits) - 1
+    packed = int.from_bytes(data, "little")
+    cells = bytearray(count)
+    for ind in range(count):
+        cells[ind] = packed & mask
+        packed >>= bits
+    return cells
+
+
+def difficulty_score(puzzle):
+    """Scores how hard a puzzle is with Sudoku_Grade.grade: the rank of the
+    hardest propagation technique it needs, plus 1 if any search was needed
+    after it, plus log2(1 + backtracks). Puzzles logic alone solves are told
+    apart by the techniques they need.
+
+    puzzle = A Sudoku object, which is not mutated
+
+    return: A tuple (score, solution), where solution is a solved copy of the
+    puzzle, or None if it has no solution, in which case score is 0"""
+    solution = puzzle.copy()
+    if not solution.solve_sudoku(strategy=Sudoku.DLX):
+        return 0.0, None
+    return Sudoku_Grade.grade(puzzle).score, solution
+
+
+
+class Bank_Writer():
+    """
+    RI: file is open for binary writing and positioned at the end of a
+    complete header and count complete records of record_size bytes.
+
+    AF(file, max_sl, count): A bank being written to file, holding count
+    puzzles with side lengths up to max_sl.
+
+    Safety From Rep Exposure: Added puzzles are packed straight into the file,
+    and no references to them are kept.
+    """
+
+    def __init__(self, sink, max_sl):
+        """Starts a new bank holding puzzles of side length up to max_sl.
+
+        sink = A path, or a file object opened for binary writing
+        max_sl = An integer of the largest side length of the puzzles"""
+        self.max_sl = max_sl
+        self.record_size = _RECORD.size + 2*_packed_size(max_sl)
+        self.count = 0
+        self._owns_file = isinstance(sink, str)
+        self.file = open(sink, "wb") if self._owns_file else sink
+        self.file.write(_HEADER.pack(MAGIC, VERSION, max_sl, self.record_size))
+
+
+    def add(self, puzzle, solution=None, difficulty=None):
+        """Appends a puzzle to the bank. The solution and difficulty score are
+        found with difficulty_score unless both are given.
+
+        puzzle = A Sudoku object, or a string in the format Sudoku accepts
+        solution = A solved Sudoku object of the puzzle, or None
+        difficulty = A number, or None
+
+        return: An integer of the index of the puzzle in the bank"""
+        if isinstance(puzzle, str):
+            puzzle = Sudoku.Sudoku(puzzle)
+        if puzzle.sl > self.max_sl:
+            raise Sudoku_Errors.InvalidPuzzleException(puzzle.sl,
+                "Puzzle side length larger than the bank's largest side length {}".format(self.max_sl))
+        if solution is None or difficulty is None:
+            difficulty, solution = difficulty_score(puzzle)
+            if solution is None:
+                raise Sudoku_Errors.InvalidPuzzleException(Sudoku.render(puzzle.get_puzzle()),
+                    "Puzzle has no solution to store in the bank")
+
+        clues = len(puzzle.puzzle.cells) - puzzle.puzzle.cells.count(0)
+        self.file.write(_RECORD.pack(puzzle.sl, clues, difficulty))
+        self.file.write(_pack(puzzle.puzzle.cells, self.max_sl))
+        self.file.write(_pack(solution.puzzle.cells, self.max_sl))
+        self.count += 1
+        return self.count - 1
+
+
+    def close(self):
+        """Flushes the bank, closing its file if it was opened from a path"""
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+
+def write_bank(sink, puzzles, max_sl):
+    """Writes a bank of puzzles, adding each as it is read from the iterable.
+
+    sink = A path, or a file object opened for binary writing
+    puzzles = An iterable of Sudoku objects or strings in the format Sudoku accepts
+    max_sl = An integer of the largest side length of the puzzles
+
+    return: An integer of the number of puzzles written"""
+    with Bank_Writer(sink, max_sl) as writer:
+        for puzzle in puzzles:
+            writer.add(puzzle)
+        return writer.count
+
+
+
+class Puzzle_Bank():
+    """
+    RI: _map is a read-only memory map of a bank file with a valid header,
+    holding len(self) complete records after it. _meta is None or a list of
+    the (sl, clues, difficulty) of every record.
+
+    AF(_map): The puzzles of the bank file, in the order they were written.
+
+    Safety From Rep Exposure: Each record read is unpacked into new Sudoku
+    objects, and the memory map is never returned.
+    """
+
+    def __init__(self, path):
+        """Opens the bank file at path, mapping it into memory rather than reading it"""
+        with open(path, "rb") as bank:
+            self._map = mmap.mmap(bank.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise Sudoku_Errors.InvalidPuzzleException(path, "File too short to be a puzzle bank")
+
+        magic, version, self.max_sl, self.record_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise Sudoku_Errors.InvalidPuzzleException(path, "File is not a version {} puzzle bank".format(VERSION))
+        self._packed = _packed_size(self.max_sl)
+        self._meta = None
+
+
+    def __len__(self):
+        """Returns the number of puzzles in the bank"""
+        return (len(self._map) - _HEADER.size) // self.record_size
+
+
+    def __getitem__(self, index):
+        """Returns the Bank_Record of the puzzle at index, reading only its record"""
+        if index < 0:
+            index += len(self)
+        if not (0 <= index < len(self)):
+            raise IndexError("Puzzle bank index out of range")
+
+        offset = _HEADER.size + index*self.record_size
+        sl, clues, difficulty = _RECORD.unpack_from(self._map, offset)
+        offset += _RECORD.size
+        puzzle = _unpack(self._map[offset:offset + self._packed], sl*sl, self.max_sl)
+        offset += self._packed
+        solution = _unpack(self._map[offset:offset + self._packed], sl*sl, self.max_sl)
+        return Bank_Record(index, sl, clues, difficulty,
+                           Sudoku.Sudoku.from_values(puzzle, validate=False),
+                           Sudoku.Sudoku.from_values(solution, validate=False))
+
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+    def matching(self, sl=None, min_difficulty=None, max_difficulty=None):
+        """Returns a list of the indices of the puzzles with side length sl and
+        difficulty between min_difficulty and max_difficulty inclusive, where
+        None leaves that bound out. Only the start of each record is read, once
+        for the life of the bank."""
+        if self._meta is None:
+            self._meta = [_RECORD.unpack_from(self._map, _HEADER.size + index*self.record_size)
+                          for index in range(len(self))]
+
+        found = []
+        for index in range(len(self._meta)):
+            size, _, difficulty = self._meta[index]
+            if sl is not None and size != sl:
+                continue
+            if min_difficulty is not None and difficulty < min_difficulty:
+                continue
+            if max_difficulty is not None and difficulty > max_difficulty:
+                continue
+            found.append(index)
+        return found
+
+
+    def sample(self, count, sl=None, min_difficulty=None, max_difficulty=None, rng=random):
+        """Returns a list of count different Bank_Records chosen at random from
+        the puzzles matching the filters, as described in matching, or every
+        matching puzzle if there are fewer than count.
+
+        rng = A random.Random object, or the random module"""
+        found = self.matching(sl, min_difficulty, max_difficulty)
+        return [self[index] for index in rng.sample(found, min(count, len(found)))]
+
+
+    def close(self):
+        """Unmaps the bank file"""
+        self._map.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
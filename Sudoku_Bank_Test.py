@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+import Sudoku
+import Sudoku_Bank
+import Sudoku_Errors
+import unittest
+
+class Test_Puzzle_Bank(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(16)
+        self.puzzles = [Sudoku.Create_Sudoku(4).create() for _ in range(4)] +\
+                       [Sudoku.Create_Sudoku(9).create() for _ in range(4)]
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+        self.count = Sudoku_Bank.write_bank(self.path, self.puzzles, 9)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        self.assertEqual(self.count, 8, "expected 8 puzzles written, instead got {}".format(self.count))
+        with Sudoku_Bank.Puzzle_Bank(self.path) as bank:
+            self.assertEqual(len(bank), 8, "expected 8 puzzles in the bank, instead got {}".format(len(bank)))
+            for index in [5, 0, 7, -1]:
+                record = bank[index]
+                expected = self.puzzles[index]
+                self.assertEqual(record.puzzle.get_puzzle(), expected.get_puzzle(), 
+                    "expected puzzle {} to be read back".format(index))
+                self.assertEqual(record.sl, expected.sl, "expected the side length of puzzle {}".format(index))
+                self.assertEqual(record.clues, sum(1 for value in expected.puzzle.cells if value),
+                    "expected the clue count of puzzle {}".format(index))
+                self.assertTrue(record.solution.is_solved(), "expected a solved solution for puzzle {}".format(index))
+                solved = expected.copy()
+                solved.solve_sudoku()
+                self.assertEqual(record.solution.get_puzzle(), solved.get_puzzle(), 
+                    "expected the only solution of puzzle {}".format(index))
+            self.assertRaises(IndexError, bank.__getitem__, 8)
+
+    def test_sample(self):
+        with Sudoku_Bank.Puzzle_Bank(self.path) as bank:
+            self.assertEqual(bank.matching(sl=4), [0, 1, 2, 3], "expected the 4x4 puzzles to match")
+            records = bank.sample(3, sl=9, rng=random.Random(1))
+            self.assertEqual(len(records), 3, "expected 3 sampled puzzles")
+            self.assertEqual(set(record.sl for record in records), {9}, "expected only 9x9 puzzles sampled")
+            self.assertEqual(len(set(record.index for record in records)), 3, "expected different puzzles sampled")
+
+            hardest = max(bank[index].difficulty for index in range(len(bank)))
+            found = bank.matching(min_difficulty=hardest)
+            self.assertTrue(found and all(bank[index].difficulty == hardest for index in found),
+                "expected only the hardest puzzles to match")
+            self.assertEqual(len(bank.sample(20, sl=4)), 4, "expected every match when sampling more than match")
+
+    def test_difficulty_score(self):
+        easy = '9 6 0 0 0 8 3 7 0 0 2 0 4 0 3 9 0 1 0 3 4 0 1 0 0 0 6 6 0 0 0 0 0 7 0 0 0 5 9 0 0 0 6 1 0 ' +\
+               '0 0 7 0 0 0 0 0 5 1 0 0 0 2 0 4 3 0 5 0 3 9 0 4 0 6 0 0 9 2 1 0 0 0 5 7'
+        hard = '0 0 0 6 0 0 4 0 0 7 0 0 0 0 3 6 0 0 0 0 0 0 9 1 0 8 0 0 0 0 0 0 0 0 0 0 0 5 0 1 8 0 0 0 3 ' +\
+               '0 0 0 3 0 6 0 4 5 0 4 0 2 0 0 0 6 0 9 0 3 0 0 0 0 0 0 0 2 0 0 0 0 1 0 0'
+        easy_score, solution = Sudoku_Bank.difficulty_score(Sudoku.Sudoku(easy))
+        hard_score, _ = Sudoku_Bank.difficulty_score(Sudoku.Sudoku(hard))
+        self.assertTrue(solution.is_solved(), "expected a solution with the score")
+        self.assertTrue(0 < easy_score < hard_score,
+            "expected a puzzle singles solve to score above 0 and below a hard one, instead got {} and {}".format(
+                easy_score, hard_score))
+
+    def test_invalid(self):
+        with Sudoku_Bank.Bank_Writer(self.path, 4) as writer:
+            self.assertRaises(Sudoku_Errors.InvalidPuzzleException, writer.add, self.puzzles[4])
+        with open(self.path, "wb") as bank:
+            bank.write(b"not a puzzle bank")
+        self.assertRaises(Sudoku_Errors.InvalidPuzzleException, Sudoku_Bank.Puzzle_Bank, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Solving many Sudoku puzzles at once, spread across a pool of worker processes.
+"""
+import collections
+import concurrent.futures
+import itertools
+import os
+import Sudoku
+import Sudoku_Budget
+import Sudoku_Errors
+
+# The status of each puzzle in a batch
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"
+TIMEOUT = "timeout"
+INVALID = "invalid"
+
+# The result for one puzzle: index is its position in the input, status is one of
+# the statuses above, and solution is a list of lists of integers if it was solved
+Batch_Result = collections.namedtuple("Batch_Result", ["index", "status", "solution"])
+
+
+def solve_one(puzzle, strategy=Sudoku.DLX, timeout=None):
+    """Solves a single puzzle given as a string in the format Sudoku accepts,
+    giving up once the search has run for timeout seconds.
+
+    puzzle = A string representation of a sudoku puzzle
+    strategy = The search strategy passed to solve_sudoku
+    timeout = A number of seconds to give up after, or None
+
+    return: A tuple (status, solution) where solution is a list of lists of
+    integers if status is SOLVED, None otherwise"""
+    try:
+        sudoku = Sudoku.Sudoku(puzzle)
+    except (Sudoku_Errors.InvalidPuzzleException, ValueError):
+        return INVALID, None
+
+    budget = Sudoku_Budget.Budget(timeout) if timeout is not None else None
+    solved = sudoku.solve_sudoku(strategy=strategy, budget=budget)
+    if solved is Sudoku.BUDGET_EXCEEDED:
+        return TIMEOUT, None
+    if not solved:
+        return UNSOLVABLE, None
+    return SOLVED, [[int(value) for value in row] for row in sudoku.get_puzzle()]
+
+
+def _solve_chunk(chunk, strategy, timeout):
+    """Solves a list of (index, puzzle) pairs in a worker process.
+    return: A list of Batch_Results"""
+    return [Batch_Result(index, *solve_one(puzzle, strategy, timeout)) for index, puzzle in chunk]
+
+
+def _chunks(puzzles, chunksize):
+    """A generator of lists of up to chunksize (index, puzzle) pairs, read lazily from puzzles"""
+    numbered = enumerate(puzzles)
+    while True:
+        chunk = list(itertools.islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_pool(function, arguments, workers=None, ordered=True):
+    """A generator that calls function on each tuple of arguments across a pool 
+    of worker processes, yielding each return value. Arguments are read lazily,
+    with at most two calls per worker in flight, so memory use does not grow 
+    with the number of calls.
+
+    function = A module-level function, so it can be sent to the workers
+    arguments = An iterable of tuples of arguments to call function with
+    workers = An integer number of worker processes, or None for one per CPU
+    ordered = A boolean of whether to yield return values in the order of 
+        arguments, rather than as soon as each call finishes"""
+    workers = workers or os.cpu_count() or 1
+    arguments = iter(arguments)
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        def submit():
+            """Sends the next call to the pool, returning its future or None if none are left"""
+            args = next(arguments, None)
+            if args is None:
+                return None
+            return pool.submit(function, *args)
+
+        pending = collections.deque()
+        for _ in range(2*workers):
+            future = submit()
+            if future is None:
+                break
+            pending.append(future)
+
+        while pending:
+            # Wait for the oldest call if ordered, otherwise for any call
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+
+            # Keep the pool busy before handing results back
+            for future in done:
+                refill = submit()
+                if refill is not None:
+                    pending.append(refill)
+            for future in done:
+                yield future.result()
+
+
+def solve_batch(puzzles, workers=None, chunksize=64, ordered=True, strategy=Sudoku.DLX, timeout=None):
+    """A generator that solves an iterable of puzzle strings across a pool of
+    worker processes, yielding a Batch_Result for each puzzle. Puzzles are
+    read lazily and sent to workers in chunks, with at most two chunks per
+    worker in flight, so memory use does not grow with the number of puzzles.
+
+    puzzles = An iterable of strings in the format Sudoku accepts
+    workers = An integer number of worker processes, or None for one per CPU
+    chunksize = An integer number of puzzles sent to a worker at a time
+    ordered = A boolean of whether to yield results in input order, rather
+        than as soon as each chunk finishes
+    strategy = The search strategy passed to solve_sudoku
+    timeout = A number of seconds to give up on each puzzle after, or None"""
+    calls = ((chunk, strategy, timeout) for chunk in _chunks(puzzles, chunksize))
+    for results in run_pool(_solve_chunk, calls, workers, ordered):
+        for result in results:
+            yield result
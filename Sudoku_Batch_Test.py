@@ -0,0 +1,49 @@
+import Sudoku
+import Sudoku_Batch
+import unittest
+
+class Test_Solve_Batch(unittest.TestCase):
+
+    puzzles = ['4 0 3 2 0 3 0 1 3 2 0 0 0 4 0 3',
+               '0 0 3 0 1 2 0 0 0 4 2 3 0 1 0 0',
+               '1 1 0 0',
+               '9 6 0 0 0 8 3 7 0 0 2 0 4 0 3 9 0 1 0 3 4 0 1 0 0 0 6 6 0 0 0 0 0 7 0 0 ' +\
+               '0 5 9 0 0 0 6 1 0 0 0 7 0 0 0 0 0 5 1 0 0 0 2 0 4 3 0 5 0 3 9 0 4 0 6 0 0 9 2 1 0 0 0 5 7',
+               '0 '*16]
+
+    def check_result(self, result):
+        puzzle = self.puzzles[result.index]
+        expected = Sudoku.Sudoku(puzzle) if result.status != Sudoku_Batch.INVALID else None
+        if result.status == Sudoku_Batch.SOLVED:
+            self.assertTrue(expected.solve_sudoku(), "expected solved puzzle {} to be solvable".format(puzzle))
+            self.assertEqual(result.solution, [[int(v) for v in row] for row in expected.get_puzzle()],
+                "expected the solution of solve_sudoku for puzzle {}".format(puzzle))
+        elif result.status == Sudoku_Batch.UNSOLVABLE:
+            self.assertFalse(expected.is_solvable(), "expected unsolvable puzzle {} to not be solvable".format(puzzle))
+        self.assertEqual(result.status, [Sudoku_Batch.SOLVED, Sudoku_Batch.UNSOLVABLE, Sudoku_Batch.INVALID,
+            Sudoku_Batch.SOLVED, Sudoku_Batch.SOLVED][result.index], "unexpected status for puzzle {}".format(puzzle))
+
+    def test_ordered(self):
+        results = list(Sudoku_Batch.solve_batch(self.puzzles*3, workers=2, chunksize=2, strategy=Sudoku.ROW_MAJOR))
+        self.assertEqual([result.index for result in results], list(range(len(self.puzzles)*3)),
+            "expected results in input order")
+        for result in results:
+            self.check_result(result._replace(index=result.index % len(self.puzzles)))
+
+    def test_unordered(self):
+        results = list(Sudoku_Batch.solve_batch(iter(self.puzzles), workers=2, chunksize=1, ordered=False))
+        self.assertEqual(sorted(result.index for result in results), list(range(len(self.puzzles))),
+            "expected one result per puzzle")
+        for result in results:
+            self.check_result(result)
+
+    def test_timeout(self):
+        board = '0 0 0 6 0 0 4 0 0 7 0 0 0 0 3 6 0 0 0 0 0 0 9 1 0 8 0 0 0 0 0 0 0 0 0 0 ' +\
+                '0 5 0 1 8 0 0 0 3 0 0 0 3 0 6 0 4 5 0 4 0 2 0 0 0 6 0 9 0 3 0 0 0 0 0 0 0 2 0 0 0 0 1 0 0'
+        status, solution = Sudoku_Batch.solve_one(board, Sudoku.ROW_MAJOR, timeout=0.001)
+        self.assertEqual(status, Sudoku_Batch.TIMEOUT, "expected a timeout, instead got {}".format(status))
+        self.assertIsNone(solution, "expected no solution after a timeout")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
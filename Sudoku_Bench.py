@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the solvers, generator and renderer on a fixed corpus of puzzles
+and seeded generation runs, reporting the wall time, search nodes and peak
+memory of each as JSON, so that runs before and after a change can be compared.
+
+    python Sudoku_Bench.py --output after.json --baseline before.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import Sudoku
+import Sudoku_IO
+
+# Difficulty levels of the corpus. PATHOLOGICAL puzzles make a search visit
+# far more nodes than their size suggests, such as a puzzle with no solution
+# that propagation cannot rule out, or one with many solutions.
+EASY = "easy"
+HARD = "hard"
+PATHOLOGICAL = "pathological"
+LEVELS = (EASY, HARD, PATHOLOGICAL)
+
+# Strategies each puzzle is solved with. Row-major and MRV search are left out
+# of the hard 16x16 puzzle, which they take minutes on.
+ALL = Sudoku.STRATEGIES
+DLX_ONLY = (Sudoku.DLX,)
+
+# The fixed corpus, as (name, level, strategies, puzzle) with puzzles in the compact
+# format of Sudoku_IO. Changing a puzzle makes results incomparable with earlier runs.
+# Hard puzzles still need searching after propagation. Propagation solves every
+# 4x4 puzzle with one solution, so the hard 4x4 puzzle has two.
+CORPUS = [
+    ("4x4-easy", EASY, ALL, "4.32.3.132...4.3"),
+    ("4x4-hard", HARD, ALL, ".3.22.....2..2.4"),
+    ("4x4-empty", PATHOLOGICAL, ALL, "................"),
+    ("9x9-easy", EASY, ALL, "96...837..2.4.39.1.34.1...66.....7...59...61...7.....51...2.43.5.39.4.6..921...57"),
+    ("9x9-hard", HARD, ALL, "...6..4..7....36......91.8...........5.18...3...3.6.45.4.2...6.9.3.......2....1.."),
+    ("9x9-no-solution", PATHOLOGICAL, ALL, "...6..4..7....36......91.8...........5.18...3...3.6.45.4.2...6.9.3....7..2....1.."),
+    ("16x16-easy", EASY, ALL, "D56GA1489.2.7FBE.B.E.3.95.GD4..A.9C2EF7..4A16D5.184AGD65B7EFC3.2B7ED192..G35.84F9C.1DBE7.AF8.56.8...35.67EDB29.156G3.8A4.219E....18.6E5.FB7A.G3.AFB7C.93D56E8.14E.5..28.3....AF7G39C7.BF18425ED64AFB963GED571C2..218.7D..F...6G.6G39B4FA218CD7E57ED58C12G396F4AB"),
+    ("16x16-hard", HARD, DLX_ONLY, "..6.A1.8....7F.....E.3.95...4......2..7..4A1..5...4...65B7E..3..B.ED.......5..4F9C..DB...A..........3..67..B2.....G..8.4.21.E....1..6.5.FB...G..A..7C.93.5....1.E.5...8.3....A.7.......F..42..D64A.B....ED..1C2..2...7D......6..6.39..F...8...E.....8..2..9.F.AB"),
+    ("16x16-empty", PATHOLOGICAL, ALL, "."*256),
+]
+
+# The solver methods benchmarked on each puzzle of the corpus
+SOLVERS = ("solve_sudoku", "is_solvable", "is_one_sol")
+
+
+def measure(setup, run, repeat=3):
+    """Times run(setup()) repeat times, keeping the fastest, then runs it once
+    more under tracemalloc for its peak memory, which is left out of the timed
+    runs as tracing slows Python down. Only run is measured, not setup.
+
+    setup = A function returning the argument of run
+    run = A function of one argument
+    repeat = An integer number of timed runs, or 0 to only measure peak memory
+
+    return: A tuple (seconds, peak_bytes, value, argument), where value is what
+    the last timed run returned and argument is what it was passed"""
+    best, value, argument = None, None, None
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        value = run(argument)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+
+    traced = setup()
+    tracemalloc.start()
+    try:
+        run(traced)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, value, argument
+
+
+def _result(method, name, sl, level, strategy, seconds, peak, nodes, value):
+    """Returns one benchmark result as a dictionary for the JSON report"""
+    return {"method": method, "puzzle": name, "sl": sl, "level": level, "strategy": strategy,
+            "seconds": seconds, "nodes": nodes, "peak_bytes": peak, "result": value}
+
+
+def bench_solvers(corpus=CORPUS, strategies=Sudoku.STRATEGIES, repeat=3, sizes=None):
+    """A generator of the results of each solver method with each of the given
+    strategies the corpus lists for a puzzle, on each puzzle of the corpus 
+    with a side length in sizes, or any if None"""
+    for name, level, allowed, line in corpus:
+        puzzle = Sudoku.Sudoku(Sudoku_IO.parse_line(line))
+        if sizes is not None and puzzle.sl not in sizes:
+            continue
+        for method in SOLVERS:
+            for strategy in [strategy for strategy in strategies if strategy in allowed]:
+                seconds, peak, value, solved = measure(puzzle.copy,
+                    lambda sudoku: getattr(sudoku, method)(strategy=strategy), repeat)
+                yield _result(method, name, puzzle.sl, level, strategy, seconds, peak, solved.nodes, value)
+
+
+def bench_create(sizes=(4, 9), modes=Sudoku.MODES, seed=0, repeat=1):
+    """A generator of the results of Create_Sudoku.create for each side length
+    and generation mode, reseeding the random module before each run so that
+    every run makes the same puzzle"""
+    for sl in sizes:
+        for mode in modes:
+            def make(creator):
+                random.seed(seed)
+                puzzle = creator.create(mode=mode)
+                return sum(1 for value in puzzle.puzzle.cells if value)
+
+            seconds, peak, clues, _ = measure(lambda: Sudoku.Create_Sudoku(sl), make, repeat)
+            yield _result("create", "seed-{}".format(seed), sl, None, mode, seconds, peak, None, clues)
+
+
+def bench_render(corpus=CORPUS, repeat=3, sizes=None, loops=1000):
+    """A generator of the results of render on each puzzle of the corpus, 
+    rendering it loops times per run as one render is too quick to time, and
+    reporting the seconds and peak memory of a single render"""
+    for name, level, _, line in corpus:
+        puzzle = Sudoku.Sudoku(Sudoku_IO.parse_line(line))
+        if sizes is not None and puzzle.sl not in sizes:
+            continue
+        seconds, _, text, _ = measure(lambda: puzzle.puzzle,
+            lambda board: [Sudoku.render(board) for _ in range(loops)][-1], repeat)
+        _, peak, _, _ = measure(lambda: puzzle.puzzle, Sudoku.render, 0)
+        yield _result("render", name, puzzle.sl, level, None, seconds / loops, peak, None, len(text))
+
+
+def run(repeat=3, sizes=(4, 9, 16), create_sizes=(4, 9), seed=0, strategies=Sudoku.STRATEGIES):
+    """Runs every benchmark, each timed repeat times, which must be at least
+    1, returning the report as a dictionary with the environment it ran in and
+    a list of results"""
+    results = list(bench_solvers(CORPUS, strategies, repeat, sizes))
+    results.extend(bench_create(create_sizes, Sudoku.MODES, seed))
+    results.extend(bench_render(CORPUS, repeat, sizes))
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "seed": seed,
+            "results": results}
+
+
+def _key(result):
+    return (result["method"], result["puzzle"], result["sl"], result["strategy"])
+
+
+def compare(baseline, current, tolerance=0.10):
+    """Compares two reports, finding the benchmarks in both whose time grew by
+    more than the tolerance, or whose result or search nodes changed.
+
+    baseline = A report as returned by run, or loaded from its JSON
+    current = Another report
+    tolerance = A fraction of the baseline time
+
+    return: A list of dictionaries with the benchmark's key and the baseline
+    and current seconds, nodes and results"""
+    old = dict((_key(result), result) for result in baseline["results"])
+    changes = []
+    for result in current["results"]:
+        before = old.get(_key(result))
+        if before is None:
+            continue
+        slower = result["seconds"] > before["seconds"]*(1 + tolerance)
+        if slower or result["nodes"] != before["nodes"] or result["result"] != before["result"]:
+            changes.append({"benchmark": list(_key(result)),
+                            "seconds": [before["seconds"], result["seconds"]],
+                            "nodes": [before["nodes"], result["nodes"]],
+                            "result": [before["result"], result["result"]]})
+    return changes
+
+
+def main(argv=None):
+    """Runs the benchmarks from the command line, writing the JSON report to
+    standard output or a file, and any changes from a baseline report to
+    standard error. Returns 1 if there are any, 0 otherwise."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of each benchmark, keeping the fastest")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 9, 16], help="side lengths of the corpus to run")
+    parser.add_argument("--create-sizes", type=int, nargs="+", default=[4, 9], help="side lengths to generate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generation runs")
+    parser.add_argument("--output", help="file to write the JSON report to, instead of standard output")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="fraction slower than the baseline reported")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1, as each benchmark needs a timed run")
+
+    report = run(args.repeat, args.sizes, args.create_sizes, args.seed)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            changes = compare(json.load(baseline), report, args.tolerance)
+        for change in changes:
+            sys.stderr.write(json.dumps(change) + "\n")
+        return 1 if changes else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import json
+import Sudoku
+import Sudoku_Bench
+import Sudoku_IO
+import unittest
+
+class Test_Bench(unittest.TestCase):
+
+    def test_corpus(self):
+        for name, level, strategies, line in Sudoku_Bench.CORPUS:
+            puzzle = Sudoku.Sudoku(Sudoku_IO.parse_line(line))
+            self.assertTrue(name.startswith("{}x{}".format(puzzle.sl, puzzle.sl)), 
+                "expected {} to have side length {}".format(name, puzzle.sl))
+            self.assertIn(level, Sudoku_Bench.LEVELS, "expected a known level for {}".format(name))
+            self.assertIn(Sudoku.DLX, strategies, "expected every puzzle to be solved with DLX")
+            if level == Sudoku_Bench.HARD:
+                for strategy in strategies:
+                    solved = puzzle.copy()
+                    solved.solve_sudoku(strategy=strategy)
+                    self.assertTrue(solved.nodes > 0, "expected {} to need search with {}".format(name, strategy))
+
+    def test_measure(self):
+        seconds, peak, value, argument = Sudoku_Bench.measure(lambda: [3, 1, 2], sorted, 2)
+        self.assertEqual(value, [1, 2, 3], "expected the value of the run")
+        self.assertEqual(argument, [3, 1, 2], "expected the argument of the run")
+        self.assertTrue(seconds >= 0 and peak > 0, "expected a time and peak memory")
+
+    def test_repeat(self):
+        with self.assertRaises(SystemExit):
+            Sudoku_Bench.main(["--repeat", "0", "--sizes", "4", "--create-sizes", "4"])
+
+    def test_run_and_compare(self):
+        report = Sudoku_Bench.run(repeat=1, sizes=(4,), create_sizes=(4,))
+        report = json.loads(json.dumps(report))
+        methods = set(result["method"] for result in report["results"])
+        self.assertEqual(methods, set(Sudoku_Bench.SOLVERS) | {"create", "render"}, 
+            "expected every method benchmarked, instead got {}".format(methods))
+        for result in report["results"]:
+            if result["method"] in Sudoku_Bench.SOLVERS:
+                self.assertIsNotNone(result["nodes"], "expected search nodes for {}".format(result))
+            self.assertTrue(result["peak_bytes"] > 0, "expected a peak memory for {}".format(result))
+        self.assertEqual(Sudoku_Bench.compare(report, report), [], "expected no changes from the same report")
+
+        slower = json.loads(json.dumps(report))
+        slower["results"][0]["seconds"] = report["results"][0]["seconds"]*2 + 1
+        slower["results"][1]["nodes"] = 10**6
+        changes = Sudoku_Bench.compare(report, slower)
+        self.assertEqual(len(changes), 2, "expected a slower benchmark and a node change, instead got {}".format(changes))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Time and node budgets for the solvers and generator, which searches charge as
+they go and give up on once they run out, or once cancelled from another thread.
+"""
+import threading
+import time
+import Sudoku_Errors
+
+
+class _Exceeded():
+    """The type of EXCEEDED, which is false, so it can be told apart from True
+    and False only by identity"""
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return "BUDGET_EXCEEDED"
+
+    def __reduce__(self):
+        # Unpickle as the same object, so results sent between processes compare
+        return "EXCEEDED"
+
+
+# The result of a solver or generator call that ran out of its budget
+EXCEEDED = _Exceeded()
+
+
+class Budget():
+    """
+    RI: nodes is a non-negative integer. deadline is None or a time.monotonic
+    time, and max_nodes is None or a non-negative integer.
+
+    AF(deadline, max_nodes, nodes, parent): A limit on the work of one or more 
+    searches, exceeded once time.monotonic() passes deadline, once more than 
+    max_nodes nodes are charged to it, once it is cancelled, or once its
+    parent budget is exceeded.
+
+    Safety From Rep Exposure: The cancellation event is never returned.
+    """
+
+    def __init__(self, seconds=None, max_nodes=None, parent=None, interval=256):
+        """Makes a budget starting now.
+
+        seconds = A number of seconds the budget lasts, or None for no limit
+        max_nodes = An integer number of search nodes, or None for no limit
+        parent = Another Budget that is charged and checked along with this one, 
+            or None
+        interval = An integer number of nodes charged between checks of the
+            clock and cancellation, which cost more than counting"""
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+        self.max_nodes = max_nodes
+        self.parent = parent
+        self.nodes = 0
+        self.interval = interval
+        self._countdown = interval
+        self._cancelled = threading.Event()
+
+
+    def cancel(self):
+        """Makes every search using this budget give up at its next check.
+        Safe to call from any thread."""
+        self._cancelled.set()
+
+
+    def cancelled(self):
+        """Returns a boolean of whether cancel was called"""
+        return self._cancelled.is_set()
+
+
+    def exceeded(self):
+        """Returns a boolean of whether the budget has run out"""
+        if self._cancelled.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            return True
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            return True
+        return self.parent is not None and self.parent.exceeded()
+
+
+    def check(self):
+        """Raises BudgetExceededException if the budget has run out"""
+        if self.exceeded():
+            raise Sudoku_Errors.BudgetExceededException(self, "Search ran out of its budget or was cancelled")
+
+
+    def charge(self, nodes=1):
+        """Counts nodes search nodes against the budget, raising
+        BudgetExceededException if that runs it out. The clock and 
+        cancellation are only checked every interval nodes."""
+        self.nodes += nodes
+        if self.parent is not None:
+            self.parent.charge(nodes)
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.check()
+        self._countdown -= nodes
+        if self._countdown <= 0:
+            self._countdown = self.interval
+            self.check()
@@ -0,0 +1,101 @@
+import pickle
+import random
+import threading
+import time
+import Sudoku
+import Sudoku_Budget
+import unittest
+
+class Test_Budget(unittest.TestCase):
+
+    hard = '0 0 0 6 0 0 4 0 0 ' +\
+           '7 0 0 0 0 3 6 0 0 ' +\
+           '0 0 0 0 9 1 0 8 0 ' +\
+           '0 0 0 0 0 0 0 0 0 ' +\
+           '0 5 0 1 8 0 0 0 3 ' +\
+           '0 0 0 3 0 6 0 4 5 ' +\
+           '0 4 0 2 0 0 0 6 0 ' +\
+           '9 0 3 0 0 0 0 0 0 ' +\
+           '0 2 0 0 0 0 1 0 0'
+
+    def check_exceeded(self, puzzle, result, message):
+        self.assertIs(result, Sudoku.BUDGET_EXCEEDED, "expected the budget to run out {}".format(message))
+        self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(self.hard).get_puzzle(), 
+            "expected the puzzle unchanged after running out {}".format(message))
+
+    def test_node_budget(self):
+        for strategy in Sudoku.STRATEGIES:
+            for method in ["solve_sudoku", "is_solvable", "is_one_sol"]:
+                puzzle = Sudoku.Sudoku(self.hard)
+                result = getattr(puzzle, method)(strategy=strategy, budget=Sudoku_Budget.Budget(max_nodes=20))
+                self.check_exceeded(puzzle, result, "in {} with {}".format(method, strategy))
+            puzzle = Sudoku.Sudoku(self.hard)
+            result = puzzle.count_solutions(strategy=strategy, budget=Sudoku_Budget.Budget(max_nodes=20))
+            self.check_exceeded(puzzle, result, "in count_solutions with {}".format(strategy))
+
+            puzzle = Sudoku.Sudoku(self.hard)
+            self.assertIs(puzzle.solve_sudoku(strategy=strategy, budget=Sudoku_Budget.Budget(max_nodes=10**6)), True,
+                "expected the puzzle solved within a large budget with {}".format(strategy))
+
+    def test_deadline(self):
+        puzzle = Sudoku.Sudoku(self.hard)
+        start = time.time()
+        result = puzzle.is_one_sol(propagate=False, budget=Sudoku_Budget.Budget(0.05))
+        self.check_exceeded(puzzle, result, "with a deadline")
+        self.assertTrue(time.time() - start < 1, "expected the search to stop soon after its deadline")
+
+    def test_deadline_large_board(self):
+        # Propagating and building the exact cover matrix of an empty 81x81 board
+        # each take seconds, so both must check the deadline as they go
+        for strategy in Sudoku.STRATEGIES:
+            puzzle = Sudoku.Sudoku.from_values(bytes(81*81))
+            start = time.time()
+            result = puzzle.solve_sudoku(strategy=strategy, budget=Sudoku_Budget.Budget(0.05))
+            self.assertIs(result, Sudoku.BUDGET_EXCEEDED, "expected the budget to run out with {}".format(strategy))
+            self.assertTrue(time.time() - start < 0.5, "expected {} to stop soon after its deadline".format(strategy))
+            self.assertEqual(puzzle.puzzle.cells, bytes(81*81), "expected the board left empty with {}".format(strategy))
+
+    def test_cancel(self):
+        puzzle = Sudoku.Sudoku(self.hard)
+        budget = Sudoku_Budget.Budget()
+        timer = threading.Timer(0.05, budget.cancel)
+        timer.start()
+        start = time.time()
+        try:
+            result = puzzle.is_one_sol(propagate=False, budget=budget)
+        finally:
+            timer.cancel()
+        self.check_exceeded(puzzle, result, "after cancelling")
+        self.assertTrue(budget.cancelled() and time.time() - start < 1, "expected the search to stop soon after cancelling")
+
+    def test_parent(self):
+        parent = Sudoku_Budget.Budget(max_nodes=50)
+        puzzle = Sudoku.Sudoku(self.hard)
+        result = puzzle.is_solvable(strategy=Sudoku.MRV, budget=Sudoku_Budget.Budget(parent=parent))
+        self.check_exceeded(puzzle, result, "with an exceeded parent")
+        self.assertTrue(parent.nodes > 50, "expected the parent to be charged")
+
+    def test_incremental(self):
+        puzzle = Sudoku.Sudoku(self.hard)
+        puzzle.set_incremental()
+        result = puzzle.is_one_sol(budget=Sudoku_Budget.Budget(max_nodes=20))
+        self.check_exceeded(puzzle, result, "in incremental mode")
+        self.assertTrue(puzzle.is_one_sol(), "expected the cache not to keep an abandoned search")
+
+    def test_create(self):
+        random.seed(19)
+        for mode in Sudoku.MODES:
+            creator = Sudoku.Create_Sudoku(9)
+            result = creator.create(mode=mode, budget=Sudoku_Budget.Budget(max_nodes=0))
+            self.assertIs(result, Sudoku.BUDGET_EXCEEDED, "expected create to run out of nodes with {}".format(mode))
+        puzzle = Sudoku.Create_Sudoku(4).create(budget=Sudoku_Budget.Budget(10))
+        self.assertTrue(puzzle.is_one_sol(), "expected a puzzle within a large budget")
+
+    def test_result(self):
+        self.assertFalse(Sudoku.BUDGET_EXCEEDED, "expected the budget exceeded result to be false")
+        self.assertIs(pickle.loads(pickle.dumps(Sudoku.BUDGET_EXCEEDED)), Sudoku.BUDGET_EXCEEDED,
+            "expected the budget exceeded result to unpickle as itself")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A bounded least recently used cache of solved Sudoku puzzles, keyed by a
+canonical form so that puzzles equivalent up to relabelling the values,
+reordering the bands and stacks, and transposing share one cache entry.
+"""
+import collections
+import itertools
+import Sudoku
+
+# Totals for a Solve_Cache, with hit_rate the fraction of lookups that were hits
+Cache_Stats = collections.namedtuple("Cache_Stats", ["hits", "misses", "size", "maxsize", "hit_rate"])
+
+def layouts(sl, bs):
+    """Returns every rearrangement of a board with side length sl and block
+    size bs by reordering its bands (groups of bs rows sharing boxes), its
+    stacks (groups of bs columns sharing boxes), and transposing it. Each
+    keeps a solved board solved. There are 2*(bs!)**2 of them, so this is
+    only meant for small boards; canonical_form searches them without
+    building them.
+
+    return: A list of tuples of flat square indices, where a layout maps the
+    board cells to the board whose square k holds cells[layout[k]]"""
+    found = []
+    for transpose in (False, True):
+        for cols in _orders(bs):
+            lines = _lines(sl, cols, transpose)
+            for rows in _orders(bs):
+                found.append(tuple(ind for row in rows for ind in lines[row]))
+    return found
+
+
+def _orders(bs):
+    """A generator of the orders of the rows of a board with block size bs
+    that keep each band together and in order, one for each order of the bands"""
+    for bands in itertools.permutations(range(bs)):
+        yield [band*bs + i for band in bands for i in range(bs)]
+
+
+def _lines(sl, cols, transpose):
+    """Returns the flat square indices of each row of the board, or of each
+    column if transpose is True, taken in the order cols"""
+    if transpose:
+        return [[col*sl + line for col in cols] for line in range(sl)]
+    return [[line*sl + col for col in cols] for line in range(sl)]
+
+
+def canonical_form(puzzle):
+    """Finds the canonical form of a puzzle: the lexicographically smallest
+    of its layouts, each with its values relabelled 1, 2, ... in the order
+    they first appear. Equivalent puzzles have the same canonical form.
+
+    Only the transposes and orders of the stacks that can give the smallest
+    first row are searched. For each of them the bands are chosen one at a
+    time, relabelling a row at a time and dropping every order of the bands
+    whose rows so far are already larger than the best form found, so
+    layouts sharing their first bands share the work of relabelling them.
+
+    puzzle = A Sudoku object
+
+    return: A tuple (form, layout, labels), where form is bytes of the flat
+    square values of the canonical puzzle, layout is the layout it comes
+    from, and labels is a list mapping each value of puzzle to its value in
+    form, with labels[0] = 0"""
+    sl, bs = puzzle.sl, puzzle.bs
+    cells = puzzle.puzzle.cells
+
+    # The first row of the form is the first row of one of the bands, so only
+    # the stack orders where one of those relabels smallest can give the form
+    firsts = []
+    for transpose in (False, True):
+        for cols in _orders(bs):
+            lines = _lines(sl, cols, transpose)
+            firsts.append((min(_relabel(cells, lines[band*bs], sl) for band in range(bs)), transpose, cols))
+    least = min(first for first, _, _ in firsts)
+
+    # The best form found so far and the square indices of its rows
+    best = [None, None]
+    for first, transpose, cols in firsts:
+        if first == least:
+            _search_bands(cells, _lines(sl, cols, transpose), bs, [], bytearray(), [0]*(sl+1), 1, best)
+
+    layout = tuple(ind for line in best[1] for ind in line)
+    return bytes(best[0]), layout, _labels(cells, layout, sl)
+
+
+def _relabel(cells, line, sl):
+    """Returns bytes of the values of the squares of line, relabelled 1, 2, ...
+    in the order they first appear"""
+    labels = [0]*(sl+1)
+    next_label = 1
+    for ind in line:
+        value = cells[ind]
+        if value and not labels[value]:
+            labels[value] = next_label
+            next_label += 1
+    return bytes(labels[cells[ind]] for ind in line)
+
+
+def _search_bands(cells, lines, bs, order, form, labels, next_label, best):
+    """Extends a canonical form search by each band not in order, the list
+    of bands chosen so far, whose rows relabelled give form, recording any
+    complete form smaller than best[0] in best along with its rows"""
+    if len(order) == bs:
+        if best[0] is None or form < best[0]:
+            best[0], best[1] = form, [lines[band*bs + i] for band in order for i in range(bs)]
+        return
+
+    for band in range(bs):
+        if band in order:
+            continue
+        band_form = bytearray(form)
+        band_labels = list(labels)
+        band_next = next_label
+
+        # Relabel the rows of the band one at a time, giving up as soon as
+        # they are known to be larger than the best form so far
+        larger = False
+        for i in range(bs):
+            for ind in lines[band*bs + i]:
+                value = cells[ind]
+                if value and not band_labels[value]:
+                    band_labels[value] = band_next
+                    band_next += 1
+                band_form.append(band_labels[value])
+            if best[0] is not None and band_form > best[0][:len(band_form)]:
+                larger = True
+                break
+        if not larger:
+            _search_bands(cells, lines, bs, order + [band], band_form, band_labels, band_next, best)
+
+
+def _labels(cells, layout, sl):
+    """Returns the relabelling of canonical_form for cells in layout, with
+    values not in the puzzle given the labels left over in increasing order"""
+    labels = [0]*(sl+1)
+    next_label = 1
+    for ind in layout:
+        value = cells[ind]
+        if value and not labels[value]:
+            labels[value] = next_label
+            next_label += 1
+    for value in range(1, sl+1):
+        if not labels[value]:
+            labels[value] = next_label
+            next_label += 1
+    return labels
+
+
+def from_canonical(values, layout, labels):
+    """Maps the flat square values of a board in canonical form, such as the
+    solution of a canonical puzzle, back to the puzzle the form was found for.
+
+    values = A sequence of the canonical board's square values
+    layout, labels = As returned by canonical_form
+
+    return: A bytearray of the flat square values of the original board"""
+    values_of = [0]*len(labels)
+    for value in range(len(labels)):
+        values_of[labels[value]] = value
+
+    cells = bytearray(len(values))
+    for k in range(len(layout)):
+        cells[layout[k]] = values_of[values[k]]
+    return cells
+
+
+
+class Solve_Cache():
+    """
+    RI: _entries holds at most maxsize entries, ordered from least to most
+    recently used. hits and misses are non-negative integers.
+
+    AF(_entries, hits, misses): A cache mapping the canonical form of each
+    puzzle solved through it to bytes of the solution of that form, or None
+    if it has no solution, having answered hits lookups from the cache and
+    solved misses puzzles.
+
+    Safety From Rep Exposure: Solutions are written into the caller's puzzle
+    rather than returned, and the cached bytes are immutable.
+    """
+
+    def __init__(self, maxsize=1024, strategy=Sudoku.DLX):
+        """Makes an empty cache holding up to maxsize solutions, solving puzzles
+        not in it with solve_sudoku using the given strategy"""
+        self.maxsize = maxsize
+        self.strategy = strategy
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def solve(self, puzzle):
+        """Solves a Sudoku object like solve_sudoku, filling its empty squares
+        with the solution if it has one and leaving it unchanged otherwise,
+        looking up its canonical form in the cache before solving.
+
+        puzzle = A Sudoku object
+
+        return: A boolean of whether the puzzle was solved or not"""
+        form, layout, labels = canonical_form(puzzle)
+        if form in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(form)
+            solution = self._entries[form]
+        else:
+            self.misses += 1
+            canonical = Sudoku.Sudoku.from_values(form, validate=False)
+            solution = bytes(canonical.puzzle.cells) if canonical.solve_sudoku(strategy=self.strategy) else None
+
+            # Store the new solution, evicting the least recently used ones
+            self._entries[form] = solution
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        if solution is None:
+            return False
+        puzzle.fill(from_canonical(solution, layout, labels))
+        return True
+
+
+    def stats(self):
+        """Returns a Cache_Stats of the lookups made so far"""
+        lookups = self.hits + self.misses
+        return Cache_Stats(self.hits, self.misses, len(self._entries), self.maxsize,
+                           self.hits / lookups if lookups else 0.0)
+
+
+    def clear(self):
+        """Empties the cache and resets its statistics"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
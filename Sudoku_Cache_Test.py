@@ -0,0 +1,127 @@
+import random
+import Sudoku
+import Sudoku_Cache
+import unittest
+
+def transform(puzzle):
+    """Returns an equivalent puzzle in a random layout with its values randomly relabelled"""
+    layout = random.choice(Sudoku_Cache.layouts(puzzle.sl, puzzle.bs))
+    values = list(range(1, puzzle.sl+1))
+    random.shuffle(values)
+    values = [0] + values
+    return Sudoku.Sudoku.from_values([values[puzzle.puzzle.cells[ind]] for ind in layout])
+
+class Test_Canonical_Form(unittest.TestCase):
+
+    board = '9 6 0 0 0 8 3 7 0 ' +\
+            '0 2 0 4 0 3 9 0 1 ' +\
+            '0 3 4 0 1 0 0 0 6 ' +\
+            '6 0 0 0 0 0 7 0 0 ' +\
+            '0 5 9 0 0 0 6 1 0 ' +\
+            '0 0 7 0 0 0 0 0 5 ' +\
+            '1 0 0 0 2 0 4 3 0 ' +\
+            '5 0 3 9 0 4 0 6 0 ' +\
+            '0 9 2 1 0 0 0 5 7'
+
+    def test_layouts(self):
+        for sl, bs, count in [(4, 2, 8), (9, 3, 72)]:
+            found = Sudoku_Cache.layouts(sl, bs)
+            self.assertEqual(len(set(found)), count, "expected {} layouts for {}x{}, instead got {}".format(count, sl, sl, len(set(found))))
+        grid = Sudoku.Create_Sudoku(9).solution_grid()
+        for layout in Sudoku_Cache.layouts(9, 3):
+            self.assertTrue(Sudoku.Sudoku.from_values([grid.puzzle.cells[ind] for ind in layout]).is_solved(),
+                "expected every layout of a solved grid to be solved")
+
+    def test_equivalent_puzzles(self):
+        random.seed(15)
+        puzzle = Sudoku.Sudoku(self.board)
+        form, layout, labels = Sudoku_Cache.canonical_form(puzzle)
+        for _ in range(20):
+            other = transform(puzzle)
+            self.assertEqual(Sudoku_Cache.canonical_form(other)[0], form, 
+                "expected equivalent puzzles to have the same canonical form")
+
+    def test_smallest_layout(self):
+        random.seed(16)
+        for sl in [4, 9]:
+            for _ in range(10):
+                puzzle = Sudoku.Create_Sudoku(sl).create()
+                forms = []
+                for layout in Sudoku_Cache.layouts(sl, puzzle.bs):
+                    labels = {0: 0}
+                    for ind in layout:
+                        labels.setdefault(puzzle.puzzle.cells[ind], len(labels))
+                    forms.append(bytes(labels[puzzle.puzzle.cells[ind]] for ind in layout))
+                self.assertEqual(Sudoku_Cache.canonical_form(puzzle)[0], min(forms),
+                    "expected the smallest relabelled layout of \n{}\n".format(Sudoku.render(puzzle.puzzle)))
+
+    def test_equivalent_16x16(self):
+        random.seed(17)
+        puzzle = Sudoku.Create_Sudoku(16).create(clues=150)
+        form, layout, labels = Sudoku_Cache.canonical_form(puzzle)
+        self.assertEqual(Sudoku_Cache.from_canonical(form, layout, labels), puzzle.puzzle.cells,
+            "expected the canonical form to map back to the puzzle")
+        for _ in range(3):
+            self.assertEqual(Sudoku_Cache.canonical_form(transform(puzzle))[0], form,
+                "expected equivalent puzzles to have the same canonical form")
+
+    def test_round_trip(self):
+        puzzle = Sudoku.Sudoku(self.board)
+        form, layout, labels = Sudoku_Cache.canonical_form(puzzle)
+        self.assertEqual(sorted(labels), list(range(10)), "expected labels to be a relabelling of every value")
+        self.assertEqual(Sudoku_Cache.from_canonical(form, layout, labels), puzzle.puzzle.cells,
+            "expected the canonical form to map back to the puzzle")
+
+class Test_Solve_Cache(unittest.TestCase):
+
+    def test_hits_and_solutions(self):
+        random.seed(150)
+        cache = Sudoku_Cache.Solve_Cache()
+        puzzle = Sudoku.Sudoku(Test_Canonical_Form.board)
+        for _ in range(5):
+            other = transform(puzzle)
+            board = other.copy()
+            self.assertTrue(cache.solve(other), "expected puzzle to be solved")
+            self.assertTrue(other.is_solved(), "expected the mapped back solution to be solved")
+            for ind in range(81):
+                if board.puzzle.cells[ind]:
+                    self.assertEqual(other.puzzle.cells[ind], board.puzzle.cells[ind], "expected the clues to be kept")
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (4, 1, 1), 
+            "expected 4 hits, 1 miss and 1 entry, instead got {}".format(stats))
+
+    def test_undo(self):
+        cache = Sudoku_Cache.Solve_Cache()
+        solved = Sudoku.Sudoku(Test_Canonical_Form.board)
+        solved.solve_sudoku(strategy=Sudoku.DLX)
+        for _ in range(2):
+            puzzle = Sudoku.Sudoku(Test_Canonical_Form.board)
+            self.assertTrue(cache.solve(puzzle), "expected puzzle to be solved")
+            self.assertEqual(puzzle.changes(), solved.changes(), "expected the same edit as solve_sudoku")
+            self.assertTrue(puzzle.undo(), "expected the solve to be undone")
+            self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(Test_Canonical_Form.board).get_puzzle(),
+                "expected one undo to revert the whole solve")
+        self.assertEqual(cache.stats().hits, 1, "expected the second solve to hit")
+
+    def test_unsolvable(self):
+        cache = Sudoku_Cache.Solve_Cache()
+        board = '0 0 3 0 1 2 0 0 0 4 2 3 0 1 0 0'
+        for _ in range(2):
+            puzzle = Sudoku.Sudoku(board)
+            self.assertFalse(cache.solve(puzzle), "expected an unsolvable puzzle not to be solved")
+            self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(board).get_puzzle(), "expected an unsolved puzzle to be unchanged")
+        self.assertEqual(cache.stats().hits, 1, "expected the second lookup to hit")
+
+    def test_eviction(self):
+        cache = Sudoku_Cache.Solve_Cache(maxsize=2)
+        boards = ['1 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0', '1 2 0 0 0 0 0 0 0 0 0 0 0 0 0 0', '1 2 3 0 0 0 0 0 0 0 0 0 0 0 0 0']
+        for board in boards:
+            cache.solve(Sudoku.Sudoku(board))
+        self.assertEqual(cache.stats().size, 2, "expected the cache to stay at its maximum size")
+        cache.solve(Sudoku.Sudoku(boards[0]))
+        self.assertEqual(cache.stats().misses, 4, "expected the least recently used puzzle to be evicted")
+        cache.solve(Sudoku.Sudoku(boards[2]))
+        self.assertEqual(cache.stats().hits, 1, "expected a recently used puzzle to stay cached")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
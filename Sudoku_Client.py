@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A client for Sudoku_Server, and a load test sending many requests to one over
+a number of concurrent keep-alive connections, reporting the throughput,
+latency percentiles and status codes seen.
+
+    python Sudoku_Client.py --port 8080 --endpoint solve --requests 500 --concurrency 16
+"""
+import argparse
+import asyncio
+import collections
+import json
+import sys
+import time
+import Sudoku_Bench
+
+# Totals of a load test, with latencies in seconds
+Load_Report = collections.namedtuple("Load_Report",
+    ["requests", "seconds", "rate", "statuses", "p50", "p90", "p99", "max"])
+
+
+class Client():
+    """
+    RI: reader and writer are None, or the streams of one open connection to
+    host and port.
+
+    AF(host, port): A keep-alive connection to the server at host and port,
+    opened when the first request is sent.
+
+    Safety From Rep Exposure: Responses are decoded into new objects.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+
+    async def request(self, method, path, payload=None):
+        """Sends one request, opening a new connection if there is none.
+
+        method = A string HTTP method, such as "POST"
+        path = A string endpoint path, such as "/solve"
+        payload = An object to send as the JSON body, or None to send no body
+
+        return: A tuple (status, response) of the integer HTTP status code and
+        the decoded JSON response"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = "{} {} HTTP/1.1\r\nHost: {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n"
+        self.writer.write(head.format(method, path, self.host, len(body)).encode("latin-1") + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        response = json.loads(await self.reader.readexactly(int(headers.get("content-length", 0))))
+
+        # The server closes the connection after errors it cannot recover from
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response
+
+
+    async def close(self):
+        """Closes the connection, if one is open"""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader, self.writer = None, None
+
+
+
+def _percentile(latencies, fraction):
+    """Returns the value at fraction of a sorted list, or None if it is empty"""
+    if not latencies:
+        return None
+    return latencies[min(len(latencies) - 1, int(fraction*len(latencies)))]
+
+
+async def load_test(payloads, host="127.0.0.1", port=8080, endpoint="/solve", requests=100, concurrency=8):
+    """Sends requests POSTs to an endpoint, cycling through payloads, from
+    concurrency connections each sending its next request once the last is
+    answered.
+
+    payloads = A non-empty list of objects sent as the JSON bodies
+    requests = An integer total number of requests
+    concurrency = An integer number of connections
+
+    return: A Load_Report"""
+    latencies = []
+    statuses = collections.Counter()
+    sent = iter(range(requests))
+
+    async def worker():
+        client = Client(host, port)
+        try:
+            for number in sent:
+                start = time.perf_counter()
+                status, _ = await client.request("POST", endpoint, payloads[number % len(payloads)])
+                latencies.append(time.perf_counter() - start)
+                statuses[status] += 1
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return Load_Report(requests, seconds, requests / seconds if seconds else 0.0, dict(statuses),
+                       _percentile(latencies, 0.50), _percentile(latencies, 0.90),
+                       _percentile(latencies, 0.99), latencies[-1] if latencies else None)
+
+
+def corpus_payloads(endpoint="/solve", sizes=(4, 9), timeout=5.0):
+    """Returns request bodies for an endpoint made from the puzzles of the
+    benchmark corpus with a side length in sizes, or for /generate, one body
+    per side length with increasing seeds"""
+    if endpoint == "/generate":
+        return [{"sl": sl, "seed": seed, "timeout": timeout} for seed in range(16) for sl in sizes]
+    return [{"puzzle": line, "timeout": timeout} for _, _, _, line in Sudoku_Bench.CORPUS
+            if int(len(line)**0.5) in sizes]
+
+
+def main(argv=None):
+    """Runs a load test from the command line, writing its report as JSON"""
+    parser = argparse.ArgumentParser(description="Load test a running Sudoku_Server")
+    parser.add_argument("--host", default="127.0.0.1", help="address of the server")
+    parser.add_argument("--port", type=int, default=8080, help="port of the server")
+    parser.add_argument("--endpoint", choices=["solve", "unique", "generate"], default="solve",
+                        help="endpoint to send the requests to")
+    parser.add_argument("--requests", type=int, default=200, help="total number of requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="number of connections sending at once")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 9], help="side lengths of the puzzles sent")
+    parser.add_argument("--timeout", type=float, default=5.0, help="search timeout sent with each request")
+    args = parser.parse_args(argv)
+
+    endpoint = "/" + args.endpoint
+    payloads = corpus_payloads(endpoint, args.sizes, args.timeout)
+    report = asyncio.run(load_test(payloads, args.host, args.port, endpoint, args.requests, args.concurrency))
+    json.dump(report._asdict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
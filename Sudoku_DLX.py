@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dancing Links (Knuth's Algorithm X) exact cover solver, and the construction
+of the exact cover matrix for a Sudoku puzzle of any side length.
+"""
+
+
+class DLX():
+    """
+    RI: Nodes are indices into the parallel lists L, R, U, D and C. Node 0 is the
+    root, nodes 1..num_columns are the column headers, and every other node is a
+    1 in the matrix. L/R link each row (and the header list) in a circle, U/D
+    link each column in a circle, C[node] is the header of node's column, and
+    S[col] is the number of uncovered nodes in column col.
+
+    AF(L, R, U, D, C, S, row_ids): A sparse 0/1 matrix where row_ids[node] is the
+    identifier of the matrix row containing node, searched for sets of rows that
+    cover every column exactly once.
+
+    Safety From Rep Exposure: Searches yield new lists of row identifiers, and no
+    references to the linked lists are returned.
+    """
+
+    def __init__(self, num_columns):
+        """Creates an empty exact cover matrix with num_columns columns"""
+        n = num_columns + 1
+        self.L = [i-1 for i in range(n)]
+        self.R = [i+1 for i in range(n)]
+        self.L[0] = num_columns
+        self.R[num_columns] = 0
+        self.U = list(range(n))
+        self.D = list(range(n))
+        self.C = list(range(n))
+        self.S = [0]*n
+        self.row_ids = [None]*n
+
+        # Number of rows tried by the last search, a Sudoku_Stats.Search_Stats
+        # that rows tried and backtracks are also counted in, or None, and a
+        # Sudoku_Budget.Budget that rows tried are charged to, or None
+        self.nodes = 0
+        self.stats = None
+        self.budget = None
+
+
+    def add_row(self, row_id, columns):
+        """Adds a row to the matrix with a 1 in each of the given columns.
+
+        row_id = Any identifier, returned in solutions containing this row
+        columns = A list of integer column indices, 0 <= col < num_columns"""
+        first = None
+        for col in columns:
+            header = col + 1
+            node = len(self.C)
+
+            # Link the node at the bottom of its column
+            self.U.append(self.U[header])
+            self.D.append(header)
+            self.D[self.U[header]] = node
+            self.U[header] = node
+            self.C.append(header)
+            self.S[header] += 1
+            self.row_ids.append(row_id)
+
+            # Link the node at the end of its row
+            if first is None:
+                first = node
+                self.L.append(node)
+                self.R.append(node)
+            else:
+                self.L.append(self.L[first])
+                self.R.append(first)
+                self.R[self.L[first]] = node
+                self.L[first] = node
+
+
+    def _cover(self, col):
+        """Removes column header col from the header list, and every row with a
+        1 in col from the other columns"""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[col]] = R[col]
+        L[R[col]] = L[col]
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+
+    def _uncover(self, col):
+        """Exactly undoes _cover(col)"""
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[col]] = col
+        L[R[col]] = col
+
+
+    def _choose_column(self):
+        """Returns the uncovered column with the fewest 1s"""
+        R, S = self.R, self.S
+        best = R[0]
+        col = R[best]
+        while col != 0 and S[best] > 1:
+            if S[col] < S[best]:
+                best = col
+            col = R[col]
+        return best
+
+
+    def solutions(self):
+        """A generator yielding each exact cover of the matrix, as a list of
+        row identifiers. The search uses an explicit stack rather than
+        recursion, so its depth is not bounded by the recursion limit, and
+        the matrix is restored when the generator finishes or is closed."""
+        R, D, C, S = self.R, self.D, self.C, self.S
+        self.nodes = 0
+
+        # Stack of the row node chosen at each level of the search
+        chosen = []
+        try:
+            while True:
+                # If every column is covered, the chosen rows are a solution
+                if R[0] == 0:
+                    yield [self.row_ids[node] for node in chosen]
+                else:
+                    # Otherwise cover the most constrained column, and try its first row
+                    col = self._choose_column()
+                    if S[col] > 0:
+                        self._cover(col)
+                        self._choose_row(D[col], chosen)
+                        continue
+
+                # Backtrack to the deepest level with another row to try
+                while chosen:
+                    node = self._unchoose_row(chosen)
+                    col = C[node]
+                    if D[node] != col:
+                        self._choose_row(D[node], chosen)
+                        break
+                    self._uncover(col)
+                    if self.stats is not None:
+                        self.stats.backtracked(len(chosen), self.row_ids[node])
+                else:
+                    return
+        finally:
+            # Undo any levels left if the generator is closed early
+            while chosen:
+                self._uncover(C[self._unchoose_row(chosen)])
+
+
+    def _choose_row(self, node, chosen):
+        """Pushes the row containing node onto chosen, and covers every other
+        column that row has a 1 in"""
+        self.nodes += 1
+        if self.stats is not None:
+            self.stats.placed(len(chosen), self.row_ids[node])
+        chosen.append(node)
+        j = self.R[node]
+        while j != node:
+            self._cover(self.C[j])
+            j = self.R[j]
+
+        # Charge the budget once the row is fully chosen, so giving up here
+        # still leaves the matrix restored
+        if self.budget is not None:
+            self.budget.charge()
+
+
+    def _unchoose_row(self, chosen):
+        """Pops the last row node from chosen and undoes _choose_row on it.
+        return: The popped node"""
+        node = chosen.pop()
+        j = self.L[node]
+        while j != node:
+            self._uncover(self.C[j])
+            j = self.L[j]
+        return node
+
+
+    def first(self):
+        """Returns the first exact cover found as a list of row identifiers, or
+        None if there is none"""
+        for solution in self.solutions():
+            return solution
+        return None
+
+
+    def count(self, limit=None):
+        """Counts the exact covers of the matrix, stopping once limit are found.
+
+        limit = An integer, or None to count every solution
+
+        return: An integer of the number of solutions found, at most limit"""
+        found = 0
+        for _ in self.solutions():
+            found += 1
+            if limit is not None and found >= limit:
+                break
+        return found
+
+
+
+def sudoku_matrix(puzzle, budget=None):
+    """Builds the exact cover matrix for the empty squares of a Sudoku object.
+    Columns are the constraints not already met by the filled squares: each
+    square holds one value, and each row, column and box holds each value once.
+    Matrix rows are the candidate values of each empty square.
+
+    puzzle = A Sudoku object
+    budget = A Sudoku_Budget.Budget checked for each row of the board as its
+        matrix rows are added, raising BudgetExceededException once it runs
+        out, or None for no limit
+
+    return: A DLX matrix whose row identifiers are (row, col, value) tuples"""
+    sl, bs = puzzle.sl, puzzle.bs
+    n = sl*sl
+    matrix = DLX(4*n)
+
+    # Columns for filled squares and used values are never added to a row, so
+    # they are left out of the search by covering them up front
+    for row in range(sl):
+        for col in range(sl):
+            value = puzzle.puzzle.cells[row*sl + col]
+            if value != 0:
+                box = bs*(row//bs) + col//bs
+                for constraint in (row*sl + col, n + row*sl + value-1,
+                                   2*n + col*sl + value-1, 3*n + box*sl + value-1):
+                    matrix._cover(constraint + 1)
+
+    # Add a matrix row for each candidate value of each empty square
+    for row in range(sl):
+        if budget is not None:
+            budget.check()
+        for col in range(sl):
+            box = bs*(row//bs) + col//bs
+            for value in puzzle.candidates(row, col):
+                matrix.add_row((row, col, value), [row*sl + col, n + row*sl + value-1,
+                                                   2*n + col*sl + value-1, 3*n + box*sl + value-1])
+    return matrix
@@ -0,0 +1,62 @@
+import Sudoku
+import Sudoku_DLX
+import unittest
+
+class Test_DLX(unittest.TestCase):
+
+    def knuth_matrix(self):
+        # The example matrix from Knuth's Dancing Links paper, with one exact cover: rows A, D, E
+        matrix = Sudoku_DLX.DLX(7)
+        matrix.add_row('A', [2, 4, 5])
+        matrix.add_row('B', [0, 3, 6])
+        matrix.add_row('C', [1, 2, 5])
+        matrix.add_row('D', [0, 3])
+        matrix.add_row('E', [1, 6])
+        matrix.add_row('F', [3, 4, 6])
+        return matrix
+
+    def test_first(self):
+        result = self.knuth_matrix().first()
+        self.assertEqual(sorted(result), ['A', 'D', 'E'], "expected exact cover A, D, E, instead got {}".format(result))
+
+    def test_no_cover(self):
+        matrix = Sudoku_DLX.DLX(3)
+        matrix.add_row('A', [0, 1])
+        matrix.add_row('B', [1, 2])
+        self.assertIsNone(matrix.first(), "expected no exact cover")
+        self.assertEqual(matrix.count(), 0, "expected a count of 0 exact covers")
+
+    def test_count_and_restore(self):
+        matrix = Sudoku_DLX.DLX(2)
+        matrix.add_row('A', [0])
+        matrix.add_row('B', [1])
+        matrix.add_row('C', [0, 1])
+        matrix.add_row('D', [0])
+        self.assertEqual(matrix.count(), 3, "expected 3 exact covers")
+        self.assertEqual(matrix.count(2), 2, "expected count to stop at its limit")
+        # Closing the search early must leave the matrix as it was
+        self.assertEqual(len(list(matrix.solutions())), 3, "expected matrix restored after an early stop")
+
+
+class Test_Sudoku_Matrix(unittest.TestCase):
+
+    def test_solutions_are_valid(self):
+        board = '1 2 0 0 3 4 0 0 0 0 0 0 0 0 0 0'
+        puzzle = Sudoku.Sudoku(board)
+        solutions = list(Sudoku_DLX.sudoku_matrix(puzzle).solutions())
+        self.assertEqual(len(solutions), 12, "expected 12 solutions, instead got {}".format(len(solutions)))
+        for solution in solutions:
+            copy = Sudoku.Sudoku(board)
+            for row, col, value in solution:
+                self.assertTrue(copy.insert(row, col, value), "expected each solution value to be valid")
+            self.assertTrue(copy.is_solved(), "expected a solved puzzle from each solution")
+
+    def test_large_empty(self):
+        for sl in [16, 25]:
+            puzzle = Sudoku.Sudoku("0 "*(sl**2))
+            self.assertTrue(puzzle.solve_sudoku(strategy=Sudoku.DLX), "expected empty {0}x{0} puzzle solved".format(sl))
+            self.assertTrue(puzzle.is_solved(), "expected a valid {0}x{0} solution".format(sl))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
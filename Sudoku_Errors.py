@@ -20,6 +20,35 @@ class InvalidPuzzleException(SudokuException):
         self.message = message
 
 
+class InvalidStrategyException(SudokuException):
+    """
+    Exception raised for a request to search with an unknown strategy
+
+    Attributes:
+        expression -- input expression for which the error occurred
+        message -- explanation of the error
+    """
+
+    def __init__(self, expression, message):
+        self.expression = expression
+        self.message = message
+
+
+class BudgetExceededException(SudokuException):
+    """
+    Exception raised inside a search that runs out of its time or node budget,
+    or is cancelled
+
+    Attributes:
+        expression -- the budget that ran out
+        message -- explanation of the error
+    """
+
+    def __init__(self, expression, message):
+        self.expression = expression
+        self.message = message
+
+
 """
 A Success!!!!!
 -------------------
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generating banks of Sudoku puzzles with Create_Sudoku across a pool of worker
+processes, streaming each puzzle to a file or callback as it is made.
+"""
+import collections
+import random
+import time
+import Sudoku
+import Sudoku_Batch
+import Sudoku_Budget
+
+# The status of each generated puzzle
+GENERATED = "generated"
+TIMEOUT = Sudoku_Batch.TIMEOUT
+
+# The result for one puzzle: index is its position in the bank, seed is the seed
+# of the attempt that made it, status is one of the statuses above, and puzzle is
+# a string in the format Sudoku accepts if it was generated
+Generated_Puzzle = collections.namedtuple("Generated_Puzzle", ["index", "seed", "status", "puzzle"])
+
+# Totals for a finished run of generate_bank, with rate in puzzles per second
+Farm_Stats = collections.namedtuple("Farm_Stats", ["generated", "timeouts", "seconds", "rate"])
+
+
+def puzzle_seed(seed, index, attempt):
+    """Returns the seed for one attempt at one puzzle of a bank, so that each
+    puzzle can be reproduced on its own, whichever worker made it"""
+    return "{}-{}-{}".format(seed, index, attempt)
+
+
+def generate_one(sl, index, seed=0, timeout=None, attempts=3, clues=None):
+    """Generates the puzzle at index of a bank, reseeding the random module for
+    each attempt. An attempt that runs out of time is abandoned for a fresh one.
+
+    sl = An integer side length
+    index = An integer position in the bank
+    seed = The seed of the whole bank
+    timeout = A number of seconds to give up on each attempt after, or None
+    attempts = An integer number of attempts before reporting a timeout
+    clues = The number of clues passed to Create_Sudoku.create
+
+    return: A Generated_Puzzle"""
+    creator = Sudoku.Create_Sudoku(sl)
+    for attempt in range(attempts):
+        attempt_seed = puzzle_seed(seed, index, attempt)
+        random.seed(attempt_seed)
+        budget = Sudoku_Budget.Budget(timeout) if timeout is not None else None
+        puzzle = creator.create(clues=clues, budget=budget)
+        if puzzle is Sudoku.BUDGET_EXCEEDED:
+            continue
+        values = " ".join(value for row in puzzle.get_puzzle() for value in row)
+        return Generated_Puzzle(index, attempt_seed, GENERATED, values)
+    return Generated_Puzzle(index, attempt_seed, TIMEOUT, None)
+
+
+def generate(count, sl, workers=None, seed=0, timeout=None, attempts=3, clues=None, ordered=False):
+    """A generator that makes count puzzles of side length sl across a pool of
+    worker processes, yielding a Generated_Puzzle for each. See generate_one
+    for the other arguments.
+
+    workers = An integer number of worker processes, or None for one per CPU
+    ordered = A boolean of whether to yield puzzles in index order, rather
+        than as soon as each one is made"""
+    calls = ((sl, index, seed, timeout, attempts, clues) for index in range(count))
+    return Sudoku_Batch.run_pool(generate_one, calls, workers, ordered)
+
+
+def generate_bank(count, sl, sink, workers=None, seed=0, timeout=None, attempts=3, clues=None, ordered=False):
+    """Makes count puzzles of side length sl across a pool of worker processes,
+    sending each to sink as it is made. See generate for the other arguments.
+
+    sink = A file object, which is written one generated puzzle per line, or
+        a function, which is called with each Generated_Puzzle including timeouts
+
+    return: A Farm_Stats of the run"""
+    start = time.time()
+    generated, timeouts = 0, 0
+    for result in generate(count, sl, workers, seed, timeout, attempts, clues, ordered):
+        if result.status == GENERATED:
+            generated += 1
+        else:
+            timeouts += 1
+
+        if callable(sink):
+            sink(result)
+        elif result.status == GENERATED:
+            sink.write(result.puzzle + "\n")
+
+    seconds = time.time() - start
+    return Farm_Stats(generated, timeouts, seconds, generated / seconds if seconds else 0.0)
@@ -0,0 +1,33 @@
+import io
+import Sudoku
+import Sudoku_Farm
+import unittest
+
+class Test_Generate_Bank(unittest.TestCase):
+
+    def test_file_sink(self):
+        sink = io.StringIO()
+        stats = Sudoku_Farm.generate_bank(6, 4, sink, workers=2, seed=7)
+        lines = sink.getvalue().splitlines()
+        self.assertEqual(stats.generated, 6, "expected 6 puzzles generated, instead got {}".format(stats.generated))
+        self.assertEqual(len(lines), 6, "expected one line per puzzle in the sink")
+        for line in lines:
+            self.assertTrue(Sudoku.Sudoku(line).is_one_sol(), "expected each puzzle to have one solution: {}".format(line))
+
+    def test_reproducible(self):
+        first = sorted(Sudoku_Farm.generate(4, 9, workers=2, seed=3, clues=40))
+        second = sorted(Sudoku_Farm.generate(4, 9, workers=3, seed=3, clues=40))
+        self.assertEqual(first, second, "expected the same seed to give the same bank with any number of workers")
+        self.assertEqual(first, [Sudoku_Farm.generate_one(9, index, seed=3, clues=40) for index in range(4)],
+            "expected each puzzle to be reproducible on its own")
+
+    def test_callback_sink_and_timeout(self):
+        results = []
+        stats = Sudoku_Farm.generate_bank(2, 16, results.append, workers=2, timeout=0.001, attempts=1)
+        self.assertEqual(stats.timeouts, 2, "expected every 16x16 attempt to time out")
+        self.assertEqual([result.status for result in results], [Sudoku_Farm.TIMEOUT]*2,
+            "expected the callback to receive the timeouts")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
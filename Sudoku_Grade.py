@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Difficulty grading of Sudoku puzzles by the hardest constraint propagation
+technique they need and the amount of search left after it, with grades
+cached by the canonical form of each puzzle so that equivalent puzzles are
+only graded once.
+
+    python Sudoku_Grade.py puzzles.txt > graded.txt
+"""
+import argparse
+import collections
+import math
+import sys
+import Sudoku
+import Sudoku_Cache
+import Sudoku_IO
+import Sudoku_Logic
+import Sudoku_Stats
+
+# Difficulty levels, from easiest to hardest. EASY puzzles need only singles,
+# MEDIUM ones pairs and HARD ones box-line reductions, while EXPERT and
+# DIABOLICAL puzzles need searching after every technique stops making
+# progress, with DIABOLICAL ones running into more dead ends than the side length.
+EASY = "easy"
+MEDIUM = "medium"
+HARD = "hard"
+EXPERT = "expert"
+DIABOLICAL = "diabolical"
+LEVELS = (EASY, MEDIUM, HARD, EXPERT, DIABOLICAL)
+
+# The level of a puzzle with no solution
+UNSOLVABLE = "unsolvable"
+
+# The level each technique makes a puzzle that needs it
+TECHNIQUE_LEVELS = {Sudoku_Logic.NAKED_SINGLE: EASY, Sudoku_Logic.HIDDEN_SINGLE: EASY,
+                    Sudoku_Logic.NAKED_PAIR: MEDIUM, Sudoku_Logic.HIDDEN_PAIR: MEDIUM,
+                    Sudoku_Logic.BOX_LINE: HARD}
+
+# The techniques that alone make a puzzle EASY
+_SINGLES = (Sudoku_Logic.NAKED_SINGLE, Sudoku_Logic.HIDDEN_SINGLE)
+
+# The grade of one puzzle. technique is the hardest technique it needs, or None
+# if it needs none, nodes and backtracks the nodes and dead ends of the search
+# after propagation, and score a number ordering puzzles by difficulty, or None
+# if the puzzle has no solution.
+Grade = collections.namedtuple("Grade", ["level", "technique", "nodes", "backtracks", "score"])
+
+
+def grade(puzzle):
+    """Grades a puzzle by propagating constraints with every technique of
+    Sudoku_Logic, cheapest first, then searching the rest with Dancing Links,
+    which stays quick on boards where square by square search does not. The
+    score is the rank of the hardest technique needed, from 1 for naked
+    singles to 5 for box-line reductions, plus 1 if any search was needed,
+    plus log2(1 + backtracks). The search depends on the order of the
+    squares, so grade the canonical form, as Grader does, for equivalent
+    puzzles to get the same grade.
+
+    puzzle = A Sudoku object, which is not mutated
+
+    return: A Grade"""
+    # Propagation only tries pairs once singles stall, so a puzzle singles
+    # alone solve is graded exactly as it would be, without the search
+    state = Sudoku_Logic.Candidate_State(puzzle)
+    if state.propagate(_SINGLES) and state.is_solved():
+        technique = Sudoku_Logic.HIDDEN_SINGLE if state.counts[Sudoku_Logic.HIDDEN_SINGLE] else (
+            Sudoku_Logic.NAKED_SINGLE if state.counts[Sudoku_Logic.NAKED_SINGLE] else None)
+        return Grade(EASY, technique, 0, 0, float(_SINGLES.index(technique) + 1 if technique else 0))
+
+    sudoku = puzzle.copy()
+    sudoku.stats = Sudoku_Stats.Search_Stats()
+    if not sudoku.is_solvable(strategy=Sudoku.DLX):
+        return Grade(UNSOLVABLE, None, sudoku.nodes, sudoku.stats.backtracks, None)
+
+    counts = sudoku.technique_counts
+    used = [rank for rank in range(len(Sudoku_Logic.TECHNIQUES)) if counts[Sudoku_Logic.TECHNIQUES[rank]]]
+    technique = Sudoku_Logic.TECHNIQUES[used[-1]] if used else None
+    backtracks = sudoku.stats.backtracks
+    score = (used[-1] + 1 if used else 0) + (1 if sudoku.nodes else 0) + math.log2(1 + backtracks)
+
+    if backtracks > sudoku.sl:
+        level = DIABOLICAL
+    elif sudoku.nodes > 0:
+        level = EXPERT
+    else:
+        level = TECHNIQUE_LEVELS.get(technique, EASY)
+    return Grade(level, technique, sudoku.nodes, backtracks, score)
+
+
+
+class Grader():
+    """
+    RI: _grades holds at most maxsize entries, ordered from least to most
+    recently used. hits and misses are non-negative integers.
+
+    AF(_grades, hits, misses): A cache mapping the canonical form of each
+    puzzle graded through it to the Grade of that form, having answered hits
+    lookups from the cache and graded misses puzzles.
+
+    Safety From Rep Exposure: Grades are immutable tuples, and puzzles are
+    only read.
+    """
+
+    def __init__(self, maxsize=4096):
+        """Makes an empty grader caching up to maxsize grades"""
+        self.maxsize = maxsize
+        self._grades = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def grade(self, puzzle):
+        """Grades a puzzle as the grade function does its canonical form,
+        looking the form up in the cache before grading it.
+
+        puzzle = A Sudoku object, or a string in the format Sudoku accepts
+
+        return: A Grade"""
+        if isinstance(puzzle, str):
+            puzzle = Sudoku.Sudoku(puzzle)
+        form = Sudoku_Cache.canonical_form(puzzle)[0]
+        if form in self._grades:
+            self.hits += 1
+            self._grades.move_to_end(form)
+            return self._grades[form]
+
+        self.misses += 1
+        found = grade(Sudoku.Sudoku.from_values(form, validate=False))
+        self._grades[form] = found
+        while len(self._grades) > self.maxsize:
+            self._grades.popitem(last=False)
+        return found
+
+
+    def grade_all(self, puzzles):
+        """A generator of the Grade of each puzzle of an iterable, grading
+        each as it is read, so a stream of generated puzzles can be graded as
+        it is made.
+
+        puzzles = An iterable of Sudoku objects or strings in the format Sudoku accepts"""
+        for puzzle in puzzles:
+            yield self.grade(puzzle)
+
+
+    def stats(self):
+        """Returns a Sudoku_Cache.Cache_Stats of the lookups made so far"""
+        lookups = self.hits + self.misses
+        return Sudoku_Cache.Cache_Stats(self.hits, self.misses, len(self._grades), self.maxsize,
+                                        self.hits / lookups if lookups else 0.0)
+
+
+    def clear(self):
+        """Empties the cache and resets its statistics"""
+        self._grades.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+
+def main(argv=None):
+    """Grades the puzzles of a file from the command line as they are read,
+    writing each in the compact format, or the spaced one for boards larger
+    than 25x25, followed by its level and score, one per line"""
+    parser = argparse.ArgumentParser(description="Grade the difficulty of a file of Sudoku puzzles")
+    parser.add_argument("source", nargs="?", default="-", help="puzzle file, or - for standard input")
+    parser.add_argument("--cache-size", type=int, default=4096, help="grades kept in the cache")
+    args = parser.parse_args(argv)
+
+    grader = Grader(args.cache_size)
+    for puzzle in Sudoku_IO.read_puzzles(args.source):
+        found = grader.grade(puzzle)
+        score = "{:.3f}".format(found.score) if found.score is not None else "-"
+        line = Sudoku_IO.format_puzzle(puzzle) if len(puzzle.split()) <= 625 else puzzle
+        sys.stdout.write("{} {} {}\n".format(line, found.level, score))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
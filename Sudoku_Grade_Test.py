@@ -0,0 +1,86 @@
+import io
+import random
+import sys
+import Sudoku
+import Sudoku_Cache
+import Sudoku_Grade
+import Sudoku_IO
+import Sudoku_Logic
+import unittest
+
+class Test_Sudoku_Grade(unittest.TestCase):
+
+    easy = '96...837..2.4.39.1.34.1...66.....7...59...61...7.....51...2.43.5.39.4.6..921...57'
+    hard = '...6..4..7....36......91.8...........5.18...3...3.6.45.4.2...6.9.3.......2....1..'
+    no_solution = '...6..4..7....36......91.8...........5.18...3...3.6.45.4.2...6.9.3....7..2....1..'
+
+    def sudoku(self, line):
+        return Sudoku.Sudoku(Sudoku_IO.parse_line(line))
+
+    def test_levels(self):
+        easy = Sudoku_Grade.grade(self.sudoku(self.easy))
+        self.assertEqual((easy.level, easy.nodes, easy.backtracks), (Sudoku_Grade.EASY, 0, 0),
+            "expected a puzzle singles solve graded easy")
+        hard = Sudoku_Grade.grade(self.sudoku(self.hard))
+        self.assertIn(hard.level, (Sudoku_Grade.EXPERT, Sudoku_Grade.DIABOLICAL), "expected a puzzle needing search")
+        self.assertGreater(hard.score, easy.score, "expected the hard puzzle to score higher")
+        none = Sudoku_Grade.grade(self.sudoku(self.no_solution))
+        self.assertEqual((none.level, none.score), (Sudoku_Grade.UNSOLVABLE, None), "expected no solution")
+
+    def test_technique(self):
+        puzzle = self.sudoku(self.hard)
+        found = Sudoku_Grade.grade(puzzle)
+        checked = puzzle.copy()
+        checked.is_solvable(strategy=Sudoku.DLX)
+        used = [technique for technique in Sudoku_Logic.TECHNIQUES if checked.technique_counts[technique]]
+        self.assertEqual(found.technique, used[-1], "expected the hardest technique propagation used")
+        self.assertEqual(bytes(puzzle.puzzle.cells), bytes(self.sudoku(self.hard).puzzle.cells),
+            "expected the puzzle not mutated")
+
+    def test_cache(self):
+        grader = Sudoku_Grade.Grader(maxsize=2)
+        puzzle = self.sudoku(self.hard)
+        first = grader.grade(puzzle)
+
+        # Relabelling the values and transposing keeps the canonical form
+        labels = [0] + random.Random(3).sample(range(1, 10), 9)
+        cells = [labels[puzzle.puzzle.cells[col*9 + row]] for row in range(9) for col in range(9)]
+        self.assertEqual(grader.grade(Sudoku.Sudoku.from_values(cells)), first, "expected the same grade")
+        self.assertEqual((grader.hits, grader.misses), (1, 1), "expected the equivalent puzzle found in the cache")
+
+        grader.grade(Sudoku_IO.parse_line(self.easy))
+        grader.grade(self.sudoku(self.no_solution))
+        stats = grader.stats()
+        self.assertEqual((stats.size, stats.hits, stats.misses), (2, 1, 3), "expected the oldest grade evicted")
+        grader.grade(puzzle)
+        self.assertEqual(grader.misses, 4, "expected the evicted grade graded again")
+        grader.clear()
+        self.assertEqual(grader.stats().size, 0, "expected an empty cache")
+
+    def test_grade_all(self):
+        random.seed(2)
+        puzzles = [Sudoku.Create_Sudoku(4).create() for _ in range(20)]
+        grader = Sudoku_Grade.Grader()
+        grades = grader.grade_all(iter(puzzles))
+        self.assertEqual(next(grades), Sudoku_Grade.grade(Sudoku.Sudoku.from_values(
+            Sudoku_Cache.canonical_form(puzzles[0])[0])), "expected the grade of the canonical form")
+        rest = list(grades)
+        self.assertEqual(len(rest), 19, "expected one grade per puzzle")
+        self.assertTrue(all(grade.level in Sudoku_Grade.LEVELS for grade in rest),
+            "expected every generated puzzle to have a solution")
+        self.assertGreater(grader.hits, 0, "expected repeated 4x4 puzzles found in the cache")
+
+    def test_main(self):
+        stdin, stdout = sys.stdin, sys.stdout
+        sys.stdin, sys.stdout = io.StringIO(self.easy + "\n" + self.hard + "\n"), io.StringIO()
+        try:
+            self.assertEqual(Sudoku_Grade.main([]), 0, "expected success")
+            lines = sys.stdout.getvalue().splitlines()
+        finally:
+            sys.stdin, sys.stdout = stdin, stdout
+        self.assertEqual([line.split()[:2] for line in lines][0], [self.easy, Sudoku_Grade.EASY],
+            "expected each puzzle followed by its level")
+        self.assertEqual(len(lines), 2, "expected one line per puzzle")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming readers and writers for files of Sudoku puzzles, one puzzle per line,
+in either the space-separated form Sudoku accepts or the compact one character
+per square form used by most puzzle datasets.
+"""
+import sys
+import Sudoku
+import Sudoku_Errors
+
+# Line formats. SPACED is the space-separated form Sudoku accepts. COMPACT has one
+# character per square, with '.' or '0' for empty squares, and 1-9 then A-Z for
+# the values 1 to 35, so it holds boards up to 25x25.
+SPACED = "spaced"
+COMPACT = "compact"
+FORMATS = (SPACED, COMPACT)
+
+_SYMBOLS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_VALUES = dict((symbol, value+1) for value, symbol in enumerate(_SYMBOLS))
+_VALUES.update((symbol.lower(), value+1) for value, symbol in enumerate(_SYMBOLS) if symbol.isalpha())
+_VALUES.update({'.': 0, '0': 0})
+
+
+def parse_line(line):
+    """Takes in one line of a puzzle file in either format, and returns the
+    puzzle as a string in the space-separated form Sudoku accepts. A line
+    with whitespace between values is read as SPACED, otherwise as COMPACT.
+
+    return: A string representation of the sudoku puzzle"""
+    line = line.strip()
+    if len(line.split()) > 1:
+        return " ".join(line.split())
+
+    values = []
+    for ind in range(len(line)):
+        if line[ind] not in _VALUES:
+            raise Sudoku_Errors.InvalidPuzzleException(line,
+                "Unknown square value '{}' at position {} in compact puzzle".format(line[ind], ind))
+        values.append(str(_VALUES[line[ind]]))
+    return " ".join(values)
+
+
+def format_puzzle(puzzle, format=COMPACT):
+    """Returns one line for a puzzle file, without a newline.
+
+    puzzle = A Sudoku object, a line in either format, a list of lists of 
+        squares as returned by get_puzzle, or a flat sequence of square values
+    format = SPACED or COMPACT
+
+    return: A string of the puzzle in the given format"""
+    if format not in FORMATS:
+        raise Sudoku_Errors.InvalidStrategyException(format,
+            "Unknown puzzle file format, must be one of {}".format(FORMATS))
+
+    if isinstance(puzzle, str):
+        puzzle = parse_line(puzzle).split()
+    elif hasattr(puzzle, "get_puzzle"):
+        puzzle = puzzle.get_puzzle()
+    if puzzle and isinstance(puzzle[0], (list, tuple)):
+        puzzle = [value for row in puzzle for value in row]
+
+    if format == SPACED:
+        return " ".join(str(value) for value in puzzle)
+    if len(puzzle) > len(_SYMBOLS)**2:
+        raise Sudoku_Errors.InvalidPuzzleException(puzzle, "Puzzle too large for the compact format")
+    return "".join(_SYMBOLS[int(value)-1] if int(value) else '.' for value in puzzle)
+
+
+def read_puzzles(source=None):
+    """A generator of the puzzles in a file, one per line, as strings in the
+    space-separated form Sudoku accepts. Lines are read one at a time, so
+    memory use does not grow with the size of the file. Blank lines and
+    lines starting with '#' are skipped.
+
+    source = A file object, a path, '-' or None for standard input"""
+    if source is None or source == '-':
+        source = sys.stdin
+    if isinstance(source, str):
+        with open(source) as source:
+            for puzzle in read_puzzles(source):
+                yield puzzle
+        return
+
+    for line in source:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield parse_line(line)
+
+
+def write_puzzles(puzzles, sink=None, format=COMPACT):
+    """Writes each puzzle of an iterable to a file, one per line, as they are
+    read from the iterable.
+
+    puzzles = An iterable of puzzles of any type format_puzzle takes
+    sink = A file object, a path, '-' or None for standard output
+    format = SPACED or COMPACT
+
+    return: An integer of the number of puzzles written"""
+    if sink is None or sink == '-':
+        sink = sys.stdout
+    if isinstance(sink, str):
+        with open(sink, 'w') as sink:
+            return write_puzzles(puzzles, sink, format)
+
+    count = 0
+    for puzzle in puzzles:
+        sink.write(format_puzzle(puzzle, format) + "\n")
+        count += 1
+    return count
+
+
+def write_rendered(puzzles, sink=None):
+    """Writes each puzzle of an iterable to a file as rendered by Sudoku.render,
+    with a blank line after each, as they are read from the iterable. Sudoku
+    objects and Boards are rendered straight from their squares, and every
+    board of one side length shares one cached template, so thousands of
+    boards can be streamed without building up the output.
+
+    puzzles = An iterable of Sudoku objects, Boards, or puzzles of any type
+        format_puzzle takes
+    sink = A file object, a path, '-' or None for standard output
+
+    return: An integer of the number of puzzles written"""
+    if sink is None or sink == '-':
+        sink = sys.stdout
+    if isinstance(sink, str):
+        with open(sink, 'w') as sink:
+            return write_rendered(puzzles, sink)
+
+    count = 0
+    write = sink.write
+    for puzzle in puzzles:
+        if isinstance(puzzle, str):
+            puzzle = [int(value) for value in parse_line(puzzle).split()]
+        elif hasattr(puzzle, "get_puzzle"):
+            puzzle = puzzle.puzzle
+        if not isinstance(puzzle, Sudoku.Board) and puzzle and not isinstance(puzzle[0], (list, tuple)):
+            puzzle = Sudoku.Board(int(len(puzzle)**0.5), bytearray(int(value) for value in puzzle))
+        write(Sudoku.render(puzzle))
+        write("\n\n")
+        count += 1
+    return count
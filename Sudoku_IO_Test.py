@@ -0,0 +1,60 @@
+import io
+import os
+import tempfile
+import Sudoku
+import Sudoku_Errors
+import Sudoku_IO
+import unittest
+
+class Test_Sudoku_IO(unittest.TestCase):
+
+    compact = '96...837..2.4.39.1.34.1...66.....7...59...61...7.....51...2.43.5.39.4.6..921...57'
+    spaced = '9 6 0 0 0 8 3 7 0 0 2 0 4 0 3 9 0 1 0 3 4 0 1 0 0 0 6 6 0 0 0 0 0 7 0 0 ' +\
+             '0 5 9 0 0 0 6 1 0 0 0 7 0 0 0 0 0 5 1 0 0 0 2 0 4 3 0 5 0 3 9 0 4 0 6 0 0 9 2 1 0 0 0 5 7'
+
+    def test_parse_line(self):
+        self.assertEqual(Sudoku_IO.parse_line(self.compact), self.spaced, "expected compact line parsed to spaced form")
+        self.assertEqual(Sudoku_IO.parse_line(self.compact.replace('.', '0')), self.spaced, "expected '0' read as empty")
+        self.assertEqual(Sudoku_IO.parse_line("  " + self.spaced + "\n"), self.spaced, "expected spaced line kept")
+        self.assertEqual(Sudoku_IO.parse_line('G' + '.'*255).split()[0], '16', "expected G read as 16")
+        with self.assertRaises(Sudoku_Errors.InvalidPuzzleException):
+            Sudoku_IO.parse_line('12?4')
+
+    def test_format_puzzle(self):
+        puzzle = Sudoku.Sudoku(self.spaced)
+        self.assertEqual(Sudoku_IO.format_puzzle(puzzle), self.compact, "expected compact form of puzzle")
+        self.assertEqual(Sudoku_IO.format_puzzle(puzzle, Sudoku_IO.SPACED), self.spaced, "expected spaced form of puzzle")
+        self.assertEqual(Sudoku_IO.format_puzzle([[1, 0], [0, 16]]), '1..G', "expected compact form of a grid")
+
+    def test_round_trip(self):
+        puzzles = [self.spaced, '0 '*255 + '16', Sudoku_IO.parse_line('1234341221434321')]
+        for format in Sudoku_IO.FORMATS:
+            sink = io.StringIO()
+            self.assertEqual(Sudoku_IO.write_puzzles((Sudoku.Sudoku(p) for p in puzzles), sink, format), 3,
+                "expected 3 puzzles written")
+            source = io.StringIO("# a comment\n\n" + sink.getvalue())
+            self.assertEqual(list(Sudoku_IO.read_puzzles(source)), [" ".join(p.split()) for p in puzzles],
+                "expected puzzles read back in {} format".format(format))
+
+    def test_write_rendered(self):
+        puzzle = Sudoku.Sudoku(self.spaced)
+        puzzles = [puzzle, puzzle.puzzle, puzzle.get_puzzle(), self.compact, list(puzzle.puzzle.cells)]
+        sink = io.StringIO()
+        self.assertEqual(Sudoku_IO.write_rendered(iter(puzzles), sink), 5, "expected 5 puzzles written")
+        expected = Sudoku.render(puzzle.get_puzzle()) + "\n\n"
+        self.assertEqual(sink.getvalue(), expected*5, "expected each kind of puzzle rendered the same")
+
+    def test_path(self):
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            Sudoku_IO.write_puzzles([self.spaced]*3, path)
+            reader = Sudoku_IO.read_puzzles(path)
+            self.assertEqual(next(reader), self.spaced, "expected first puzzle read from path")
+            self.assertEqual(len(list(reader)), 2, "expected the rest of the puzzles read lazily")
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+An edit journal for Sudoku objects, logging each change made to a puzzle so
+that edits can be undone and redone one at a time, or rolled back to a named
+checkpoint, without copying the board.
+"""
+
+
+class Journal():
+    """
+    RI: Every entry of history and future is a non-empty tuple of changes
+    (ind, old, new), with ind a flat square index and old and new square
+    values, exactly one of which is 0. Every value of checkpoints is an integer
+    between 0 and len(history) + len(future).
+
+    AF(history, future, checkpoints): The edits made to a puzzle, oldest first,
+    where history holds the ones still applied and future, most recently undone
+    last, the ones undone since the last new edit. The puzzle was in the state
+    of checkpoint name after the first checkpoints[name] edits.
+
+    Safety From Rep Exposure: Entries are immutable tuples, and changes returns
+    a new list.
+    """
+    __slots__ = ("history", "future", "checkpoints")
+
+    def __init__(self):
+        self.history = []
+        self.future = []
+        self.checkpoints = {}
+
+
+    def record(self, changes):
+        """Logs a new edit, a tuple of changes, after the ones applied. Edits
+        that were undone can no longer be redone, so checkpoints after them
+        are dropped."""
+        if self.future:
+            self.future = []
+            position = len(self.history)
+            self.checkpoints = dict((name, mark) for name, mark in self.checkpoints.items() if mark <= position)
+        self.history.append(changes)
+
+
+    def undo(self):
+        """Moves the last applied edit to the edits that can be redone.
+        return: The tuple of changes of the edit, or None if there is none"""
+        if not self.history:
+            return None
+        changes = self.history.pop()
+        self.future.append(changes)
+        return changes
+
+
+    def redo(self):
+        """Moves the last undone edit back to the applied edits.
+        return: The tuple of changes of the edit, or None if there is none"""
+        if not self.future:
+            return None
+        changes = self.future.pop()
+        self.history.append(changes)
+        return changes
+
+
+    def position(self, checkpoint):
+        """Returns the number of applied edits at a checkpoint, given by name
+        or as an integer position, with names looked up first, raising
+        KeyError for an unknown name or IndexError for a position that was
+        never reached"""
+        if checkpoint in self.checkpoints:
+            return self.checkpoints[checkpoint]
+        if isinstance(checkpoint, int):
+            if not (0 <= checkpoint <= len(self.history) + len(self.future)):
+                raise IndexError("Journal position {} out of range".format(checkpoint))
+            return checkpoint
+        return self.checkpoints[checkpoint]
+
+
+    def changes(self, since=0):
+        """Returns a list of the (ind, old, new) changes applied after the
+        first since edits, oldest first"""
+        return [change for changes in self.history[since:] for change in changes]
@@ -0,0 +1,110 @@
+import random
+import Sudoku
+import Sudoku_Journal
+import unittest
+
+class Test_Sudoku_Journal(unittest.TestCase):
+
+    puzzle = '4 0 3 2 0 3 0 1 3 2 0 0 0 4 0 3'
+
+    def test_undo_redo(self):
+        sudoku = Sudoku.Sudoku(self.puzzle)
+        start = bytes(sudoku.puzzle.cells)
+        self.assertFalse(sudoku.undo(), "expected nothing to undo on a new puzzle")
+        sudoku.insert(0, 1, 1)
+        sudoku.insert(0, 0, 0)
+        after = bytes(sudoku.puzzle.cells)
+
+        self.assertTrue(sudoku.undo(), "expected the removal undone")
+        self.assertEqual(sudoku.puzzle.cells[0], 4, "expected the removed value back")
+        self.assertTrue(sudoku.undo(), "expected the insert undone")
+        self.assertEqual(bytes(sudoku.puzzle.cells), start, "expected the starting puzzle back")
+        self.assertFalse(sudoku.valid_square(0, 1, 3), "expected the bitmasks restored with the squares")
+        self.assertTrue(sudoku.redo() and sudoku.redo(), "expected both edits redone")
+        self.assertEqual(bytes(sudoku.puzzle.cells), after, "expected the edited puzzle back")
+        self.assertFalse(sudoku.redo(), "expected nothing left to redo")
+
+        # A new edit after undoing drops the edits that were undone
+        sudoku.undo()
+        self.assertTrue(sudoku.insert(1, 0, 2), "expected a valid insert")
+        self.assertFalse(sudoku.redo(), "expected no redo after a new edit")
+
+    def test_failed_insert(self):
+        sudoku = Sudoku.Sudoku(self.puzzle)
+        self.assertFalse(sudoku.insert(0, 1, 4), "expected a repeated value rejected")
+        self.assertTrue(sudoku.insert(0, 1, 0), "expected an empty square emptied")
+        self.assertEqual(sudoku.changes(), [], "expected no change logged for edits that change nothing")
+
+    def test_checkpoints(self):
+        sudoku = Sudoku.Sudoku(self.puzzle)
+        start = bytes(sudoku.puzzle.cells)
+        sudoku.checkpoint("start")
+        sudoku.insert(0, 1, 1)
+        middle = sudoku.checkpoint("middle")
+        sudoku.insert(1, 0, 2)
+        sudoku.insert(3, 3, 0)
+        self.assertEqual(sudoku.changes("middle"), [(1, 0, 0, 2), (3, 3, 3, 0)], "expected the change log")
+        end = bytes(sudoku.puzzle.cells)
+
+        sudoku.rollback("start")
+        self.assertEqual(bytes(sudoku.puzzle.cells), start, "expected the state at the start checkpoint")
+        sudoku.rollback(middle)
+        self.assertEqual(sudoku.changes(), [(0, 1, 0, 1)], "expected rolling forward to a position to redo")
+        sudoku.rollback(3)
+        self.assertEqual(bytes(sudoku.puzzle.cells), end, "expected every edit redone")
+
+        # Checkpoints past the edits undone are forgotten once a new edit is made
+        sudoku.checkpoint("end")
+        sudoku.rollback("middle")
+        sudoku.insert(2, 0, 0)
+        with self.assertRaises(KeyError):
+            sudoku.rollback("end")
+        with self.assertRaises(IndexError):
+            sudoku.rollback(5)
+        sudoku.rollback("start")
+        self.assertEqual(bytes(sudoku.puzzle.cells), start, "expected earlier checkpoints kept")
+
+    def test_solve_undo(self):
+        sudoku = Sudoku.Sudoku(self.puzzle)
+        start = bytes(sudoku.puzzle.cells)
+        self.assertTrue(sudoku.solve_sudoku(strategy=Sudoku.DLX), "expected the puzzle solved")
+        self.assertTrue(sudoku.undo(), "expected the solve undone as one edit")
+        self.assertEqual(bytes(sudoku.puzzle.cells), start, "expected the unsolved puzzle back")
+        self.assertFalse(sudoku.undo(), "expected nothing before the solve")
+
+    def test_incremental(self):
+        random.seed(5)
+        sudoku = Sudoku.Create_Sudoku(9).create()
+        self.assertEqual(sudoku.changes(), [], "expected a created puzzle with an empty journal")
+        sudoku.set_incremental()
+        self.assertTrue(sudoku.is_one_sol(), "expected a created puzzle with one solution")
+        filled = [ind for ind in range(81) if sudoku.puzzle.cells[ind]]
+        for ind in filled[:6]:
+            sudoku.insert(ind // 9, ind % 9, 0)
+        for _ in range(6):
+            sudoku.undo()
+            fresh = Sudoku.Sudoku.from_values(sudoku.puzzle.cells)
+            self.assertEqual(sudoku.is_one_sol(), fresh.is_one_sol(),
+                "expected the incremental cache to follow undo")
+
+    def test_copy(self):
+        sudoku = Sudoku.Sudoku(self.puzzle)
+        sudoku.insert(0, 1, 1)
+        other = sudoku.copy()
+        self.assertFalse(other.undo(), "expected a copy to start with an empty journal")
+        sudoku.clear_history()
+        self.assertFalse(sudoku.undo(), "expected nothing to undo after clearing the journal")
+
+    def test_journal(self):
+        journal = Sudoku_Journal.Journal()
+        journal.record(((0, 0, 1),))
+        journal.checkpoints["one"] = 1
+        journal.record(((1, 0, 2),))
+        self.assertEqual(journal.undo(), ((1, 0, 2),), "expected the last edit undone")
+        journal.record(((2, 0, 3),))
+        self.assertEqual(journal.position("one"), 1, "expected a checkpoint before the undone edit kept")
+        self.assertIsNone(journal.redo(), "expected nothing to redo after a new edit")
+        self.assertEqual(journal.changes(), [(0, 0, 1), (2, 0, 3)], "expected the applied changes")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
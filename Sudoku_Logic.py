@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Constraint propagation for Sudoku puzzles: repeatedly applies logical solving
+techniques to a grid of candidate bitmasks until none of them make progress.
+"""
+
+# The techniques applied by Candidate_State.propagate, from cheapest to most expensive
+NAKED_SINGLE = "naked_single"
+HIDDEN_SINGLE = "hidden_single"
+NAKED_PAIR = "naked_pair"
+HIDDEN_PAIR = "hidden_pair"
+BOX_LINE = "box_line"
+TECHNIQUES = (NAKED_SINGLE, HIDDEN_SINGLE, NAKED_PAIR, HIDDEN_PAIR, BOX_LINE)
+
+# Cache of the units and peers of each (sl, bs) board geometry
+_GEOMETRIES = {}
+
+
+def geometry(sl, bs):
+    """Returns the units and peers of a board with side length sl and block
+    size bs, with squares numbered row*sl + col.
+
+    return: A tuple (rows, cols, boxes, peers), where rows, cols and boxes are
+    lists of lists of the squares in each unit, and peers[square] is a list
+    of every other square sharing a row, column or box with square"""
+    if (sl, bs) not in _GEOMETRIES:
+        rows = [[row*sl + col for col in range(sl)] for row in range(sl)]
+        cols = [[row*sl + col for row in range(sl)] for col in range(sl)]
+        boxes = [[(bs*(box//bs) + i//bs)*sl + bs*(box % bs) + i % bs for i in range(sl)] for box in range(sl)]
+
+        peers = [set() for _ in range(sl*sl)]
+        for unit in rows + cols + boxes:
+            for square in unit:
+                peers[square].update(unit)
+        peers = [sorted(peers[square] - {square}) for square in range(sl*sl)]
+
+        _GEOMETRIES[(sl, bs)] = (rows, cols, boxes, peers)
+    return _GEOMETRIES[(sl, bs)]
+
+
+class _Contradiction(Exception):
+    """Raised internally when propagation leaves a square or unit with no
+    possible value, meaning the puzzle has no solution"""
+    pass
+
+
+class Candidate_State():
+    """
+    RI: values and cands have length sl*sl. values[square] is 0 for an empty
+    square, and cands[square] is 0 for a filled square. No candidate of an
+    empty square is the value of one of its peers.
+
+    AF(values, cands): The squares of a Sudoku puzzle, numbered row*sl + col,
+    where each empty square can only take the values whose bits are set in
+    its candidate bitmask.
+
+    Safety From Rep Exposure: The Sudoku object it is built from is only read,
+    and never kept.
+    """
+
+    def __init__(self, puzzle):
+        """Takes in a Sudoku object and builds the candidate state of its squares"""
+        self.sl = puzzle.sl
+        self.bs = puzzle.bs
+        self.rows, self.cols, self.boxes, self.peers = geometry(self.sl, self.bs)
+        self.units = self.rows + self.cols + self.boxes
+
+        self.values = list(puzzle.puzzle.cells)
+        self.cands = [puzzle.candidate_mask(row, col) for row in range(self.sl) for col in range(self.sl)]
+
+        # Number of times each technique made progress, and the (row, col, value)
+        # squares that propagation filled, in order
+        self.counts = dict.fromkeys(TECHNIQUES, 0)
+        self.placements = []
+
+        # The Sudoku_Budget.Budget checked while propagate runs, or None
+        self._budget = None
+
+
+    def copy(self):
+        """Returns a new Candidate_State with the same squares, candidates,
+        counts and placements, which can be changed without changing this one"""
+        other = Candidate_State.__new__(Candidate_State)
+        other.sl, other.bs = self.sl, self.bs
+        other.rows, other.cols, other.boxes, other.peers = self.rows, self.cols, self.boxes, self.peers
+        other.units = self.units
+        other.values = list(self.values)
+        other.cands = list(self.cands)
+        other.counts = dict(self.counts)
+        other.placements = list(self.placements)
+        other._budget = None
+        return other
+
+
+    def assign(self, square, value):
+        """Fills square, numbered row*sl + col, with value, one of its
+        candidates, and removes value from the candidates of its peers.
+
+        return: A boolean of False if a peer was left with no candidates,
+        True otherwise"""
+        try:
+            self._place(square, value)
+        except _Contradiction:
+            return False
+        return True
+
+
+    def is_solved(self):
+        """Returns a boolean of whether every square has a value"""
+        return 0 not in self.values
+
+
+    def grid(self):
+        """Returns the values of the squares as a list of lists of integers"""
+        return [self.values[row*self.sl:(row+1)*self.sl] for row in range(self.sl)]
+
+
+    def propagate(self, techniques=TECHNIQUES, budget=None):
+        """Applies the given techniques until none of them make progress,
+        trying cheaper techniques again after any progress is made. Only
+        values that are in no solution are ever removed.
+
+        techniques = A sequence of technique names from TECHNIQUES
+        budget = A Sudoku_Budget.Budget checked before each technique is
+            applied and for each value box-line reductions look at, raising
+            BudgetExceededException once it runs out, or None for no limit
+
+        return: A boolean of False if the puzzle was found to have no solution,
+        True otherwise"""
+        steps = [getattr(self, "_" + technique) for technique in TECHNIQUES if technique in techniques]
+        self._budget = budget
+        try:
+            progress = True
+            while progress:
+                progress = False
+                for step in steps:
+                    if budget is not None:
+                        budget.check()
+                    if step():
+                        progress = True
+                        break
+        except _Contradiction:
+            return False
+        finally:
+            self._budget = None
+        return True
+
+
+    def _place(self, square, value):
+        """Fills square with value, and removes value from the candidates of its peers"""
+        self.values[square] = value
+        self.cands[square] = 0
+        self.placements.append((square // self.sl, square % self.sl, value))
+
+        bit = 1 << value
+        for peer in self.peers[square]:
+            if self.cands[peer] & bit:
+                self.cands[peer] ^= bit
+                if self.cands[peer] == 0:
+                    raise _Contradiction()
+
+
+    def _eliminate(self, square, mask):
+        """Removes the values in mask from the candidates of square.
+        return: A boolean of whether any candidate was removed"""
+        if not self.cands[square] & mask:
+            return False
+        self.cands[square] &= ~mask
+        if self.cands[square] == 0:
+            raise _Contradiction()
+        return True
+
+
+    def _naked_single(self):
+        """Fills every empty square that has exactly one candidate.
+        return: A boolean of whether any square was filled"""
+        progress = False
+        for square in range(len(self.cands)):
+            mask = self.cands[square]
+            if mask and not mask & (mask - 1):
+                self._place(square, mask.bit_length() - 1)
+                self.counts[NAKED_SINGLE] += 1
+                progress = True
+        return progress
+
+
+    def _hidden_single(self):
+        """Fills every square that is the only place in one of its units for
+        one of the unit's missing values.
+        return: A boolean of whether any square was filled"""
+        full = ((1 << (self.sl+1)) - 1) ^ 1
+        progress = False
+        for unit in self.units:
+            # Find the values that are candidates in exactly one square of the unit
+            once, twice, placed = 0, 0, 0
+            for square in unit:
+                mask = self.cands[square]
+                twice |= once & mask
+                once |= mask
+                placed |= 1 << self.values[square]
+
+            # A missing value with nowhere to go means no solution
+            if full & ~(once | placed):
+                raise _Contradiction()
+
+            singles = once & ~twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for square in unit:
+                    if self.cands[square] & bit:
+                        self._place(square, bit.bit_length() - 1)
+                        self.counts[HIDDEN_SINGLE] += 1
+                        progress = True
+                        break
+        return progress
+
+
+    def _naked_pair(self):
+        """For two squares in a unit with the same two candidates, removes
+        those candidates from the rest of the unit.
+        return: A boolean of whether any candidate was removed"""
+        progress = False
+        for unit in self.units:
+            seen = {}
+            for square in unit:
+                # Skip squares that do not have exactly two candidates
+                mask = self.cands[square]
+                rest = mask & (mask - 1)
+                if not rest or rest & (rest - 1):
+                    continue
+                if mask not in seen:
+                    seen[mask] = square
+                    continue
+
+                # Found a pair, so no other square in the unit can take either value
+                removed = False
+                for other in unit:
+                    if other != square and other != seen[mask]:
+                        removed = self._eliminate(other, mask) or removed
+                if removed:
+                    self.counts[NAKED_PAIR] += 1
+                    progress = True
+        return progress
+
+
+    def _hidden_pair(self):
+        """For two values that are candidates in exactly the same two squares
+        of a unit, removes every other candidate from those squares.
+        return: A boolean of whether any candidate was removed"""
+        progress = False
+        for unit in self.units:
+            # Only units with two values that are candidates in exactly two
+            # squares can have a pair
+            once, twice, more = 0, 0, 0
+            for square in unit:
+                mask = self.cands[square]
+                more |= twice & mask
+                twice |= once & mask
+                once |= mask
+            doubles = twice & ~more
+            if not doubles & (doubles - 1):
+                continue
+
+            # Map each pair of squares to the values that can only go in those two squares
+            pairs = {}
+            while doubles:
+                bit = doubles & -doubles
+                doubles ^= bit
+                where = tuple(square for square in unit if self.cands[square] & bit)
+                pairs.setdefault(where, []).append(bit)
+
+            for where, bits in pairs.items():
+                if len(bits) != 2:
+                    continue
+                mask = bits[0] | bits[1]
+                removed = False
+                for square in where:
+                    removed = self._eliminate(square, ~mask) or removed
+                if removed:
+                    self.counts[HIDDEN_PAIR] += 1
+                    progress = True
+        return progress
+
+
+    def _box_line(self):
+        """Removes a value from a row or column outside a box when the box can
+        only place it in that line (pointing), and from a box outside a line
+        when the line can only place it in that box (claiming).
+        return: A boolean of whether any candidate was removed"""
+        sl, bs = self.sl, self.bs
+        progress = False
+
+        # The values that are candidates in at least two squares of each box, row
+        # and column. Candidates are only ever removed, so a value missing from
+        # these never has to be looked for in that unit.
+        repeated = [self._repeated(units) for units in (self.boxes, self.rows, self.cols)]
+
+        for value in range(1, sl+1):
+            bit = 1 << value
+            if self._budget is not None:
+                self._budget.check()
+
+            # Pointing: the value's squares in a box all share a row or column
+            for box in range(sl):
+                if not repeated[0][box] & bit:
+                    continue
+                where = [square for square in self.boxes[box] if self.cands[square] & bit]
+                if len(where) < 2:
+                    continue
+                row, col = where[0] // sl, where[0] % sl
+                if all(square // sl == row for square in where):
+                    removed = False
+                    for square in self.rows[row]:
+                        if (square % sl)//bs != box % bs:
+                            removed = self._eliminate(square, bit) or removed
+                    if removed:
+                        self.counts[BOX_LINE] += 1
+                        progress = True
+                if all(square % sl == col for square in where):
+                    removed = False
+                    for square in self.cols[col]:
+                        if (square // sl)//bs != box // bs:
+                            removed = self._eliminate(square, bit) or removed
+                    if removed:
+                        self.counts[BOX_LINE] += 1
+                        progress = True
+
+            # Claiming: the value's squares in a row or column all share a box
+            for units, twice, across, along in ((self.rows, repeated[1], sl, 1), (self.cols, repeated[2], 1, sl)):
+                for line in range(sl):
+                    if not twice[line] & bit:
+                        continue
+                    where = [square for square in units[line] if self.cands[square] & bit]
+                    if len(where) < 2:
+                        continue
+                    band = (where[0] // along % sl)//bs
+                    if all((square // along % sl)//bs == band for square in where):
+                        removed = False
+                        for square in self.boxes[self._box_of(where[0])]:
+                            if (square // across) % sl != line:
+                                removed = self._eliminate(square, bit) or removed
+                        if removed:
+                            self.counts[BOX_LINE] += 1
+                            progress = True
+        return progress
+
+
+    def _repeated(self, units):
+        """Returns a list of bitmasks of the values that are candidates in at
+        least two squares of each of units"""
+        masks = []
+        for unit in units:
+            once, twice = 0, 0
+            for square in unit:
+                mask = self.cands[square]
+                twice |= once & mask
+                once |= mask
+            masks.append(twice)
+        return masks
+
+
+    def _box_of(self, square):
+        """Returns the index of the box containing square"""
+        return self.bs*((square // self.sl)//self.bs) + (square % self.sl)//self.bs
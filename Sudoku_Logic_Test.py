@@ -0,0 +1,155 @@
+import Sudoku
+import Sudoku_Logic
+import random
+import unittest
+
+class Test_Candidate_State(unittest.TestCase):
+
+    easy = '9 6 0 0 0 8 3 7 0 ' +\
+           '0 2 0 4 0 3 9 0 1 ' +\
+           '0 3 4 0 1 0 0 0 6 ' +\
+           '6 0 0 0 0 0 7 0 0 ' +\
+           '0 5 9 0 0 0 6 1 0 ' +\
+           '0 0 7 0 0 0 0 0 5 ' +\
+           '1 0 0 0 2 0 4 3 0 ' +\
+           '5 0 3 9 0 4 0 6 0 ' +\
+           '0 9 2 1 0 0 0 5 7'
+
+    hard = '0 0 0 6 0 0 4 0 0 ' +\
+           '7 0 0 0 0 3 6 0 0 ' +\
+           '0 0 0 0 9 1 0 8 0 ' +\
+           '0 0 0 0 0 0 0 0 0 ' +\
+           '0 5 0 1 8 0 0 0 3 ' +\
+           '0 0 0 3 0 6 0 4 5 ' +\
+           '0 4 0 2 0 0 0 6 0 ' +\
+           '9 0 3 0 0 0 0 0 0 ' +\
+           '0 2 0 0 0 0 1 0 0'
+
+    def test_logic_solves_easy(self):
+        puzzle = Sudoku.Sudoku(self.easy)
+        state = Sudoku_Logic.Candidate_State(puzzle)
+        self.assertTrue(state.propagate(), "expected a consistent candidate state")
+        self.assertTrue(state.is_solved(), "expected propagation alone to solve the puzzle")
+
+        expected = Sudoku.Sudoku(self.easy)
+        expected.solve_sudoku(propagate=False)
+        self.assertEqual(state.grid(), [[int(v) for v in row] for row in expected.get_puzzle()],
+            "expected propagation to reach the only solution")
+        self.assertEqual(state.counts[Sudoku_Logic.NAKED_SINGLE] + state.counts[Sudoku_Logic.HIDDEN_SINGLE],
+            len(state.placements), "expected one single counted for each filled square")
+        self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(self.easy).get_puzzle(),
+            "expected the Sudoku object not to be mutated by propagation")
+
+    def test_logic_keeps_solution(self):
+        puzzle = Sudoku.Sudoku(self.hard)
+        state = Sudoku_Logic.Candidate_State(puzzle)
+        self.assertTrue(state.propagate(), "expected a consistent candidate state")
+
+        solution = Sudoku.Sudoku(self.hard)
+        solution.solve_sudoku(strategy=Sudoku.DLX, propagate=False)
+        for row in range(9):
+            for col in range(9):
+                value = int(solution.get_puzzle()[row][col])
+                square = row*9 + col
+                self.assertTrue(state.values[square] == value or (state.cands[square] >> value) & 1,
+                    "expected solution value {} to remain possible at ({}, {})".format(value, row, col))
+
+    def test_contradiction(self):
+        board = '0 0 3 0 ' +\
+                '1 2 0 0 ' +\
+                '0 4 2 3 ' +\
+                '0 1 0 0'
+        state = Sudoku_Logic.Candidate_State(Sudoku.Sudoku(board))
+        self.assertFalse(state.propagate(), "expected propagation to find no solution")
+
+    def test_single_technique(self):
+        state = Sudoku_Logic.Candidate_State(Sudoku.Sudoku(self.hard))
+        self.assertTrue(state.propagate([Sudoku_Logic.NAKED_SINGLE]), "expected a consistent candidate state")
+        for technique in Sudoku_Logic.TECHNIQUES[1:]:
+            self.assertEqual(state.counts[technique], 0, "expected only naked singles to be applied")
+
+    def test_copy_and_assign(self):
+        state = Sudoku_Logic.Candidate_State(Sudoku.Sudoku(self.easy))
+        trial = state.copy()
+        self.assertTrue(trial.assign(2, 1), "expected a candidate to be assigned")
+        self.assertEqual((trial.values[2], trial.cands[2]), (1, 0), "expected the value placed")
+        self.assertFalse(any((trial.cands[peer] >> 1) & 1 for peer in trial.peers[2]),
+            "expected the value removed from the candidates of its peers")
+        self.assertEqual((state.values[2], state.placements), (0, []), "expected the original state unchanged")
+
+        # 5 is the only candidate left for a peer of (0, 2)
+        self.assertFalse(state.copy().assign(2, 5), "expected a peer left with no candidates")
+
+    def scan_eliminations(self, state):
+        """Returns the candidates left by one pass of hidden pairs and then one
+        of box-line reductions, scanning every value of every unit"""
+        cands = list(state.cands)
+        for unit in state.units:
+            pairs = {}
+            for value in range(1, state.sl+1):
+                where = tuple(square for square in unit if cands[square] >> value & 1)
+                if len(where) == 2:
+                    pairs.setdefault(where, []).append(value)
+            for where, values in pairs.items():
+                if len(values) == 2:
+                    for square in where:
+                        cands[square] &= (1 << values[0]) | (1 << values[1])
+
+        box_of = {square: box for box in range(state.sl) for square in state.boxes[box]}
+        for value in range(1, state.sl+1):
+            bit = 1 << value
+            for box in state.boxes:
+                where = [square for square in box if cands[square] & bit]
+                for line in state.rows + state.cols:
+                    if len(where) > 1 and all(square in line for square in where):
+                        for square in line:
+                            if square not in box:
+                                cands[square] &= ~bit
+            for line in state.rows + state.cols:
+                where = [square for square in line if cands[square] & bit]
+                if len(where) > 1 and len({box_of[square] for square in where}) == 1:
+                    for square in state.boxes[box_of[where[0]]]:
+                        if square not in line:
+                            cands[square] &= ~bit
+        return cands
+
+    def test_eliminations_match_scan(self):
+        random.seed(2)
+        for sl in [4, 9, 9, 16]:
+            for _ in range(10):
+                puzzle = Sudoku.Create_Sudoku(sl).solution_grid()
+                for square in random.sample(range(sl*sl), sl*sl*2//3):
+                    puzzle.insert(square // sl, square % sl, 0)
+                state = Sudoku_Logic.Candidate_State(puzzle)
+                self.assertTrue(state.propagate(Sudoku_Logic.TECHNIQUES[:2]), "expected a consistent candidate state")
+
+                expected = self.scan_eliminations(state)
+                state._hidden_pair()
+                state._box_line()
+                self.assertEqual(state.cands, expected,
+                    "expected the same candidates as scanning every value of every unit")
+
+
+class Test_Propagated_Search(unittest.TestCase):
+
+    def test_same_results(self):
+        for board in ['0 '*16, '1 2 0 0 3 4 0 0 0 0 0 0 0 0 0 0', Test_Candidate_State.easy]:
+            for strategy in Sudoku.STRATEGIES:
+                with_logic = Sudoku.Sudoku(board)
+                without_logic = Sudoku.Sudoku(board)
+                self.assertEqual(with_logic.is_one_sol(strategy=strategy), without_logic.is_one_sol(strategy=strategy, propagate=False),
+                    "expected the same is_one_sol result with and without propagation")
+                self.assertEqual(with_logic.get_puzzle(), Sudoku.Sudoku(board).get_puzzle(),
+                    "expected is_one_sol with propagation not to mutate the puzzle")
+
+            # Propagation only removes impossible values, so row-major finds the same first solution
+            with_logic = Sudoku.Sudoku(board)
+            without_logic = Sudoku.Sudoku(board)
+            with_logic.solve_sudoku()
+            without_logic.solve_sudoku(propagate=False)
+            self.assertEqual(with_logic.get_puzzle(), without_logic.get_puzzle(),
+                "expected the same row-major solution with and without propagation")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
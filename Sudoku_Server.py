@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A local HTTP server answering JSON requests to solve, check and generate Sudoku
+puzzles, built on asyncio with the searches run in a pool of worker processes.
+
+    POST /solve     {"puzzle": "...", "strategy": "dlx", "timeout": 5}
+    POST /unique    {"puzzle": "...", "strategy": "dlx", "timeout": 5}
+    POST /generate  {"sl": 9, "clues": null, "seed": 0, "timeout": 5}
+    GET  /health
+
+Puzzles are sent in either format Sudoku_IO reads, and returned as lists of
+rows of integers. At most two searches per worker run at once, and at most
+queue_limit requests wait or run, with the rest answered 503 straight away.
+
+    python Sudoku_Server.py --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import Sudoku
+import Sudoku_Batch
+import Sudoku_Budget
+import Sudoku_Errors
+import Sudoku_Farm
+import Sudoku_IO
+
+# The status of a uniqueness check, along with Sudoku_Batch's UNSOLVABLE,
+# TIMEOUT and INVALID
+UNIQUE = "unique"
+MULTIPLE = "multiple"
+
+# Reasons given with each HTTP status code sent
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+# The largest side length of the puzzles accepted or generated. Boards hold
+# values in bytes, and much larger ones take longer to set up than any
+# timeout allows, before a search has charged the budget at all.
+MAX_SL = 36
+
+
+def check_one(puzzle, strategy=Sudoku.DLX, timeout=None):
+    """Checks whether a puzzle given as a string in the format Sudoku accepts
+    has exactly one solution, giving up once the search has run for timeout
+    seconds.
+
+    return: One of UNIQUE, MULTIPLE, or Sudoku_Batch's UNSOLVABLE, TIMEOUT
+    and INVALID"""
+    try:
+        sudoku = Sudoku.Sudoku(puzzle)
+    except (Sudoku_Errors.InvalidPuzzleException, ValueError):
+        return Sudoku_Batch.INVALID
+
+    budget = Sudoku_Budget.Budget(timeout) if timeout is not None else None
+    count = sudoku.count_solutions(2, strategy, budget=budget)
+    if count is Sudoku.BUDGET_EXCEEDED:
+        return Sudoku_Batch.TIMEOUT
+    return {0: Sudoku_Batch.UNSOLVABLE, 1: UNIQUE}.get(count, MULTIPLE)
+
+
+class _Request_Error(Exception):
+    """Raised while handling a request to answer it with an HTTP error status"""
+
+    def __init__(self, status, message):
+        self.status = status
+        self.message = message
+
+
+
+class Solve_Server():
+    """
+    RI: 0 <= pending <= queue_limit. pending counts the requests waiting for or
+    holding one of the 2*workers slots of the pool.
+
+    AF(workers, queue_limit, pending): A server solving, checking and generating
+    puzzles in a pool of workers processes, with pending requests in progress.
+
+    Safety From Rep Exposure: Responses are new JSON documents, and the pool and
+    server are never returned.
+    """
+
+    def __init__(self, workers=None, queue_limit=64, max_timeout=30.0, max_body=1 << 20):
+        """Makes a server, which starts listening once start is awaited.
+
+        workers = An integer number of worker processes, or None for one per CPU
+        queue_limit = An integer number of requests that can wait or run at once
+        max_timeout = A number of seconds no search is allowed to run longer than
+        max_body = An integer number of bytes a request body can have"""
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_limit = queue_limit
+        self.max_timeout = max_timeout
+        self.max_body = max_body
+        self.pending = 0
+        self.served = 0
+        self.rejected = 0
+        self._pool = None
+        self._server = None
+        self._slots = None
+
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Starts the worker pool and listens on host and port, where port 0
+        picks a free port.
+
+        return: The integer port listened on"""
+        self._pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+        self._slots = asyncio.Semaphore(2*self.workers)
+        self._server = await asyncio.start_server(self._connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+
+    async def serve_forever(self):
+        """Serves requests until cancelled"""
+        async with self._server:
+            await self._server.serve_forever()
+
+
+    async def close(self):
+        """Stops listening and shuts the worker pool down"""
+        self._server.close()
+        await self._server.wait_closed()
+        self._pool.shutdown()
+
+
+    async def _run(self, function, *args):
+        """Runs function(*args) in the worker pool once a slot is free, raising
+        a 503 error instead if queue_limit requests are already pending"""
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            raise _Request_Error(503, "Too many requests in progress, try again later")
+        self.pending += 1
+        try:
+            async with self._slots:
+                return await asyncio.get_running_loop().run_in_executor(self._pool, function, *args)
+        finally:
+            self.pending -= 1
+
+
+    async def _connection(self, reader, writer):
+        """Answers the requests sent on one connection, keeping it open between
+        requests unless the client asks to close it"""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, response = 200, await self._route(method, path, body)
+                except _Request_Error as error:
+                    status, response = error.status, {"error": error.message}
+                except Exception as error:
+                    # Answer a request that failed unexpectedly rather than dropping
+                    # the connection without a response
+                    status, response = 500, {"error": "{}: {}".format(type(error).__name__, error)}
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                self.served += 1
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except _Request_Error as error:
+            # The request could not be read, so the connection cannot be reused
+            self._write_response(writer, error.status, {"error": error.message}, False)
+            self.served += 1
+        finally:
+            writer.close()
+
+
+    async def _read_request(self, reader):
+        """Reads one HTTP request.
+        return: A tuple (method, path, headers, body), or None once the client
+        closes the connection"""
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise _Request_Error(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _Request_Error(400, "Malformed Content-Length")
+        if length > self.max_body:
+            raise _Request_Error(413, "Request body larger than {} bytes".format(self.max_body))
+        body = await reader.readexactly(length) if length else b""
+        return parts[0].upper(), parts[1], headers, body
+
+
+    def _write_response(self, writer, status, response, keep_alive):
+        """Writes a JSON response with the given HTTP status code"""
+        body = json.dumps(response).encode()
+        head = ["HTTP/1.1 {} {}".format(status, _REASONS[status]),
+                "Content-Type: application/json",
+                "Content-Length: {}".format(len(body)),
+                "Connection: {}".format("keep-alive" if keep_alive else "close")]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+
+    async def _route(self, method, path, body):
+        """Answers a request to one of the endpoints.
+        return: A dictionary of the JSON response"""
+        if path == "/health":
+            return {"workers": self.workers, "pending": self.pending, "queue_limit": self.queue_limit,
+                    "served": self.served, "rejected": self.rejected}
+        if path not in ("/solve", "/unique", "/generate"):
+            raise _Request_Error(404, "Unknown endpoint {}".format(path))
+        if method != "POST":
+            raise _Request_Error(405, "Endpoint {} only accepts POST".format(path))
+
+        try:
+            request = json.loads(body.decode() or "{}")
+        except ValueError:
+            raise _Request_Error(400, "Request body is not valid JSON")
+        if not isinstance(request, dict):
+            raise _Request_Error(400, "Request body must be a JSON object")
+
+        timeout = request.get("timeout", self.max_timeout)
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise _Request_Error(400, "timeout must be a positive number of seconds")
+        timeout = min(timeout, self.max_timeout)
+
+        if path == "/generate":
+            sl = request.get("sl", 9)
+            if isinstance(sl, bool) or not isinstance(sl, int) or not 1 <= sl <= MAX_SL or int(sl**0.5)**2 != sl:
+                raise _Request_Error(400, "sl must be a square integer side length from 1 to {}".format(MAX_SL))
+            seed = request.get("seed", 0)
+            if isinstance(seed, bool) or not isinstance(seed, int):
+                raise _Request_Error(400, "seed must be an integer")
+            clues = request.get("clues")
+            if clues is not None and (isinstance(clues, bool) or not isinstance(clues, int)):
+                raise _Request_Error(400, "clues must be an integer or null")
+            result = await self._run(Sudoku_Farm.generate_one, sl, 0, seed, timeout, 1, clues)
+            if result.status != Sudoku_Farm.GENERATED:
+                return {"status": result.status, "puzzle": None}
+            return {"status": result.status, "seed": result.seed, "puzzle": self._grid(result.puzzle)}
+
+        strategy = request.get("strategy", Sudoku.DLX)
+        if strategy not in Sudoku.STRATEGIES:
+            raise _Request_Error(400, "strategy must be one of {}".format(list(Sudoku.STRATEGIES)))
+        try:
+            puzzle = Sudoku_IO.parse_line(str(request.get("puzzle", "")))
+        except Sudoku_Errors.InvalidPuzzleException:
+            puzzle = None
+        if puzzle is not None and len(puzzle.split()) > MAX_SL**2:
+            raise _Request_Error(400, "puzzle must have a side length of at most {}".format(MAX_SL))
+
+        if path == "/solve":
+            status, solution = Sudoku_Batch.INVALID, None
+            if puzzle is not None:
+                status, solution = await self._run(Sudoku_Batch.solve_one, puzzle, strategy, timeout)
+            return {"status": status, "solution": solution}
+        if puzzle is None:
+            return {"status": Sudoku_Batch.INVALID}
+        return {"status": await self._run(check_one, puzzle, strategy, timeout)}
+
+
+    def _grid(self, puzzle):
+        """Returns a puzzle string in the format Sudoku accepts as a list of rows of integers"""
+        values = [int(value) for value in puzzle.split()]
+        sl = int(len(values)**0.5)
+        return [values[row*sl:(row+1)*sl] for row in range(sl)]
+
+
+
+def main(argv=None):
+    """Runs the server from the command line until interrupted"""
+    parser = argparse.ArgumentParser(description="Serve Sudoku solving and generation over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, one per CPU by default")
+    parser.add_argument("--queue-limit", type=int, default=64, help="requests waiting or running before 503s")
+    parser.add_argument("--max-timeout", type=float, default=30.0, help="longest a search may run, in seconds")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = Solve_Server(args.workers, args.queue_limit, args.max_timeout)
+        port = await server.start(args.host, args.port)
+        print("Serving on http://{}:{} with {} workers".format(args.host, port, server.workers))
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import asyncio
+import Sudoku
+import Sudoku_Batch
+import Sudoku_Client
+import Sudoku_Server
+import unittest
+
+class Test_Solve_Server(unittest.TestCase):
+
+    easy = '4 0 3 2 0 3 0 1 3 2 0 0 0 4 0 3'
+    empty = '0 '*16
+    unsolvable = '1 2 0 0 0 0 0 3 0 0 0 0 0 0 0 0'
+
+    def serve(self, test, **options):
+        """Runs the coroutine function test(client, server) against a new server on a free port"""
+        async def run():
+            server = Sudoku_Server.Solve_Server(workers=1, **options)
+            port = await server.start("127.0.0.1", 0)
+            client = Sudoku_Client.Client("127.0.0.1", port)
+            try:
+                await test(client, server)
+            finally:
+                await client.close()
+                await server.close()
+        asyncio.run(run())
+
+    def test_solve(self):
+        async def test(client, server):
+            status, response = await client.request("POST", "/solve", {"puzzle": "4.32.3.132...4.3", "strategy": "mrv"})
+            expected = Sudoku.Sudoku(self.easy)
+            expected.solve_sudoku()
+            self.assertEqual(status, 200, "expected a successful solve")
+            self.assertEqual(response, {"status": Sudoku_Batch.SOLVED,
+                "solution": [[int(v) for v in row] for row in expected.get_puzzle()]},
+                "expected the solution of solve_sudoku")
+
+            status, response = await client.request("POST", "/solve", {"puzzle": "1 1 0 0"})
+            self.assertEqual((status, response["status"]), (200, Sudoku_Batch.INVALID), "expected an invalid puzzle")
+        self.serve(test)
+
+    def test_unique(self):
+        async def test(client, server):
+            for puzzle, expected in [(self.easy, Sudoku_Server.UNIQUE), (self.empty, Sudoku_Server.MULTIPLE),
+                                     (self.unsolvable, Sudoku_Batch.UNSOLVABLE)]:
+                status, response = await client.request("POST", "/unique", {"puzzle": puzzle})
+                self.assertEqual((status, response["status"]), (200, expected),
+                    "unexpected uniqueness of puzzle {}".format(puzzle))
+        self.serve(test)
+
+    def test_check_one(self):
+        self.assertEqual(Sudoku_Server.check_one(self.easy), Sudoku_Server.UNIQUE, "expected a unique puzzle")
+        self.assertEqual(Sudoku_Server.check_one(self.empty), Sudoku_Server.MULTIPLE, "expected many solutions")
+        self.assertEqual(Sudoku_Server.check_one(self.unsolvable), Sudoku_Batch.UNSOLVABLE, "expected no solutions")
+        self.assertEqual(Sudoku_Server.check_one('1 1 0 0'), Sudoku_Batch.INVALID, "expected an invalid puzzle")
+        self.assertEqual(Sudoku_Server.check_one('0 '*256, Sudoku.ROW_MAJOR, 0.0), Sudoku_Batch.TIMEOUT,
+            "expected an immediate timeout")
+
+    def test_generate(self):
+        async def test(client, server):
+            status, response = await client.request("POST", "/generate", {"sl": 4, "seed": 3})
+            self.assertEqual((status, response["status"]), (200, "generated"), "expected a generated puzzle")
+            puzzle = Sudoku.Sudoku(' '.join(str(v) for row in response["puzzle"] for v in row))
+            self.assertTrue(puzzle.is_one_sol(), "expected a generated puzzle with one solution")
+
+            status, again = await client.request("POST", "/generate", {"sl": 4, "seed": 3})
+            self.assertEqual(again, response, "expected the same puzzle from the same seed")
+
+            status, response = await client.request("POST", "/generate", {"sl": 5})
+            self.assertEqual(status, 400, "expected a non-square side length to be rejected")
+            for sl in [0, 49, 256, 10000]:
+                status, response = await client.request("POST", "/generate", {"sl": sl})
+                self.assertEqual(status, 400, "expected side length {} to be rejected".format(sl))
+            for option in ["sl", "seed", "clues", "timeout"]:
+                status, response = await client.request("POST", "/generate", {option: True})
+                self.assertEqual(status, 400, "expected a boolean {} to be rejected".format(option))
+        self.serve(test)
+
+    def test_solve_bounds(self):
+        async def test(client, server):
+            for path in ["/solve", "/unique"]:
+                status, response = await client.request("POST", path, {"puzzle": "0 "*49**2, "timeout": 1})
+                self.assertEqual(status, 400, "expected a 49x49 puzzle to be rejected by {}".format(path))
+                status, response = await client.request("POST", path, {"puzzle": "0 "*36**2, "timeout": 1})
+                self.assertEqual(status, 200, "expected a 36x36 puzzle to be accepted by {}".format(path))
+        self.serve(test)
+
+    def test_errors(self):
+        async def test(client, server):
+            self.assertEqual((await client.request("POST", "/nowhere", {}))[0], 404, "expected an unknown endpoint")
+            self.assertEqual((await client.request("GET", "/solve"))[0], 405, "expected POST only")
+            self.assertEqual((await client.request("POST", "/solve", [1]))[0], 400, "expected an object body")
+            self.assertEqual((await client.request("POST", "/solve", {"puzzle": self.easy, "timeout": -1}))[0], 400,
+                "expected a negative timeout to be rejected")
+            self.assertEqual((await client.request("POST", "/solve", {"puzzle": self.easy, "strategy": "x"}))[0], 400,
+                "expected an unknown strategy to be rejected")
+            self.assertEqual((await client.request("POST", "/solve", {"puzzle": "0"*100}))[0], 413,
+                "expected a body over max_body to be rejected")
+            status, response = await client.request("GET", "/health")
+            self.assertEqual((status, response["served"]), (200, 6), "expected every request to be counted")
+        self.serve(test, max_body=64)
+
+    def test_internal_error(self):
+        async def test(client, server):
+            async def fail(method, path, body):
+                raise ValueError("byte must be in range(0, 256)")
+            route, server._route = server._route, fail
+            status, response = await client.request("POST", "/solve", {"puzzle": self.easy})
+            self.assertEqual((status, response), (500, {"error": "ValueError: byte must be in range(0, 256)"}),
+                "expected an unexpected failure answered with a 500")
+
+            server._route = route
+            status, response = await client.request("POST", "/solve", {"puzzle": self.easy})
+            self.assertEqual((status, response["status"]), (200, Sudoku_Batch.SOLVED),
+                "expected the connection kept open after a 500")
+        self.serve(test)
+
+    def test_queue_limit(self):
+        async def test(client, server):
+            status, response = await client.request("POST", "/solve", {"puzzle": self.easy})
+            self.assertEqual(status, 503, "expected requests over the queue limit to be rejected")
+            status, response = await client.request("GET", "/health")
+            self.assertEqual((status, response["rejected"], response["pending"]), (200, 1, 0),
+                "expected the rejection to be counted and nothing left pending")
+        self.serve(test, queue_limit=0)
+
+    def test_load_test(self):
+        async def test(client, server):
+            payloads = Sudoku_Client.corpus_payloads("/solve", (4,))
+            report = await Sudoku_Client.load_test(payloads, "127.0.0.1", client.port, "/solve", 20, 4)
+            self.assertEqual(report.statuses, {200: 20}, "expected every request to succeed")
+            self.assertTrue(0 < report.p50 <= report.p90 <= report.p99 <= report.max,
+                "expected ordered latency percentiles")
+        self.serve(test, queue_limit=8)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
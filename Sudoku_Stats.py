@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Statistics gathered from the solvers and generator while they search, to see
+where the time of a slow puzzle goes. Searches only gather them when a
+Search_Stats object is attached to the Sudoku object as its stats attribute,
+or passed to Create_Sudoku.create, so they cost nothing otherwise.
+"""
+
+# The events passed to a trace function
+PLACE = "place"
+BACKTRACK = "backtrack"
+
+
+class Search_Stats():
+    """
+    RI: Every count is a non-negative integer, and both times are non-negative
+    numbers of seconds. depth_histogram[depth] is the number of nodes placed
+    at that depth, so sum(depth_histogram) == nodes, and max_depth is
+    len(depth_histogram) with no trailing zeros.
+
+    AF(...): The totals of every search run with these statistics attached
+    since they were made or last reset, where a node is a value tried in a
+    square (a row of the exact cover matrix for DLX), and the depth of a node
+    is the number of values the search had already placed when trying it.
+
+    Safety From Rep Exposure: as_dict returns a new dictionary with a copy of
+    depth_histogram.
+    """
+
+    def __init__(self, trace=None):
+        """Makes empty statistics.
+
+        trace = A function called as trace(event, depth, move) for every
+            node placed (PLACE) and every square or column the search runs out
+            of values for (BACKTRACK), where move is the (row, col, value) of
+            the node, or None to only count them"""
+        self.trace = trace
+        self.reset()
+
+
+    def reset(self):
+        """Sets every count and time back to zero"""
+        # Searches run, and the nodes, backtracks and depths within them
+        self.searches = 0
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.depth_histogram = []
+
+        # Square checks: valid_square calls, and candidate lookups by the search
+        self.valid_square_calls = 0
+        self.candidate_checks = 0
+
+        # Seconds spent in constraint propagation, and in searching after it
+        self.propagation_seconds = 0.0
+        self.branching_seconds = 0.0
+
+        # Edits made with Sudoku.insert and uniqueness checks, as made by
+        # Create_Sudoku.create
+        self.inserts = 0
+        self.removals = 0
+        self.uniqueness_checks = 0
+
+
+    def placed(self, depth, move):
+        """Counts a node placed at depth by a search"""
+        self.nodes += 1
+        if depth >= self.max_depth:
+            self.depth_histogram.extend([0]*(depth + 1 - self.max_depth))
+            self.max_depth = depth + 1
+        self.depth_histogram[depth] += 1
+        if self.trace is not None:
+            self.trace(PLACE, depth, move)
+
+
+    def backtracked(self, depth, move):
+        """Counts a search running out of values at depth, after trying move last"""
+        self.backtracks += 1
+        if self.trace is not None:
+            self.trace(BACKTRACK, depth, move)
+
+
+    def as_dict(self):
+        """Returns the statistics as a dictionary, such as for writing as JSON"""
+        return {"searches": self.searches,
+                "nodes": self.nodes,
+                "backtracks": self.backtracks,
+                "max_depth": self.max_depth,
+                "depth_histogram": list(self.depth_histogram),
+                "valid_square_calls": self.valid_square_calls,
+                "candidate_checks": self.candidate_checks,
+                "propagation_seconds": self.propagation_seconds,
+                "branching_seconds": self.branching_seconds,
+                "inserts": self.inserts,
+                "removals": self.removals,
+                "uniqueness_checks": self.uniqueness_checks}
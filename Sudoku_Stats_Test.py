@@ -0,0 +1,65 @@
+import random
+import Sudoku
+import Sudoku_Stats
+import unittest
+
+class Test_Search_Stats(unittest.TestCase):
+
+    hard = '0 0 0 6 0 0 4 0 0 ' +\
+           '7 0 0 0 0 3 6 0 0 ' +\
+           '0 0 0 0 9 1 0 8 0 ' +\
+           '0 0 0 0 0 0 0 0 0 ' +\
+           '0 5 0 1 8 0 0 0 3 ' +\
+           '0 0 0 3 0 6 0 4 5 ' +\
+           '0 4 0 2 0 0 0 6 0 ' +\
+           '9 0 3 0 0 0 0 0 0 ' +\
+           '0 2 0 0 0 0 1 0 0'
+
+    def test_disabled(self):
+        puzzle = Sudoku.Sudoku(self.hard)
+        self.assertIsNone(puzzle.stats, "expected no statistics gathered by default")
+        self.assertIsNone(puzzle.copy().stats, "expected copies not to share statistics")
+
+    def test_strategies(self):
+        for strategy in Sudoku.STRATEGIES:
+            events = []
+            puzzle = Sudoku.Sudoku(self.hard)
+            puzzle.stats = Sudoku_Stats.Search_Stats(lambda event, depth, move: events.append(event))
+            self.assertTrue(puzzle.is_one_sol(strategy=strategy), "expected one solution with {}".format(strategy))
+
+            stats = puzzle.stats
+            self.assertEqual(stats.nodes, puzzle.nodes, 
+                "expected {} nodes with {}, instead got {}".format(puzzle.nodes, strategy, stats.nodes))
+            self.assertEqual(sum(stats.depth_histogram), stats.nodes, "expected every node in the depth histogram")
+            self.assertEqual(stats.max_depth, len(stats.depth_histogram), "expected the histogram to reach the max depth")
+            self.assertTrue(stats.backtracks > 0, "expected backtracking on a hard puzzle with {}".format(strategy))
+            self.assertEqual((stats.searches, stats.uniqueness_checks), (1, 1), "expected one search and uniqueness check")
+            self.assertTrue(stats.propagation_seconds > 0 and stats.branching_seconds > 0, "expected both times measured")
+            self.assertEqual(events.count(Sudoku_Stats.PLACE), stats.nodes, "expected a trace event for each node")
+            self.assertEqual(events.count(Sudoku_Stats.BACKTRACK), stats.backtracks, "expected a trace event for each backtrack")
+
+    def test_edits(self):
+        puzzle = Sudoku.Sudoku(self.hard)
+        puzzle.stats = Sudoku_Stats.Search_Stats()
+        puzzle.insert(0, 0, 1)
+        puzzle.insert(0, 1, 6)
+        puzzle.insert(0, 0, 0)
+        stats = puzzle.stats.as_dict()
+        self.assertEqual((stats["inserts"], stats["removals"], stats["valid_square_calls"]), (1, 1, 3),
+            "expected one insert, one removal and three valid_square calls, instead got {}".format(stats))
+        puzzle.stats.reset()
+        self.assertEqual(puzzle.stats.inserts, 0, "expected reset to clear the counts")
+
+    def test_create(self):
+        random.seed(18)
+        for mode in Sudoku.MODES:
+            stats = Sudoku_Stats.Search_Stats()
+            puzzle = Sudoku.Create_Sudoku(4).create(mode=mode, stats=stats)
+            self.assertIsNone(puzzle.stats, "expected statistics not to stay attached to the puzzle")
+            self.assertTrue(stats.uniqueness_checks > 0 and stats.searches > 0, 
+                "expected uniqueness checks and searches counted with {}, instead got {}".format(mode, stats.as_dict()))
+            self.assertTrue(stats.inserts + stats.removals > 0, "expected edits counted with {}".format(mode))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
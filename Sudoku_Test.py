@@ -1,4 +1,6 @@
 import Sudoku
+import random
+import sys
 import unittest
 import Sudoku_Errors
 
@@ -53,6 +55,17 @@ class TestRender(unittest.TestCase):
         self.assertEqual(result, expected, "expected an incomplete 9x9 rendered board")
 
 
+    def test_render_board(self):
+        for puzzle in ['0 0 3 4 0 3 0 1 3 4 0 0 0 1 0 3', '16 ' + '0 '*254 + '1', '25 ' + '0 '*623 + '9']:
+            sudoku = Sudoku.Sudoku(puzzle)
+            expected = Sudoku.render(sudoku.get_puzzle())
+            self.assertEqual(Sudoku.render(sudoku.puzzle), expected,
+                "expected a {}x{} Board rendered like its get_puzzle".format(sudoku.sl, sudoku.sl))
+            self.assertEqual(Sudoku.render(sudoku.view()), expected, "expected a read-only view rendered the same")
+        self.assertEqual(Sudoku.render(Sudoku.Sudoku('0 '*255 + '16').puzzle).splitlines()[-2][-4:], "|16|",
+            "expected two digit values in the last square")
+
+
     def test_solved_render_1x1(self):
         board = [['1']]
         result = Sudoku.render(board)
@@ -133,6 +146,63 @@ class Test_Sudoku_Constructor(unittest.TestCase):
 
 
 
+class Test_Sudoku_Board(unittest.TestCase):
+
+    def test_view(self):
+        board = '0 0 3 4 0 3 0 1 3 4 0 0 0 1 0 3'
+        puzzle = Sudoku.Sudoku(board)
+        view = puzzle.view()
+        self.assertEqual([[str(value) for value in row] for row in view], puzzle.get_puzzle(),
+            "expected view to hold the same values as get_puzzle")
+        self.assertEqual(Sudoku.render(view), Sudoku.render(puzzle.get_puzzle()),
+            "expected render to work on a view directly")
+
+        # The view shares memory with the puzzle, so it sees later inserts
+        puzzle.insert(0, 0, 1)
+        self.assertEqual(view[0][0], 1, "expected view to reflect an insert")
+        self.assertEqual(view[-1][1], 1, "expected negative row index to count from the end")
+        with self.assertRaises(TypeError):
+            view[0][1] = 2
+
+    def test_board_copy(self):
+        board = Sudoku.Board(4)
+        board[1][2] = 3
+        copy = board.copy()
+        copy[1][2] = 4
+        self.assertEqual(board.cells[6], 3, "expected writes through a row to set the square")
+        self.assertEqual(copy.cells[6], 4, "expected copy to be independent of the board")
+        with self.assertRaises(AttributeError):
+            board.other = 1
+
+
+
+class Test_Sudoku_Factories(unittest.TestCase):
+
+    def test_from_values(self):
+        board = '0 0 3 4 0 3 0 1 3 4 0 0 0 1 0 3'
+        values = [int(value) for value in board.split()]
+        expected = Sudoku.Sudoku(board).get_puzzle()
+        for source in [values, bytes(values), Sudoku.Sudoku(board).view()]:
+            puzzle = Sudoku.Sudoku.from_values(source)
+            self.assertEqual(puzzle.get_puzzle(), expected, "expected from_values to load {}".format(source))
+            self.assertEqual(puzzle.candidates(0, 0), [1, 2], "expected from_values to build the bitmasks")
+
+    def test_from_values_invalid(self):
+        for invalid in [[1, 0], [-1], [2, 1, 1, 2], [1, 2, 3, 4, 4, 3, 2, 3, 3, 4, 1, 2, 2, 1, 4, 3],
+                        [1, 2, 3, 4, 4, 3, 2, 1, 3, 4, 1, 2, 2, 1, 4, 5]]:
+            with self.assertRaises(Sudoku_Errors.InvalidPuzzleException):
+                Sudoku.Sudoku.from_values(invalid)
+
+    def test_copy(self):
+        puzzle = Sudoku.Sudoku('0 0 3 4 0 3 0 1 3 4 0 0 0 1 0 3')
+        copy = puzzle.copy()
+        copy.insert(0, 0, 2)
+        self.assertEqual(puzzle.get_puzzle()[0][0], '0', "expected the original to be unchanged by inserts on a copy")
+        self.assertEqual(puzzle.candidates(0, 1), [2], "expected the original bitmasks unchanged")
+        self.assertEqual(copy.candidates(0, 1), [], "expected the copy's bitmasks to follow its inserts")
+
+
+
 class Test_Sudoku_Valid_Square(unittest.TestCase):
 
     def check_square_valid_value(self, board, rows, cols, vals, is_valid=True):
@@ -204,6 +274,40 @@ class Test_Sudoku_Valid_Square(unittest.TestCase):
 
 
 
+class Test_Sudoku_Candidates(unittest.TestCase):
+
+    def test_candidates_4x4(self):
+        board = '0 0 3 4 ' +\
+                '0 3 0 1 ' +\
+                '3 4 0 0 ' +\
+                '0 1 0 3'
+        puzzle = Sudoku.Sudoku(board)
+        self.assertEqual(puzzle.candidates(0, 0), [1, 2], "expected candidates [1, 2] for square (0, 0)")
+        self.assertEqual(puzzle.candidates(2, 3), [2], "expected candidates [2] for square (2, 3)")
+        self.assertEqual(puzzle.candidates(0, 2), [], "expected no candidates for a filled square")
+        self.assertEqual(puzzle.num_candidates(0, 0), 2, "expected 2 candidates for square (0, 0)")
+
+    def test_candidates_match_valid_square(self):
+        board = "9 7 0 0 0 0 0 0 0 " + \
+                "4 0 0 8 0 0 0 0 0 " + \
+                "0 0 0 0 4 0 7 0 0 " + \
+                "0 0 0 0 9 0 6 0 0 " + \
+                "0 0 0 2 0 0 0 3 0 " + \
+                "0 0 0 0 0 1 0 0 8 " + \
+                "0 4 0 0 6 0 9 0 0 " + \
+                "0 0 5 0 0 0 0 0 0 " + \
+                "0 0 0 0 0 3 0 0 1"
+        puzzle = Sudoku.Sudoku(board)
+        puzzle.insert(4, 4, 5)
+        puzzle.insert(0, 0, 0)
+        for row in range(9):
+            for col in range(9):
+                expected = [v for v in range(1, 10) if puzzle.valid_square(row, col, v)]
+                self.assertEqual(puzzle.candidates(row, col), expected,
+                    "expected candidates at ({}, {}) to match valid_square".format(row, col))
+
+
+
 class Test_Sudoku_Solve(unittest.TestCase):
 
     def check_puzzle_solved(self, board, solution_expected=None):
@@ -308,6 +412,66 @@ class Test_Sudoku_Solve(unittest.TestCase):
 
 
 
+class Test_Sudoku_Strategies(unittest.TestCase):
+
+    boards = ['4 0 3 2 0 3 0 1 3 2 0 0 0 4 0 3',
+              '1 2 0 0 3 4 0 0 0 0 0 0 0 0 0 0',
+              '0 0 3 0 1 2 0 0 0 4 2 3 0 1 0 0',
+              '0 0 0 6 0 0 4 0 0 7 0 0 0 0 3 6 0 0 0 0 0 0 9 1 0 8 0 ' +\
+              '0 0 0 0 0 0 0 0 0 0 5 0 1 8 0 0 0 3 0 0 0 3 0 6 0 4 5 ' +\
+              '0 4 0 2 0 0 0 6 0 9 0 3 0 0 0 0 0 0 0 2 0 0 0 0 1 0 0']
+
+    def test_strategies_match_row_major(self):
+        for board in self.boards:
+            for method in ['is_solvable', 'is_one_sol']:
+                expected = getattr(Sudoku.Sudoku(board), method)()
+                for strategy in [Sudoku.MRV, Sudoku.DLX]:
+                    puzzle = Sudoku.Sudoku(board)
+                    result = getattr(puzzle, method)(strategy=strategy)
+                    self.assertEqual(result, expected, "expected {} {} to match row-major on \n{}".format(
+                        strategy, method, Sudoku.render(puzzle.get_puzzle())))
+                    self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(board).get_puzzle(),
+                        "expected puzzle to not be mutated by {} {}".format(strategy, method))
+
+    def test_strategies_solve(self):
+        for board in self.boards:
+            for strategy in [Sudoku.MRV, Sudoku.DLX]:
+                puzzle = Sudoku.Sudoku(board)
+                solved = puzzle.solve_sudoku(strategy=strategy)
+                self.assertEqual(solved, Sudoku.Sudoku(board).is_solvable(), "expected {} solve to match is_solvable".format(strategy))
+                if solved:
+                    self.assertTrue(puzzle.is_solved(), "expected {} to solve \n{}".format(strategy, Sudoku.render(puzzle.get_puzzle())))
+                else:
+                    self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(board).get_puzzle(),
+                        "expected unsolvable puzzle to not be mutated by {} solve".format(strategy))
+
+    def test_mrv_fewer_nodes(self):
+        board = self.boards[3]
+        row_major = Sudoku.Sudoku(board)
+        row_major.solve_sudoku()
+        mrv = Sudoku.Sudoku(board)
+        mrv.solve_sudoku(strategy=Sudoku.MRV)
+        self.assertTrue(0 < mrv.nodes < row_major.nodes, "expected MRV to visit fewer nodes than row-major")
+
+    def test_no_recursion_limit(self):
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            for sl, strategy in [(9, Sudoku.ROW_MAJOR), (25, Sudoku.MRV), (25, Sudoku.DLX)]:
+                puzzle = Sudoku.Sudoku("0 "*(sl**2))
+                self.assertTrue(puzzle.solve_sudoku(strategy=strategy, propagate=False),
+                    "expected empty {0}x{0} puzzle solved with {1}".format(sl, strategy))
+                self.assertTrue(puzzle.is_solved(), "expected a valid {0}x{0} solution".format(sl))
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def test_invalid_strategy(self):
+        puzzle = Sudoku.Sudoku('0 '*16)
+        with self.assertRaises(Sudoku_Errors.InvalidStrategyException):
+            puzzle.solve_sudoku(strategy="random")
+
+
+
 class Test_Sudoku_Insert(unittest.TestCase):
 
     def test_insert(self):
@@ -416,6 +580,127 @@ class Test_Sudoku_One_Solution(unittest.TestCase):
         puzzle = Sudoku.Sudoku(board)
         self.check_puzzle_one_sol(board, puzzle, False, False) 
 
+class Test_Sudoku_Count_Solutions(unittest.TestCase):
+    # 12 solutions, checked by brute force
+    board = '1 2 0 0 3 4 0 0 0 0 0 0 0 0 0 0'
+
+    def test_count_strategies(self):
+        for strategy in Sudoku.STRATEGIES:
+            for propagate in [True, False]:
+                puzzle = Sudoku.Sudoku(self.board)
+                count = puzzle.count_solutions(strategy=strategy, propagate=propagate)
+                self.assertEqual(count, 12, 
+                    "expected 12 solutions with {}, instead got {}".format(strategy, count))
+                self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(self.board).get_puzzle(),
+                    "expected puzzle to not be mutated after count_solutions with {}".format(strategy))
+
+    def test_count_limit(self):
+        for strategy in Sudoku.STRATEGIES:
+            count = Sudoku.Sudoku(self.board).count_solutions(5, strategy)
+            self.assertEqual(count, 5, "expected count to stop at 5 with {}, instead got {}".format(strategy, count))
+        count = Sudoku.Sudoku('0 0 3 0 1 2 0 0 0 4 2 3 0 1 0 0').count_solutions()
+        self.assertEqual(count, 0, "expected no solutions, instead got {}".format(count))
+
+    def test_iter_solutions(self):
+        for strategy in Sudoku.STRATEGIES:
+            puzzle = Sudoku.Sudoku(self.board)
+            solutions = [bytes(solution.cells) for solution in puzzle.iter_solutions(strategy=strategy)]
+            self.assertEqual(len(set(solutions)), 12, 
+                "expected 12 different solutions with {}, instead got {}".format(strategy, len(set(solutions))))
+            for solution in solutions:
+                self.assertTrue(Sudoku.Sudoku.from_values(solution).is_solved(),
+                    "expected each solution to be solved with {}".format(strategy))
+
+    def test_iter_early_stop(self):
+        puzzle = Sudoku.Sudoku(self.board)
+        solutions = puzzle.iter_solutions()
+        first = next(solutions)
+        solutions.close()
+        self.assertEqual(first[0].tolist(), [1, 2, 3, 4], 
+            "expected the first row-major solution to start 1 2 3 4, instead got {}".format(first[0].tolist()))
+        self.assertEqual(puzzle.get_puzzle(), Sudoku.Sudoku(self.board).get_puzzle(),
+            "expected puzzle to be restored after closing iter_solutions")
+        self.assertEqual(len(list(puzzle.iter_solutions(limit=3))), 3, "expected 3 solutions with limit 3")
+
+    def test_iter_invalid_strategy(self):
+        puzzle = Sudoku.Sudoku(self.board)
+        self.assertRaises(Sudoku_Errors.InvalidStrategyException, puzzle.iter_solutions, strategy="bfs")
+
+class Test_Sudoku_Incremental(unittest.TestCase):
+    board = '9 6 0 0 0 8 3 7 0 ' +\
+            '0 2 0 4 0 3 9 0 1 ' +\
+            '0 3 4 0 1 0 0 0 6 ' +\
+            '6 0 0 0 0 0 7 0 0 ' +\
+            '0 5 9 0 0 0 6 1 0 ' +\
+            '0 0 7 0 0 0 0 0 5 ' +\
+            '1 0 0 0 2 0 4 3 0 ' +\
+            '5 0 3 9 0 4 0 6 0 ' +\
+            '0 9 2 1 0 0 0 5 7'
+
+    def setUp(self):
+        self.puzzle = Sudoku.Sudoku(self.board)
+        self.puzzle.set_incremental()
+        self.assertTrue(self.puzzle.is_one_sol(), "expected puzzle to have one solution")
+        self.solution = Sudoku.Sudoku(self.board)
+        self.solution.solve_sudoku()
+
+    def test_consistent_insert(self):
+        self.puzzle.insert(0, 2, self.solution.view()[0][2])
+        self.assertTrue(self.puzzle.is_one_sol(), "expected one solution after a consistent insert")
+        self.assertEqual(self.puzzle.nodes, 0, 
+            "expected no search after a consistent insert, instead got {} nodes".format(self.puzzle.nodes))
+
+    def test_inconsistent_insert(self):
+        value = [v for v in self.puzzle.candidates(0, 2) if v != self.solution.view()[0][2]][0]
+        self.puzzle.insert(0, 2, value)
+        self.assertFalse(self.puzzle.is_solvable(), "expected no solution after ruling out the only one")
+        self.assertEqual(self.puzzle.nodes, 0, "expected no search after ruling out the only solution")
+        self.puzzle.insert(0, 2, 0)
+        self.assertTrue(self.puzzle.is_one_sol(), "expected one solution after undoing the insert")
+
+    def test_removals(self):
+        fresh = Sudoku.Sudoku(self.board)
+        for row, col in [(0, 0), (4, 1), (8, 8), (2, 2), (1, 1)]:
+            self.puzzle.insert(row, col, 0)
+            fresh.insert(row, col, 0)
+            self.assertEqual(self.puzzle.is_one_sol(), fresh.is_one_sol(),
+                "expected the same uniqueness as a fresh check after removing ({}, {})".format(row, col))
+            self.assertTrue(self.puzzle.is_solvable(), "expected puzzle to stay solvable after a removal")
+
+    def test_removal_nodes(self):
+        # A puzzle propagation alone does not solve, so both checks need to search
+        hard = '...6..4..7....36......91.8...........5.18...3...3.6.45.4.2...6.9.3.......2....1..'
+        for strategy in Sudoku.STRATEGIES:
+            puzzle = Sudoku.Sudoku(' '.join(hard.replace('.', '0')))
+            puzzle.set_incremental()
+            self.assertTrue(puzzle.is_one_sol(strategy=strategy), "expected puzzle to have one solution")
+            puzzle.insert(0, 3, 0)
+            fresh = Sudoku.Sudoku.from_values(puzzle.view())
+            self.assertEqual(puzzle.is_one_sol(strategy=strategy), fresh.is_one_sol(strategy=strategy),
+                "expected the same uniqueness as a fresh check with {}".format(strategy))
+            self.assertLess(puzzle.nodes, fresh.nodes,
+                "expected fewer nodes than a fresh check with {}, instead got {} and {}".format(
+                    strategy, puzzle.nodes, fresh.nodes))
+
+    def test_solve(self):
+        self.assertTrue(self.puzzle.solve_sudoku(), "expected puzzle to be solved from the cache")
+        self.assertEqual(self.puzzle.get_puzzle(), self.solution.get_puzzle(), "expected the cached solution")
+
+    def test_random_edits(self):
+        random.seed(14)
+        for _ in range(150):
+            row, col = random.randrange(9), random.randrange(9)
+            if self.puzzle.view()[row][col] and random.random() < 0.5:
+                value = 0
+            else:
+                value = random.randint(1, 9)
+            self.puzzle.insert(row, col, value)
+            fresh = Sudoku.Sudoku.from_values(self.puzzle.view())
+            self.assertEqual(self.puzzle.is_one_sol(), fresh.is_one_sol(),
+                "expected the same uniqueness as a fresh check on \n{}\n".format(Sudoku.render(self.puzzle.get_puzzle())))
+            self.assertEqual(self.puzzle.is_solvable(), fresh.is_solvable(),
+                "expected the same solvability as a fresh check on \n{}\n".format(Sudoku.render(self.puzzle.get_puzzle())))
+
 class Test_Create_Sudoku_Random(unittest.TestCase):
 
     def test_random_insertion_and_deletion(self):
@@ -474,6 +759,106 @@ class Test_Sudoku_Create(unittest.TestCase):
         puzzle = Sudoku.Create_Sudoku(9).create()
         self.check_one_sol_and_size(puzzle, 9)
 
+    def test_create_16x16(self):
+        puzzle = Sudoku.Create_Sudoku(16).create(clues=180)
+        self.check_one_sol_and_size(puzzle, 16)
+
+    def test_create_clues(self):
+        for clues in [30, 40]:
+            puzzle = Sudoku.Create_Sudoku(9).create(clues=clues)
+            self.check_one_sol_and_size(puzzle, 9)
+            result = sum(value != '0' for row in puzzle.get_puzzle() for value in row)
+            self.assertEqual(result, clues, "expected {} clues in created puzzle, instead got {}".format(clues, result))
+
+    def test_create_clue_range(self):
+        random.seed(4)
+        for _ in range(3):
+            puzzle = Sudoku.Create_Sudoku(9).create(clues=(24, 26))
+            self.check_one_sol_and_size(puzzle, 9)
+            result = sum(value != '0' for row in puzzle.get_puzzle() for value in row)
+            self.assertTrue(24 <= result <= 26, "expected 24 to 26 clues in created puzzle, instead got {}".format(result))
+
+    def test_create_difficulty(self):
+        import Sudoku_Grade
+        random.seed(6)
+        for difficulty in [Sudoku_Grade.EASY, Sudoku_Grade.MEDIUM]:
+            puzzle = Sudoku.Create_Sudoku(9).create(difficulty=difficulty)
+            self.check_one_sol_and_size(puzzle, 9)
+            self.assertEqual(Sudoku_Grade.Grader().grade(puzzle).level, difficulty,
+                "expected a puzzle graded {}, instead got \n{}\n".format(difficulty, Sudoku.render(puzzle.get_puzzle())))
+
+        with self.assertRaises(Sudoku_Errors.InvalidStrategyException):
+            Sudoku.Create_Sudoku(4).create(difficulty="impossible")
+
+    def test_create_difficulty_budget(self):
+        import Sudoku_Budget
+        import Sudoku_Grade
+        # 4x4 puzzles never need more than singles, so only the budget stops the search
+        result = Sudoku.Create_Sudoku(4).create(difficulty=Sudoku_Grade.HARD, budget=Sudoku_Budget.Budget(max_nodes=2000))
+        self.assertEqual(result, Sudoku.BUDGET_EXCEEDED, "expected an unreachable level to run out of budget")
+
+    def test_create_difficulty_propagates(self):
+        import Sudoku_Grade
+        import Sudoku_Stats
+        random.seed(5)
+        for difficulty in [Sudoku_Grade.EASY, Sudoku_Grade.HARD]:
+            stats = Sudoku_Stats.Search_Stats()
+            puzzle = Sudoku.Create_Sudoku(9).create(difficulty=difficulty, stats=stats)
+            self.check_one_sol_and_size(puzzle, 9)
+            self.assertEqual(Sudoku_Grade.Grader().grade(puzzle).level, difficulty,
+                "expected a puzzle graded {}, instead got \n{}\n".format(difficulty, Sudoku.render(puzzle.get_puzzle())))
+            self.assertTrue(stats.uniqueness_checks > 0 and stats.searches == 0,
+                "expected levels without search to be dug by propagation alone, instead got {} searches".format(stats.searches))
+
+    def check_symmetric(self, puzzle, symmetry):
+        filled = [[value != '0' for value in row] for row in puzzle.get_puzzle()]
+        sl = len(filled)
+        for row in range(sl):
+            for col in range(sl):
+                image = (sl-1 - row, sl-1 - col) if symmetry == Sudoku.ROTATIONAL else (row, sl-1 - col)
+                self.assertEqual(filled[row][col], filled[image[0]][image[1]],
+                    "expected a {} clue layout, instead got puzzle \n{}\n".format(symmetry, Sudoku.render(puzzle.get_puzzle())))
+
+    def test_create_symmetric(self):
+        random.seed(8)
+        for symmetry in Sudoku.SYMMETRIES:
+            for sl in [4, 9]:
+                puzzle = Sudoku.Create_Sudoku(sl).create(symmetry=symmetry)
+                self.check_one_sol_and_size(puzzle, sl)
+                self.check_symmetric(puzzle, symmetry)
+            puzzle = Sudoku.Create_Sudoku(4).create(mode=Sudoku.RANDOM_WALK, symmetry=symmetry)
+            self.check_one_sol_and_size(puzzle, 4)
+            self.check_symmetric(puzzle, symmetry)
+
+        puzzle = Sudoku.Create_Sudoku(9).create(clues=30, symmetry=Sudoku.ROTATIONAL)
+        result = sum(value != '0' for row in puzzle.get_puzzle() for value in row)
+        self.assertIn(result, (30, 31), "expected 30 clues, or 31 if only pairs were left, instead got {}".format(result))
+        with self.assertRaises(Sudoku_Errors.InvalidStrategyException):
+            Sudoku.Create_Sudoku(4).create(symmetry="diagonal")
+
+    def test_orbits(self):
+        creation = Sudoku.Create_Sudoku(9)
+        self.assertEqual(creation.orbits(Sudoku.ROTATIONAL)[1], (1, 79), "expected a square paired with its rotation")
+        self.assertEqual(creation.orbits(Sudoku.ROTATIONAL)[40], (40,), "expected the centre square alone")
+        self.assertEqual(creation.orbits(Sudoku.MIRROR)[9], (9, 17), "expected a square paired with its reflection")
+        self.assertEqual(set(creation.orbits().values()), set((ind,) for ind in range(81)),
+            "expected every square alone without symmetry")
+
+    def test_create_random_walk(self):
+        for _ in range(5):
+            puzzle = Sudoku.Create_Sudoku(4).create(mode=Sudoku.RANDOM_WALK)
+            self.check_one_sol_and_size(puzzle, 4)
+
+    def test_solution_grid(self):
+        for sl in [1, 4, 9, 16, 25]:
+            puzzle = Sudoku.Create_Sudoku(sl).solution_grid()
+            self.assertTrue(puzzle.is_solved(), "expected a solved puzzle, instead got \n{}\n".format(
+                Sudoku.render(puzzle.get_puzzle())))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(Sudoku_Errors.InvalidStrategyException):
+            Sudoku.Create_Sudoku(4).create(mode="shuffle")
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vectorized checking of many solved Sudoku grids at once with NumPy, in place of
+calling Sudoku.is_solved on each puzzle.
+"""
+import math
+import numpy as np
+import Sudoku_Errors
+
+
+def stack_grids(puzzles):
+    """Stacks Sudoku objects or Boards of the same side length into one array,
+    reading each board's bytes directly rather than through get_puzzle.
+
+    puzzles = An iterable of Sudoku objects or Boards
+
+    return: A (N, sl, sl) uint8 array of the values of each board"""
+    boards = [getattr(puzzle, "puzzle", puzzle) for puzzle in puzzles]
+    if not boards:
+        return np.zeros((0, 0, 0), dtype=np.uint8)
+    sl = boards[0].sl
+    return np.stack([np.frombuffer(board.cells, dtype=np.uint8) for board in boards]).reshape(-1, sl, sl)
+
+
+def validate_grids(grids, chunksize=4096):
+    """Checks a stack of grids for being solved: every square holding a value
+    from 1 to sl, with no value repeated in a row, column or box. Grids are
+    checked chunksize at a time, so memory use is bounded by the chunk size
+    rather than the number of grids.
+
+    grids = An array-like of shape (N, sl, sl) of integer square values
+    chunksize = An integer number of grids checked at once
+
+    return: A tuple (solved, first), where solved is a (N,) boolean array of
+    whether each grid is solved, and first is a (N, 2) integer array of the
+    (row, col) of the first square in row order that is empty, out of range,
+    or repeats a value in its row, column or box, or (-1, -1) if solved"""
+    grids = np.asarray(grids)
+    if grids.ndim != 3 or grids.shape[1] != grids.shape[2]:
+        raise Sudoku_Errors.InvalidPuzzleException(grids.shape, "Grids must be stacked with shape (N, sl, sl)")
+    n, sl = grids.shape[0], grids.shape[1]
+    bs = int(math.sqrt(sl))
+    if bs**2 != sl:
+        raise Sudoku_Errors.InvalidPuzzleException(grids.shape, "Puzzle side lengths not a perfect square")
+
+    # The box of each square, numbered left to right, top to bottom
+    boxes = (np.arange(sl)[:, None] // bs)*bs + np.arange(sl)[None, :] // bs
+
+    solved = np.zeros(n, dtype=bool)
+    first = np.full((n, 2), -1, dtype=np.int64)
+    full = (1 << (sl+1)) - 2
+    for start in range(0, n, chunksize):
+        chunk = grids[start:start+chunksize].astype(np.int64)
+        m = chunk.shape[0]
+
+        # A grid is solved exactly when every row, column and box has all sl
+        # values, found by OR-ing together a bit for each square's value
+        in_range = (chunk >= 1) & (chunk <= sl)
+        bits = np.where(in_range, np.left_shift(1, np.where(in_range, chunk, 0)), 0)
+        rows_full = (np.bitwise_or.reduce(bits, axis=2) == full).all(axis=1)
+        cols_full = (np.bitwise_or.reduce(bits, axis=1) == full).all(axis=1)
+        boxes_full = (np.bitwise_or.reduce(bits.reshape(m, bs, bs, bs, bs), axis=(2, 4)) == full).all(axis=(1, 2))
+        chunk_solved = rows_full & cols_full & boxes_full
+        solved[start:start+m] = chunk_solved
+
+        # Only the unsolved grids need their first violating square found
+        unsolved = np.flatnonzero(~chunk_solved)
+        if len(unsolved):
+            first[start + unsolved] = _first_violations(chunk[unsolved], in_range[unsolved], bs, boxes)
+    return solved, first
+
+
+def _first_violations(chunk, in_range, bs, boxes):
+    """Finds the first violating square of each grid in chunk, as described in
+    validate_grids, by counting how often each value appears in each unit.
+
+    return: A (M, 2) integer array of (row, col) for each grid"""
+    m, sl = chunk.shape[0], chunk.shape[1]
+
+    # One-hot encode each square's value as onehot[grid, row, col, value-1]
+    values = np.where(in_range, chunk - 1, 0)
+    onehot = (values[..., None] == np.arange(sl)) & in_range[..., None]
+
+    # How many times each value appears in each row, column and box
+    row_counts = onehot.sum(axis=2, dtype=np.int32)
+    col_counts = onehot.sum(axis=1, dtype=np.int32)
+    box_counts = onehot.reshape(m, bs, bs, bs, bs, sl).sum(axis=(2, 4), dtype=np.int32).reshape(m, sl, sl)
+
+    # Look up, for each square, how often its own value appears in its units
+    grid_index = np.arange(m)[:, None, None]
+    in_row = row_counts[grid_index, np.arange(sl)[None, :, None], values]
+    in_col = col_counts[grid_index, np.arange(sl)[None, None, :], values]
+    in_box = box_counts[grid_index, boxes[None], values]
+
+    bad = (~in_range | (in_row > 1) | (in_col > 1) | (in_box > 1)).reshape(m, -1)
+    first_bad = bad.argmax(axis=1)
+    return np.stack([first_bad // sl, first_bad % sl], axis=1)
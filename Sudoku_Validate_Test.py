@@ -0,0 +1,56 @@
+import random
+import Sudoku
+import unittest
+
+try:
+    import numpy as np
+    import Sudoku_Validate
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class Test_Validate_Grids(unittest.TestCase):
+
+    def random_solutions(self, sl, count):
+        random.seed(5)
+        return [Sudoku.Create_Sudoku(sl).solution_grid() for _ in range(count)]
+
+    def test_matches_is_solved(self):
+        for sl in [1, 4, 9, 16]:
+            puzzles = self.random_solutions(sl, 20)
+            # Break some of the grids: empty a square, swap two squares, or put in an out of range value
+            for ind, puzzle in enumerate(puzzles[:15]):
+                row, col = random.randrange(sl), random.randrange(sl)
+                if ind % 3 == 0:
+                    puzzle.insert(row, col, 0)
+                elif ind % 3 == 1 and sl > 1:
+                    puzzle.puzzle.cells[row*sl + col], puzzle.puzzle.cells[row*sl + (col+1) % sl] = \
+                        puzzle.puzzle.cells[row*sl + (col+1) % sl], puzzle.puzzle.cells[row*sl + col]
+                else:
+                    puzzle.puzzle.cells[row*sl + col] = sl + 1
+
+            solved, first = Sudoku_Validate.validate_grids(Sudoku_Validate.stack_grids(puzzles), chunksize=7)
+            self.assertEqual(solved.tolist(), [puzzle.is_solved() for puzzle in puzzles],
+                "expected validate_grids to agree with is_solved for side length {}".format(sl))
+            for ind in range(len(puzzles)):
+                if solved[ind]:
+                    self.assertEqual(first[ind].tolist(), [-1, -1], "expected no violating square for a solved grid")
+                else:
+                    self.assertTrue(0 <= first[ind][0] < sl and 0 <= first[ind][1] < sl,
+                        "expected a violating square for an unsolved grid")
+
+    def test_first_violation(self):
+        grid = np.array([[1, 2, 3, 4],
+                         [3, 4, 1, 2],
+                         [2, 1, 4, 3],
+                         [4, 3, 2, 1]])
+        broken = grid.copy()
+        broken[2, 1] = 3
+        solved, first = Sudoku_Validate.validate_grids(np.stack([grid, broken]))
+        self.assertEqual(solved.tolist(), [True, False], "expected only the first grid solved")
+        self.assertEqual(first[1].tolist(), [2, 1], "expected the new 3 at (2, 1) to be the first repeated value")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)